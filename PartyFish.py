@@ -1,3 +1,10 @@
+import multiprocessing  # OCR工作进程
+
+if __name__ == "__main__":
+    # 打包为exe后，OCR工作进程会带 --multiprocessing-fork 参数重新运行本程序，
+    # 必须在导入界面、热键等模块和执行任何初始化之前交给multiprocessing处理并退出
+    multiprocessing.freeze_support()
+
 import time
 import os
 import webbrowser
@@ -53,6 +60,14 @@ import ttkbootstrap as ttkb
 from ttkbootstrap.constants import *
 import json  # 用于保存和加载参数
 import mss
+import zlib  # 用于计算鱼饵区域图像哈希
+import sqlite3  # 钓鱼记录数据库
+import importlib.util  # 用于检查可选依赖是否安装
+import importlib.machinery
+from multiprocessing import shared_memory
+# OCR工作进程入口，子进程只导入这个模块
+from ocr_worker import LOAD_JOB_ID as OCR_WORKER_LOAD_JOB_ID, ocr_worker_main
+import collections
 
 
 # =========================
@@ -459,17 +474,107 @@ def set_window_icon(window):
 # =========================
 # OCR引擎初始化（使用rapidocr，速度快）
 # =========================
-try:
-    from rapidocr_onnxruntime import RapidOCR
-
-    ocr_engine = RapidOCR()
-    OCR_AVAILABLE = True
-    print("✅ [OCR] RapidOCR 引擎加载成功")
-except ImportError:
-    OCR_AVAILABLE = False
-    ocr_engine = None
+# 启动时只检查是否安装，模型在窗口显示后由后台线程加载，避免拖慢启动
+OCR_AVAILABLE = importlib.util.find_spec("rapidocr_onnxruntime") is not None
+if not OCR_AVAILABLE:
     print("⚠️  [OCR] RapidOCR 未安装，钓鱼记录功能将不可用")
 
+# OCR引擎加载状态
+OCR_STATE_PENDING = "pending"  # 尚未开始加载
+OCR_STATE_LOADING = "loading"  # 后台加载中
+OCR_STATE_READY = "ready"  # 可以使用
+OCR_STATE_FAILED = "failed"  # 未安装或加载失败
+
+OCR_STATE_NAMES = {
+    OCR_STATE_PENDING: "等待加载",
+    OCR_STATE_LOADING: "加载中",
+    OCR_STATE_READY: "已就绪",
+    OCR_STATE_FAILED: "不可用",
+}
+
+ocr_engine = None
+ocr_engine_state = OCR_STATE_PENDING if OCR_AVAILABLE else OCR_STATE_FAILED
+ocr_engine_error = None if OCR_AVAILABLE else "RapidOCR 未安装"
+ocr_engine_load_time = None  # 模型加载耗时（秒）
+ocr_engine_lock = threading.Lock()
+
+
+OCR_WORKER_LOAD_TIMEOUT = 120  # 等待OCR工作进程加载模型的最长时间（秒）
+
+
+def _load_ocr_engine():
+    """后台线程：准备OCR引擎
+
+    优先使用OCR工作进程（模型只在子进程中加载一份），就绪状态跟随工作进程；
+    工作进程已停用或启动失败时才在主进程内加载RapidOCR。
+    """
+    global ocr_engine, ocr_engine_state, ocr_engine_error, ocr_engine_load_time
+    start_time = time.perf_counter()
+    engine = None
+    if not ocr_worker.disabled:
+        ocr_worker.start()
+        if ocr_worker.wait_ready(OCR_WORKER_LOAD_TIMEOUT):
+            engine = ocr_worker
+        else:
+            print(f"⚠️  [OCR] OCR工作进程加载失败，改为在主进程内识别: {ocr_worker.load_error}")
+            ocr_worker.disable()
+
+    if engine is None:
+        try:
+            from rapidocr_onnxruntime import RapidOCR
+
+            engine = RapidOCR()
+        except Exception as e:
+            with ocr_engine_lock:
+                ocr_engine_state = OCR_STATE_FAILED
+                ocr_engine_error = f"{type(e).__name__}: {e}"
+            print(f"❌ [OCR] RapidOCR 引擎加载失败，钓鱼记录功能将不可用: {e}")
+            return
+
+    with ocr_engine_lock:
+        ocr_engine = engine
+        ocr_engine_load_time = time.perf_counter() - start_time
+        ocr_engine_state = OCR_STATE_READY
+    where = "工作进程" if engine is ocr_worker else "主进程"
+    print(f"✅ [OCR] RapidOCR 引擎加载成功（{where}，{ocr_engine_load_time:.1f}s）")
+
+
+def fall_back_to_in_process_ocr():
+    """OCR工作进程停用后，改为在后台加载主进程内的引擎"""
+    global ocr_engine, ocr_engine_state
+    with ocr_engine_lock:
+        if ocr_engine is not ocr_worker or ocr_engine_state != OCR_STATE_READY:
+            return
+        ocr_engine = None
+        ocr_engine_state = OCR_STATE_PENDING
+    start_ocr_engine_loading()
+
+
+def start_ocr_engine_loading():
+    """开始在后台加载OCR引擎，已在加载或已完成时不做任何事"""
+    global ocr_engine_state
+    with ocr_engine_lock:
+        if ocr_engine_state != OCR_STATE_PENDING:
+            return
+        ocr_engine_state = OCR_STATE_LOADING
+    threading.Thread(target=_load_ocr_engine, name="OCRLoader", daemon=True).start()
+
+
+def get_ocr_engine():
+    """获取OCR引擎
+
+    引擎尚未加载时触发后台加载并返回None，调用方应当跳过本次识别而不是等待。
+    """
+    if ocr_engine_state == OCR_STATE_READY:
+        return ocr_engine
+    start_ocr_engine_loading()
+    return None
+
+
+def is_ocr_ready():
+    """OCR引擎是否已可用"""
+    return ocr_engine_state == OCR_STATE_READY
+
 # =========================
 # 鱼桶满检测设置
 # =========================
@@ -525,15 +630,239 @@ def add_debug_info(info):
 # =========================
 # 运行日志系统
 # =========================
-# 运行日志队列，用于存储所有控制台输出信息
-log_queue = queue.Queue(maxsize=1000)
-log_history = []  # 日志历史记录
-log_history_max = 500  # 最大保存500条日志
-log_history_lock = threading.Lock()  # 保护日志历史记录的线程锁
+LOG_BUFFER_CAPACITY = 1000  # 运行日志最多保留的条数
+
+# 日志级别
+LOG_DEBUG = 10
+LOG_INFO = 20
+LOG_WARNING = 30
+LOG_ERROR = 40
+
+# 各级别的默认图标；普通信息优先使用子系统自己的图标
+LOG_LEVEL_ICONS = {LOG_DEBUG: "📌", LOG_INFO: "📄", LOG_WARNING: "⚠️ ", LOG_ERROR: "❌"}
+LOG_SUBSYSTEM_ICONS = {
+    "时间": "⏱️ ",
+    "状态": "▶️ ",
+    "提示": "🎣",
+    "监测": "⚠️ ",
+    "放生": "🐟",
+    "钓到": "🐟",
+    "会话": "📊",
+    "OCR": "🔍",
+    "保存": "💾",
+    "截图": "📸",
+    "模板": "🖼️ ",
+    "初始化": "✅",
+}
+# 运行日志界面的颜色标签：错误和警告按级别，其余按子系统
+LOG_SUBSYSTEM_TAGS = {
+    "保存": "save",
+    "初始化": "init",
+    "状态": "status",
+    "钓到": "fish",
+    "放生": "fish",
+    "模板": "template",
+    "时间": "time",
+    "截屏": "screenshot",
+    "截图": "screenshot",
+    "提示": "hint",
+    "调试": "debug",
+    "会话": "session",
+    "OCR": "ocr",
+    "信息": "info",
+}
+LOG_LEVEL_TAGS = {LOG_WARNING: "warning", LOG_ERROR: "error"}
+
+log_min_level = LOG_DEBUG  # 低于此级别的日志直接丢弃
+log_disabled_subsystems = set()  # 已关闭输出的子系统
+
+
+def log_enabled(subsystem, level=LOG_INFO):
+    """某个子系统、级别的日志是否需要输出（热循环可先判断再准备参数）"""
+    return level >= log_min_level and subsystem not in log_disabled_subsystems
+
+
+def set_log_subsystem_enabled(subsystem, enabled):
+    """打开或关闭某个子系统的日志输出"""
+    global last_operation_time, last_operation_type
+    if enabled:
+        log_disabled_subsystems.discard(subsystem)
+    else:
+        log_disabled_subsystems.add(subsystem)
+    if subsystem == "时间":
+        # 时间日志关闭期间不记录操作时间，重新打开后从头计算间隔，避免第一条间隔是旧数据
+        last_operation_time = None
+        last_operation_type = None
+
+
+class LogRecord:
+    """一条结构化日志
+
+    只保存级别、子系统、消息模板和参数，显示文本在第一次读取时才格式化；
+    被环形缓冲区覆盖前没人读取的日志不会产生任何格式化开销。
+    """
+
+    __slots__ = ("created", "level", "subsystem", "msg", "args", "icon", "_text")
+
+    def __init__(self, level, subsystem, msg, args=(), icon=None, created=None):
+        self.created = time.time() if created is None else created
+        self.level = level
+        self.subsystem = subsystem
+        self.msg = msg
+        self.args = args
+        self.icon = icon
+        self._text = None
+
+    @property
+    def message(self):
+        return self.msg % self.args if self.args else self.msg
+
+    @property
+    def line(self):
+        """不带时间戳的日志行，与控制台输出一致"""
+        if self.icon is None:
+            # 重定向的print输出，消息本身就是完整的一行
+            return self.message
+        return f"{self.icon} [{self.subsystem}] {self.message}"
+
+    @property
+    def text(self):
+        """带时间戳的完整日志行"""
+        if self._text is None:
+            timestamp = time.strftime("%H:%M:%S", time.localtime(self.created))
+            self._text = f"[{timestamp}] {self.line}"
+        return self._text
+
+    @property
+    def tag(self):
+        """运行日志界面使用的颜色标签"""
+        return LOG_LEVEL_TAGS.get(self.level) or LOG_SUBSYSTEM_TAGS.get(self.subsystem)
+
+
+# 重定向的print输出按行首的"图标 [标签]"归类，例如 "⚠️  [警告] ..."
+_LOG_PREFIX_RE = re.compile(r"\s*(\S*)\s*\[([^\]]+)\]")
+_LOG_TAG_LEVELS = {"错误": LOG_ERROR, "警告": LOG_WARNING, "调试": LOG_DEBUG, "时间": LOG_DEBUG}
+# 没有"[标签]"的print输出按行首图标归类，例如 "✅ 放生操作执行成功"
+_LOG_ICON_SUBSYSTEMS = (
+    ("💾", "保存"),
+    ("✅", "初始化"),
+    ("▶", "状态"),
+    ("⏸", "状态"),
+    ("🐟", "钓到"),
+    ("🖼", "模板"),
+    ("⏱", "时间"),
+    ("📸", "截图"),
+    ("🎣", "提示"),
+    ("📌", "调试"),
+    ("📊", "会话"),
+    ("🔍", "OCR"),
+    ("📄", "信息"),
+)
+
+
+def log_record_from_text(text):
+    """把一行print输出转换为LogRecord（只匹配一次行首，不逐个查找关键字）"""
+    level = LOG_INFO
+    subsystem = ""
+    match = _LOG_PREFIX_RE.match(text)
+    if match:
+        icon, subsystem = match.groups()
+        level = _LOG_TAG_LEVELS.get(subsystem, LOG_INFO)
+        if icon.startswith("❌"):
+            level = LOG_ERROR
+        elif icon.startswith("⚠") and level < LOG_WARNING:
+            level = LOG_WARNING
+    else:
+        stripped = text.lstrip()
+        if stripped.startswith("❌"):
+            level = LOG_ERROR
+        elif stripped.startswith("⚠"):
+            level = LOG_WARNING
+        else:
+            for icon, icon_subsystem in _LOG_ICON_SUBSYSTEMS:
+                if stripped.startswith(icon):
+                    subsystem = icon_subsystem
+                    level = _LOG_TAG_LEVELS.get(subsystem, LOG_INFO)
+                    break
+    return LogRecord(level, subsystem, text)
+
+
+class LogRingBuffer:
+    """固定容量的环形日志缓冲区
+
+    追加为O(1)，写满后覆盖最旧的条目，占用内存不随运行时间增长。
+    每条日志有递增序号，GUI用 read_since() 按序号增量读取新日志，
+    读得太慢时可以知道中间被覆盖了多少条。
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._entries = [None] * capacity
+        self._next_seq = 0  # 下一条日志的序号
+        self._start_seq = 0  # 清空后第一条有效日志的序号
+        self._lock = threading.Lock()
+
+    def append(self, entry):
+        with self._lock:
+            self._entries[self._next_seq % self.capacity] = entry
+            self._next_seq += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries = [None] * self.capacity
+            self._start_seq = self._next_seq
+
+    def _first_seq(self):
+        return max(self._start_seq, self._next_seq - self.capacity)
+
+    def _slice(self, first, last):
+        return [self._entries[seq % self.capacity] for seq in range(first, last)]
+
+    def snapshot(self):
+        """返回当前保留的全部日志（从旧到新）"""
+        with self._lock:
+            return self._slice(self._first_seq(), self._next_seq)
+
+    def read_since(self, seq):
+        """读取序号不小于seq的日志
+
+        Returns:
+            (日志列表, 下次读取用的序号, 已被覆盖而未读到的条数)
+        """
+        with self._lock:
+            first = max(seq, self._first_seq())
+            dropped = max(0, min(first, self._next_seq) - seq) if seq >= self._start_seq else 0
+            return self._slice(first, self._next_seq), self._next_seq, dropped
+
+    def __len__(self):
+        with self._lock:
+            return self._next_seq - self._first_seq()
+
+
+# 运行日志缓冲区，存储所有日志记录
+log_history = LogRingBuffer(LOG_BUFFER_CAPACITY)
+
+
+def log(level, subsystem, msg, *args):
+    """输出一条结构化日志
+
+    用法与logging相同，msg中的%占位符由args填充，例如
+    log(LOG_INFO, "OCR", "识别耗时 %.0fms", elapsed)。子系统关闭或级别不够时
+    不创建记录也不格式化；只有存在控制台时才立即格式化输出到控制台。
+    """
+    if level < log_min_level or subsystem in log_disabled_subsystems:
+        return
+    icon = LOG_LEVEL_ICONS[level]
+    if level < LOG_WARNING:
+        icon = LOG_SUBSYSTEM_ICONS.get(subsystem, icon)
+    record = LogRecord(level, subsystem, msg, args, icon)
+    log_history.append(record)
+    console = getattr(sys.stdout, "original_stream", sys.stdout)
+    if console is not None:
+        console.write(record.line + "\n")
 
 # 重定向标准输出到日志系统
 import sys
-import io
 
 
 class LogRedirector:
@@ -541,42 +870,20 @@ class LogRedirector:
 
     def __init__(self, original_stream):
         self.original_stream = original_stream
-        self.buffer = io.StringIO()
 
     def write(self, text):
         # 写入到原始流，只有当original_stream不为None时才写入
         if self.original_stream is not None:
             self.original_stream.write(text)
-        # 如果文本不为空，添加到日志队列
+        # 如果文本不为空，归类后添加到日志缓冲区
         if text.strip():
-            timestamp = datetime.datetime.now().strftime("%H:%M:%S")
-            log_entry = f"[{timestamp}] {text.rstrip()}"
-
-            # 添加到队列
-            try:
-                log_queue.put_nowait(log_entry)
-            except queue.Full:
-                # 队列满时移除最旧的条目
-                try:
-                    log_queue.get_nowait()
-                    log_queue.put_nowait(log_entry)
-                except:
-                    pass
-
-            # 添加到历史记录
-            with log_history_lock:
-                log_history.append(log_entry)
-                # 保持历史记录不超过最大限制
-                if len(log_history) > log_history_max:
-                    log_history.pop(0)
-
-        # 写入到缓冲区（如果需要）
-        self.buffer.write(text)
+            record = log_record_from_text(text.rstrip())
+            if log_enabled(record.subsystem, record.level):
+                log_history.append(record)
 
     def flush(self):
         if self.original_stream is not None:
             self.original_stream.flush()
-        self.buffer.flush()
 
 
 # 重定向标准输出和标准错误
@@ -665,14 +972,14 @@ def print_timing_info(operation_type, base_time, actual_time, previous_interval=
     """
     global last_operation_time, last_operation_type
 
+    # 时间日志关闭时直接返回，热循环里不做任何计算和格式化
+    if not log_enabled("时间", LOG_DEBUG):
+        return
+
     current_time = time.time()
 
     # 计算与基础时间的偏差百分比
     deviation = ((actual_time - base_time) / base_time) * 100 if base_time > 0 else 0
-    deviation_str = f"{deviation:+.1f}%"
-
-    # 直接使用偏差字符串，不添加颜色
-    deviation_display = deviation_str
 
     # 计算与上次操作的时间间隔
     interval_info = ""
@@ -693,9 +1000,16 @@ def print_timing_info(operation_type, base_time, actual_time, previous_interval=
     last_operation_time = current_time
     last_operation_type = operation_type
 
-    # 打印信息
-    print(
-        f"⏱️  [时间] {operation_type}: 基础={base_time:.3f}s, 实际={actual_time:.3f}s ({deviation_display}){interval_info}"
+    # 输出信息（显示时才格式化）
+    log(
+        LOG_DEBUG,
+        "时间",
+        "%s: 基础=%.3fs, 实际=%.3fs (%+.1f%%)%s",
+        operation_type,
+        base_time,
+        actual_time,
+        deviation,
+        interval_info,
     )
 
 
@@ -1082,6 +1396,8 @@ def save_parameters():
         "fish_bucket_sound_enabled": fish_bucket_sound_enabled,
         "bucket_detection_mode": bucket_detection_mode,  # 新增保存鱼桶检测模式
         "bait_recognition_algorithm": bait_recognition_algorithm,  # 新增保存鱼饵识别算法
+        # 截图后端设置
+        "capture_backend": capture_backend,
         # 放生功能设置
         "release_fish_enabled": release_fish_enabled,
         "release_standard_enabled": release_standard_enabled,
@@ -1122,6 +1438,7 @@ def load_parameters():
     global config_names, config_params, current_config_index
     global JITTER_RANGE
     global bait_recognition_algorithm  # 新增加载鱼饵识别算法
+    global capture_backend  # 截图后端设置
     global uno_hotkey_name, uno_hotkey_modifiers, uno_hotkey_main_key  # 添加UNO热键全局变量
     global release_fish_enabled, release_standard_enabled, release_uncommon_enabled, release_rare_enabled, release_epic_enabled, release_legendary_enabled, release_phantom_rare_enabled  # 添加放生功能全局变量
     try:
@@ -1169,6 +1486,10 @@ def load_parameters():
         bait_recognition_algorithm = params.get(
             "bait_recognition_algorithm", "template"
         )
+        # 加载截图后端设置
+        capture_backend = params.get("capture_backend", "mss")
+        if capture_backend not in capture_backends:
+            capture_backend = "mss"
         # 加载放生功能设置
         release_fish_enabled = params.get("release_fish_enabled", False)
         release_standard_enabled = params.get("release_standard_enabled", False)
@@ -1365,6 +1686,8 @@ def update_parameters(
             # 更新钓鱼记录开关状态
             if record_fish_var is not None:
                 record_fish_enabled = bool(record_fish_var.get())
+                if record_fish_enabled:
+                    start_ocr_engine_loading()
 
             # 更新传奇鱼自动截屏开关状态
             if legendary_screenshot_var is not None:
@@ -1756,6 +2079,15 @@ def show_debug_window():
     )
     release_fish_btn.pack(side=RIGHT, padx=(10, 0))
 
+    # 把调试历史中的OCR文本冻结为解析语料（校验和基准用命令行 --check-parser 运行）
+    freeze_corpus_btn = ttkb.Button(
+        control_frame,
+        text="📥 冻结解析语料",
+        command=freeze_fish_info_corpus,
+        bootstyle="secondary-outline",
+    )
+    freeze_corpus_btn.pack(side=RIGHT, padx=(10, 0))
+
     # 调试模式开关
     debug_mode_var = ttkb.BooleanVar(value=debug_mode)
     debug_mode_check = ttkb.Checkbutton(
@@ -1826,6 +2158,112 @@ def show_debug_window():
         debug_text.insert(
             END, f"🔄 自动刷新: {'开启' if debug_auto_refresh else '关闭'}\n"
         )
+        debug_text.insert(END, f"🎣 钓鱼状态: {fishing_cycle.state_name}\n")
+        scheduler_stats = poll_scheduler.stats()
+        earliest_text = (
+            f"{scheduler_stats['earliest_bite']:.1f}s"
+            if scheduler_stats["earliest_bite"] is not None
+            else "样本不足"
+        )
+        cpu_per_fish_text = (
+            f"{scheduler_stats['cpu_per_fish'] * 1000:.0f}ms"
+            if scheduler_stats["cpu_per_fish"] is not None
+            else "-"
+        )
+        debug_text.insert(
+            END,
+            f"⏱️  自适应检测: 咬钩样本 {scheduler_stats['samples']} 个 | 最早咬钩 {earliest_text} | "
+            f"检测CPU {scheduler_stats['total_cpu']:.1f}s | 每条鱼 {cpu_per_fish_text}\n",
+        )
+        debug_text.insert(
+            END,
+            f"🐟 记录流水线: 积压 {fish_record_pipeline.backlog()} 条 | 已处理 {fish_record_pipeline.processed_count} 条 | "
+            f"超时丢弃 {fish_record_pipeline.dropped_count} 条 | "
+            f"截图内存 {fish_record_pipeline.screen_bytes / 1024 / 1024:.0f}MB\n",
+        )
+        ocr_state_text = OCR_STATE_NAMES[ocr_engine_state]
+        if ocr_engine_state == OCR_STATE_READY and ocr_engine_load_time is not None:
+            ocr_state_text += f"（加载 {ocr_engine_load_time:.1f}s）"
+        elif ocr_engine_state == OCR_STATE_FAILED and ocr_engine_error:
+            ocr_state_text += f"（{ocr_engine_error}）"
+        debug_text.insert(END, f"🔤 OCR引擎: {ocr_state_text}\n")
+        latency_stats = fish_info_ocr_stats.stats()
+        latency_parts = []
+        for path, entry in latency_stats["paths"].items():
+            if entry["count"]:
+                latency_parts.append(
+                    f"{OcrLatencyStats.PATH_NAMES[path]} {entry['count']} 次 "
+                    f"平均 {entry['average'] * 1000:.0f}ms / 最近 {entry['last'] * 1000:.0f}ms"
+                )
+        debug_text.insert(
+            END,
+            f"🔤 鱼信息识别耗时: {' | '.join(latency_parts) if latency_parts else '暂无数据'} | "
+            f"快速识别命中 {latency_stats['fast_hits']} 次，回退 {latency_stats['fallbacks']} 次\n",
+        )
+        strip_stats = fish_info_strip_calibrator.stats()
+        strip_state_text = (
+            "已校准"
+            if strip_stats["calibrated"]
+            else f"校准中 {strip_stats['samples']}/{FISH_INFO_STRIP_MIN_SAMPLES}"
+        )
+        debug_text.insert(END, f"🔤 快速识别文字行位置: {strip_state_text}\n")
+        color_stats = quality_classifier.stats()
+        color_time_text = (
+            f"{color_stats['average_time'] * 1e6:.0f}µs"
+            if color_stats["average_time"] is not None
+            else "-"
+        )
+        color_agreement_text = (
+            f"{color_stats['agreement'] * 100:.0f}%"
+            if color_stats["agreement"] is not None
+            else "-"
+        )
+        debug_text.insert(
+            END,
+            f"🎨 徽章颜色判定: {color_stats['classify_count']} 次 | 平均 {color_time_text} | "
+            f"与OCR一致 {color_agreement_text}（核对 {color_stats['checked']} 次） | "
+            f"已信任: {'、'.join(color_stats['trusted']) if color_stats['trusted'] else '无'}\n",
+        )
+        dictionary_stats = fish_name_dictionary.stats()
+        debug_text.insert(
+            END,
+            f"📖 鱼名词典: 已知 {dictionary_stats['size']} 种 | 纠正 {dictionary_stats['snap_count']} 次 | "
+            f"未匹配 {dictionary_stats['unknown_count']} 次\n",
+        )
+        worker_stats = ocr_worker.stats()
+        if worker_stats["disabled"]:
+            worker_state = "已停用（主进程识别）"
+        elif worker_stats["ready"]:
+            worker_state = "运行中"
+        elif worker_stats["alive"]:
+            worker_state = "加载模型中"
+        else:
+            worker_state = "未启动"
+        debug_text.insert(
+            END,
+            f"🔤 OCR工作进程: {worker_state} | 请求 {worker_stats['request_count']} 次 | "
+            f"失败 {worker_stats['failure_count']} 次 | 重启 {worker_stats['restart_count']} 次\n",
+        )
+        reel_stats = reel_controller.stats()
+        debug_text.insert(
+            END,
+            f"🎣 收线提前结束: 共节省 {reel_stats['total_saved_time']:.1f}s | "
+            f"平均每条 {reel_stats['average_saved_time']:.2f}s（{reel_stats['catch_count']} 条）\n",
+        )
+        # 显示各线程截图会话的复用情况
+        for session_stats in get_capture_session_stats():
+            debug_text.insert(
+                END,
+                f"📷 截图会话[{session_stats['name']}/{session_stats['backend']}]: 截图 {session_stats['grab_count']} 次 | "
+                f"重建 {session_stats['rebuild_count']} 次 | 失败 {session_stats['failure_count']} 次\n",
+            )
+        # 显示鱼饵识别缓存命中情况
+        cache_stats = bait_digit_cache.stats()
+        debug_text.insert(
+            END,
+            f"🎯 鱼饵识别缓存: 命中 {cache_stats['hit_count']} 次 | 未命中 {cache_stats['miss_count']} 次 | "
+            f"命中率 {cache_stats['hit_rate']:.1%}\n",
+        )
         debug_text.insert(END, "-" * 60 + "\n")
 
         # 显示信息统计
@@ -1979,15 +2417,44 @@ def show_debug_window():
 # =========================
 # 运行日志界面功能
 # =========================
+log_display_seq = 0  # 运行日志界面已显示到的日志序号
+LOG_TEXT_MAX_LINES = 1000  # 运行日志文本框最多保留的行数
+LOG_REFRESH_FAST_MS = 250  # 有少量新日志时的刷新间隔
+LOG_REFRESH_BUSY_MS = 500  # 日志量大时的刷新间隔，攒成更大的批次一次插入
+LOG_REFRESH_IDLE_MS = 1000  # 没有新日志时逐步退避到的最长刷新间隔
+LOG_REFRESH_BUSY_ENTRIES = 50  # 单次刷新超过此条数视为日志量大
+
+
+def next_log_refresh_interval(interval, entry_count):
+    """根据本次刷新的新日志条数决定下次刷新间隔（毫秒）"""
+    if entry_count == 0:
+        return min(interval * 2, LOG_REFRESH_IDLE_MS)
+    if entry_count > LOG_REFRESH_BUSY_ENTRIES:
+        return LOG_REFRESH_BUSY_MS
+    return LOG_REFRESH_FAST_MS
+
+
 def update_log_display(log_text_widget, auto_scroll=True):
-    """更新运行日志显示"""
-    # 从队列中获取所有新的日志条目
-    log_entries = []
-    while not log_queue.empty():
-        try:
-            log_entries.append(log_queue.get_nowait())
-        except queue.Empty:
-            break
+    """更新运行日志显示
+
+    新日志按颜色标签合并成若干段，用一次insert调用插入；超出行数上限时
+    每次只删除多出来的几行，避免文本框整段重排。
+
+    Returns:
+        int: 本次读取到的新日志条数
+    """
+    global log_display_seq
+    # 从日志缓冲区读取上次显示之后的新日志
+    log_entries, log_display_seq, dropped = log_history.read_since(log_display_seq)
+    entry_count = len(log_entries)
+    if len(log_entries) > LOG_TEXT_MAX_LINES:
+        # 插入后马上会被删掉的旧日志不必显示
+        dropped += len(log_entries) - LOG_TEXT_MAX_LINES
+        log_entries = log_entries[-LOG_TEXT_MAX_LINES:]
+    if dropped:
+        log_entries.insert(
+            0, LogRecord(LOG_WARNING, "日志", "日志输出过快，省略了 %d 条", (dropped,), "⚠️ ")
+        )
 
     # 如果有新的日志条目，添加到文本框中
     if log_entries:
@@ -1997,52 +2464,24 @@ def update_log_display(log_text_widget, auto_scroll=True):
         # 启用文本框编辑
         log_text_widget.config(state="normal")
 
-        # 添加新的日志条目
-        for entry in log_entries:
-            # 根据日志类型添加不同的颜色标记
-            # 注意：先检查具体的类型，最后检查一般类型
-            if "❌" in entry and ("[错误]" in entry or "错误" in entry):
-                log_text_widget.insert("end", entry + "\n", "error")
-            elif "⚠️" in entry and ("[警告]" in entry or "警告" in entry):
-                log_text_widget.insert("end", entry + "\n", "warning")
-            elif "💾" in entry or (
-                "[保存]" in entry and "❌" not in entry
-            ):  # 排除包含❌的保存信息
-                log_text_widget.insert("end", entry + "\n", "save")
-            elif "✅" in entry or "[初始化]" in entry:
-                log_text_widget.insert("end", entry + "\n", "init")
-            elif "▶️" in entry or "⏸️" in entry or "[状态]" in entry:
-                log_text_widget.insert("end", entry + "\n", "status")
-            elif "🐟" in entry or "[钓到]" in entry:
-                log_text_widget.insert("end", entry + "\n", "fish")
-            elif "🖼️" in entry or "[模板]" in entry:
-                log_text_widget.insert("end", entry + "\n", "template")
-            elif "⏱️" in entry or "[时间]" in entry:
-                log_text_widget.insert("end", entry + "\n", "time")
-            elif "📸" in entry or "[截屏]" in entry:
-                log_text_widget.insert("end", entry + "\n", "screenshot")
-            elif "🎣" in entry or "[提示]" in entry:
-                log_text_widget.insert("end", entry + "\n", "hint")
-            elif "📌" in entry or "[调试]" in entry:
-                log_text_widget.insert("end", entry + "\n", "debug")
-            elif "📊" in entry or "[会话]" in entry:
-                log_text_widget.insert("end", entry + "\n", "session")
-            elif "🔍" in entry or "[OCR]" in entry:
-                log_text_widget.insert("end", entry + "\n", "ocr")
-            elif "📄" in entry or "[信息]" in entry:
-                log_text_widget.insert("end", entry + "\n", "info")
-            elif "❌" in entry:  # 单独的❌匹配，放在最后
-                log_text_widget.insert("end", entry + "\n", "error")
-            elif "⚠️" in entry:  # 单独的⚠️匹配，放在最后
-                log_text_widget.insert("end", entry + "\n", "warning")
-            else:
-                log_text_widget.insert("end", entry + "\n")
-
-        # 限制日志行数，防止内存过大
+        # 相邻且颜色标签相同的日志合并为一段，所有段一次插入
+        insert_args = []
+        run_tag = None
+        run_lines = []
+        for record in log_entries:
+            tag = record.tag or ()
+            if tag != run_tag and run_lines:
+                insert_args += ["".join(run_lines), run_tag]
+                run_lines = []
+            run_tag = tag
+            run_lines.append(record.text + "\n")
+        insert_args += ["".join(run_lines), run_tag]
+        log_text_widget.insert("end", *insert_args)
+
+        # 限制日志行数，防止内存过大：只删除超出上限的部分
         line_count = int(log_text_widget.index("end-1c").split(".")[0])
-        if line_count > 1000:
-            # 删除前500行
-            log_text_widget.delete("1.0", "500.0")
+        if line_count > LOG_TEXT_MAX_LINES:
+            log_text_widget.delete("1.0", f"{line_count - LOG_TEXT_MAX_LINES + 1}.0")
 
         # 如果开启了自动滚动，滚动到底部
         if auto_scroll:
@@ -2058,6 +2497,8 @@ def update_log_display(log_text_widget, auto_scroll=True):
         if scroll_position == 0:  # 如果之前就在顶部，保持在顶部
             log_text_widget.yview_moveto(0)
 
+    return entry_count
+
 
 # =========================
 # 创建 Tkinter 窗口（现代化UI设计 - 左右分栏布局）
@@ -2661,6 +3102,52 @@ def create_gui():
 
     # 绑定算法选择变化事件
     algorithm_combo.bind("<<ComboboxSelected>>", on_algorithm_change)
+    # ==================== 截图后端设置卡片 ====================
+    capture_backend_card = ttkb.Labelframe(
+        left_content_frame,
+        text=" 📷 截图后端 ",
+        padding=12,
+        bootstyle="primary",
+    )
+    capture_backend_card.pack(fill=X, pady=(0, 8))
+
+    capture_backend_var = ttkb.StringVar(value=capture_backends[capture_backend])
+
+    capture_backend_frame = ttkb.Frame(capture_backend_card)
+    capture_backend_frame.pack(fill=X, pady=4)
+
+    capture_backend_label = ttkb.Label(
+        capture_backend_frame,
+        text="截图方式:",
+        bootstyle="primary",
+        font=("微软雅黑", 9),
+    )
+    capture_backend_label.pack(side=LEFT, padx=(0, 8))
+
+    capture_backend_combo = ttkb.Combobox(
+        capture_backend_frame,
+        textvariable=capture_backend_var,
+        values=list(capture_backends.values()),
+        state="readonly",
+        font=(("微软雅黑", 9)),
+        width=12,
+    )
+    capture_backend_combo.pack(side=LEFT, padx=(0, 8))
+
+    def on_capture_backend_change(event=None):
+        """切换截图后端，各线程的截图会话会在下次截图时自动重建"""
+        global capture_backend
+        backend_name_to_key = {v: k for k, v in capture_backends.items()}
+        selected_backend_key = backend_name_to_key[capture_backend_var.get()]
+
+        if selected_backend_key != capture_backend:
+            capture_backend = selected_backend_key
+            save_parameters()
+            print(
+                f"⚙️  [配置] 截图后端已切换为: {selected_backend_key} ({capture_backend_var.get()})"
+            )
+
+    capture_backend_combo.bind("<<ComboboxSelected>>", on_capture_backend_change)
     # ==================== 鱼桶满检测设置卡片 ====================
     bucket_card = ttkb.Labelframe(
         left_content_frame,
@@ -4007,94 +4494,45 @@ def create_gui():
 
     fish_tree.bind("<MouseWheel>", on_tree_mousewheel)
 
-    # 统计信息
+    # 统计信息和翻页
+    pager_frame = ttkb.Frame(fish_record_card)
+    pager_frame.pack(fill=X)
+
     stats_var = ttkb.StringVar(value="共 0 条记录")
-    stats_label = ttkb.Label(fish_record_card, textvariable=stats_var, bootstyle="info")
-    stats_label.pack()
+    stats_label = ttkb.Label(pager_frame, textvariable=stats_var, bootstyle="info")
+    stats_label.pack(side=LEFT, padx=5)
 
-    def update_fish_display():
-        """更新钓鱼记录显示"""
-        # 清空列表
-        for item in fish_tree.get_children():
-            fish_tree.delete(item)
+    next_page_btn = ttkb.Button(
+        pager_frame, text="下一页 ▶", bootstyle="info-outline", state=DISABLED
+    )
+    next_page_btn.pack(side=RIGHT, padx=5)
+
+    page_var = ttkb.StringVar(value="第 1 / 1 页")
+    page_label = ttkb.Label(pager_frame, textvariable=page_var, bootstyle="secondary")
+    page_label.pack(side=RIGHT, padx=5)
+
+    prev_page_btn = ttkb.Button(
+        pager_frame, text="◀ 上一页", bootstyle="info-outline", state=DISABLED
+    )
+    prev_page_btn.pack(side=RIGHT, padx=5)
+
+    # 分页状态：只有当前页的记录会插入Treeview
+    # pending: 正在后台查询的页码；search_after_id: 搜索防抖定时器
+    record_page = {"page": 0, "filtered_total": 0, "row_count": 0, "pending": None, "search_after_id": None}
 
-        # 获取搜索关键词
+    def get_record_filter():
+        """读取当前的视图模式、搜索关键词和品质筛选"""
         keyword = search_var.get()
         if keyword == "搜索鱼名...":
             keyword = ""
+        return view_mode.get(), keyword, quality_var.get()
 
-        # 获取视图模式
+    def refresh_quality_stats():
+        """用累加的品质计数刷新统计标签（耗时与记录数量无关）"""
         mode = view_mode.get()
-        quality_filter = quality_var.get()
-
-        # 获取所有记录
-        all_records = []
-
-        # 根据视图模式选择数据源和筛选逻辑
-        if mode == "current":
-            # 本次钓鱼
-            all_records = current_session_fish
-            filtered = search_fish_records(keyword, quality_filter, True)
-        elif mode == "today":
-            # 当天钓鱼
-            # 获取今天的日期字符串
-            today = datetime.date.today().strftime("%Y-%m-%d")
-            # 从所有记录中筛选出今天的记录
-            all_records = [
-                record
-                for record in all_fish_records
-                if record.timestamp.startswith(today)
-            ]
-            # 应用品质筛选和关键词搜索
-            filtered = []
-            for record in all_records:
-                # 品质筛选
-                if quality_filter != "全部":
-                    if quality_filter == "传奇":
-                        if record.quality not in ["传奇", "傳奇"]:
-                            continue
-                    elif quality_filter == "标准":
-                        if record.quality not in ["标准", "標準"]:
-                            continue
-                    elif quality_filter == "史诗":
-                        if record.quality not in ["史詩", "史诗"]:
-                            continue
-                    else:
-                        if record.quality != quality_filter:
-                            continue
-                # 关键词搜索
-                if keyword and keyword.lower() not in record.name.lower():
-                    continue
-                filtered.append(record)
-        else:  # all
-            # 历史总览
-            all_records = all_fish_records
-            filtered = search_fish_records(keyword, quality_filter, False)
-
-        # 计算品质统计
-        total = len(all_records)
-        quality_counts = {
-            "标准": 0,
-            "非凡": 0,
-            "稀有": 0,
-            "史诗": 0,
-            "传奇": 0,
-        }
-
-        for record in all_records:
-            quality = record.quality
-            # 处理繁体中文品质，映射到简体中文键
-            if quality in ["傳奇", "傅奇"]:
-                quality = "传奇"
-            elif quality == "史詩":
-                quality = "史诗"
-            elif quality == "传说":
-                quality = "传奇"
-            elif quality == "標準":
-                quality = "标准"
-
-            if quality in quality_counts:
-                quality_counts[quality] += 1
+        quality_counts, total = quality_stats.snapshot(
+            {"current": "session", "today": "today"}.get(mode, "all")
+        )
 
         # 合并传奇和传说的计数（因为它们是同一品质的不同名称）
         total_legendary = quality_counts["传奇"]
@@ -4151,28 +4589,36 @@ def create_gui():
         else:
             total_var.set(f"{total_icon} 历史总计: {total} 条")
 
-        # 显示记录（倒序，最新的在前面）
-        for record in reversed(filtered[-300:]):  # 最多显示300条
-            # 直接使用完整时间戳（格式：YYYY-MM-DD HH:MM:SS）
-            time_display = record.timestamp if record.timestamp else "未知时间"
-
-            # 根据品质确定标签（用于显示颜色）
-            quality_tag = (
-                record.quality
-                if record.quality
-                in ["标准", "非凡", "稀有", "史诗", "史詩", "传奇", "標準", "傳奇"]
-                else "标准"
-            )
+    def insert_record_row(record, index="end"):
+        """向Treeview插入一行记录"""
+        # 直接使用完整时间戳（格式：YYYY-MM-DD HH:MM:SS）
+        time_display = record.timestamp if record.timestamp else "未知时间"
+
+        # 根据品质确定标签（用于显示颜色）
+        quality_tag = (
+            record.quality
+            if record.quality
+            in ["标准", "非凡", "稀有", "史诗", "史詩", "传奇", "標準", "傳奇"]
+            else "标准"
+        )
 
-            fish_tree.insert(
-                "",
-                "end",
-                values=(time_display, record.name, record.quality, record.weight),
-                tags=(quality_tag,),
-            )
+        fish_tree.insert(
+            "",
+            index,
+            values=(time_display, record.name, record.quality, record.weight),
+            tags=(quality_tag,),
+        )
 
-        # 更新统计
-        total_display = len(filtered)
+    def update_page_label():
+        """更新分页信息和记录条数"""
+        mode = view_mode.get()
+        total_display = record_page["filtered_total"]
+        page_count = max(1, -(-total_display // FISH_RECORD_PAGE_SIZE))
+        page_var.set(f"第 {record_page['page'] + 1} / {page_count} 页")
+        prev_page_btn.configure(state=NORMAL if record_page["page"] > 0 else DISABLED)
+        next_page_btn.configure(
+            state=NORMAL if record_page["page"] + 1 < page_count else DISABLED
+        )
         if mode == "current":
             stats_var.set(f"本次: {total_display} 条")
         elif mode == "today":
@@ -4180,12 +4626,98 @@ def create_gui():
         else:
             stats_var.set(f"总计: {total_display} 条")
 
+    def render_record_page(generation, page, result):
+        """在GUI线程显示查询结果（已被更新的查询取代时丢弃）"""
+        if not fish_record_query_worker.is_latest(generation):
+            return
+        records, filtered_total = result
+        # 只替换当前页的行
+        fish_tree.delete(*fish_tree.get_children())
+        for record in records:
+            insert_record_row(record)
+        record_page["page"] = page
+        record_page["filtered_total"] = filtered_total
+        record_page["row_count"] = len(records)
+        record_page["pending"] = None
+        update_page_label()
+        fish_tree.yview_moveto(0)
+
+    def load_record_page(page):
+        """在后台查询某一页记录，完成后回到GUI线程显示（最新的在前面）"""
+        mode, keyword, quality_filter = get_record_filter()
+        record_page["pending"] = page
+
+        def on_result(generation, result):
+            try:
+                root.after(0, render_record_page, generation, page, result)
+            except Exception:
+                pass
+
+        fish_record_query_worker.submit(on_result, mode, page, keyword, quality_filter)
+
+    def update_fish_display():
+        """更新钓鱼记录显示（视图或筛选条件变化后回到第一页）"""
+        if record_page["search_after_id"] is not None:
+            root.after_cancel(record_page["search_after_id"])
+            record_page["search_after_id"] = None
+        refresh_quality_stats()
+        load_record_page(0)
+
+    def on_search_key(event=None):
+        """输入停顿 FISH_RECORD_SEARCH_DEBOUNCE_MS 后才搜索，连续输入只查询一次"""
+        if record_page["search_after_id"] is not None:
+            root.after_cancel(record_page["search_after_id"])
+        record_page["search_after_id"] = root.after(FISH_RECORD_SEARCH_DEBOUNCE_MS, update_fish_display)
+
+    search_entry.bind("<KeyRelease>", on_search_key, add="+")
+
+    def change_record_page(delta):
+        page_count = max(1, -(-record_page["filtered_total"] // FISH_RECORD_PAGE_SIZE))
+        page = min(max(record_page["page"] + delta, 0), page_count - 1)
+        if page != record_page["page"]:
+            load_record_page(page)
+
+    def record_matches_filter(record):
+        """新记录是否属于当前视图和筛选条件"""
+        mode, keyword, quality_filter = get_record_filter()
+        if mode == "today" and not record.timestamp.startswith(today_timestamp_range()[0]):
+            return False
+        qualities = quality_filter_values(quality_filter)
+        if qualities and record.quality not in qualities:
+            return False
+        return not keyword or keyword.lower() in record.name.lower()
+
+    def on_fish_recorded(record=None):
+        """新记录到达：刷新统计，并在第一页顶部插入这一行，不重建整个列表"""
+        refresh_quality_stats()
+        if record is None:
+            load_record_page(record_page["page"])
+            return
+        if not record_matches_filter(record):
+            return
+        if record_page["pending"] is not None:
+            # 还有查询未返回（可能早于这条记录执行），重新查询那一页
+            load_record_page(record_page["pending"])
+            return
+        record_page["filtered_total"] += 1
+        if record_page["page"] == 0:
+            insert_record_row(record, 0)
+            record_page["row_count"] += 1
+            if record_page["row_count"] > FISH_RECORD_PAGE_SIZE:
+                children = fish_tree.get_children()
+                fish_tree.delete(children[-1])
+                record_page["row_count"] -= 1
+        update_page_label()
+
+    prev_page_btn.configure(command=lambda: change_record_page(-1))
+    next_page_btn.configure(command=lambda: change_record_page(1))
+
     # 设置GUI更新回调
     global gui_fish_update_callback
 
-    def safe_update():
+    def safe_update(record=None):
         try:
-            root.after(0, update_fish_display)
+            root.after(0, on_fish_recorded, record)
         except:
             pass
 
@@ -4209,16 +4741,23 @@ def create_gui():
                 # 清空当前会话记录
                 global current_session_fish
                 current_session_fish.clear()
+                quality_stats.reset("session")
             else:
                 # 清空所有记录
                 global all_fish_records
                 all_fish_records.clear()
-                # 清空记录文件
+                quality_stats.reset("all")
                 try:
-                    with open(FISH_RECORD_FILE, "w", encoding="utf-8") as f:
-                        f.write("")
+                    fish_record_store.clear()
                 except Exception as e:
-                    print(f"❌ [错误] 清空记录文件失败: {e}")
+                    print(f"❌ [错误] 清空记录数据库失败: {e}")
+                # 清空旧版记录文件
+                if os.path.exists(FISH_RECORD_FILE):
+                    try:
+                        with open(FISH_RECORD_FILE, "w", encoding="utf-8") as f:
+                            f.write("")
+                    except Exception as e:
+                        print(f"❌ [错误] 清空记录文件失败: {e}")
 
         # 更新显示
         update_fish_display()
@@ -4243,9 +4782,7 @@ def create_gui():
             "确认清空", "确定要清空所有运行日志吗？", parent=root
         )
         if result:
-            global log_history
-            with log_history_lock:
-                log_history.clear()
+            log_history.clear()
             # 清空文本框
             log_text.config(state="normal")
             log_text.delete(1.0, tk.END)
@@ -4271,6 +4808,17 @@ def create_gui():
     )
     auto_scroll_check.pack(side=LEFT, padx=(0, 10))
 
+    # 时间抖动日志开关（每次收放线都会输出一条，关闭后热循环不再产生日志）
+    timing_log_var = tk.BooleanVar(value=log_enabled("时间", LOG_DEBUG))
+    timing_log_check = ttkb.Checkbutton(
+        log_control_frame,
+        text="⏱️ 时间日志",
+        variable=timing_log_var,
+        command=lambda: set_log_subsystem_enabled("时间", timing_log_var.get()),
+        bootstyle="info",
+    )
+    timing_log_check.pack(side=LEFT, padx=(0, 10))
+
     # 日志行数显示
     log_count_var = ttkb.StringVar(value="日志行数: 0")
     log_count_label = ttkb.Label(
@@ -4334,16 +4882,22 @@ def create_gui():
     log_text.tag_configure("ocr", foreground="#a29bfe")  # 紫色，OCR相关
 
     # 定时更新日志显示
+    log_refresh = {"interval": LOG_REFRESH_FAST_MS}
+
     def update_log_display_periodic():
-        """定时更新运行日志显示"""
+        """定时更新运行日志显示，刷新间隔随日志量自适应"""
         try:
             if root.winfo_exists():
-                update_log_display(log_text)
-                # 更新日志行数显示
-                line_count = int(log_text.index("end-1c").split(".")[0])
-                log_count_var.set(f"日志行数: {line_count}")
+                entry_count = update_log_display(log_text, auto_scroll_var.get())
+                if entry_count:
+                    # 更新日志行数显示
+                    line_count = int(log_text.index("end-1c").split(".")[0])
+                    log_count_var.set(f"日志行数: {line_count}")
                 # 设置下次更新
-                root.after(500, update_log_display_periodic)  # 每500ms更新一次
+                log_refresh["interval"] = next_log_refresh_interval(
+                    log_refresh["interval"], entry_count
+                )
+                root.after(log_refresh["interval"], update_log_display_periodic)
         except:
             pass  # 窗口关闭时忽略错误
 
@@ -4351,8 +4905,7 @@ def create_gui():
     root.after(100, update_log_display_periodic)
 
     # 添加初始日志
-    initial_log = "[系统] 运行日志界面已初始化，所有控制台输出将显示在此处"
-    log_history.append(initial_log)
+    log_history.append(LogRecord(LOG_INFO, "系统", "运行日志界面已初始化，所有控制台输出将显示在此处", icon="📋"))
     print("📋 [系统] 运行日志界面已启动")
 
     # ==================== 操作按钮区域（左侧面板底部） ====================
@@ -4633,6 +5186,10 @@ def create_gui():
     # 调用窗口大小变化处理函数，确保初始列宽设置正确
     on_window_resize(DummyEvent(root.winfo_width()))
 
+    # 窗口显示后再在后台加载OCR引擎，未启用钓鱼记录时推迟到首次需要时
+    if record_fish_enabled:
+        root.after(200, start_ocr_engine_loading)
+
     # 运行 GUI
     root.mainloop()
 
@@ -4883,7 +5440,6 @@ def release_fish():
     global release_fish_enabled, release_standard_enabled, release_uncommon_enabled, release_rare_enabled, release_epic_enabled, release_legendary_enabled
     global is_casting, is_releasing, operation_lock
 
-    scr = None
     try:
         # 检查是否正在抛杆，如果是则等待
         with operation_lock:
@@ -4893,8 +5449,8 @@ def release_fish():
             # 设置放生状态
             is_releasing = True
         
-        # 创建新的截图对象，确保每次都是新鲜的
-        scr = mss.mss()
+        # 复用当前线程的截图会话
+        scr = get_capture_session()
         
         # 1. 将鼠标移动到屏幕中心，确保窗口焦点（不点击）
         screen_width, screen_height = get_current_screen_resolution()
@@ -4995,13 +5551,10 @@ def release_fish():
         # 无论是否异常，都要重置放生状态
         with operation_lock:
             is_releasing = False
-        
-        # 确保scr对象被正确关闭
-        if scr is not None:
-            try:
-                scr.close()
-            except:
-                pass
+
+
+# 幻神稀有鱼列表
+PHANTOM_RARE_FISHES = ["地包天鱼", "黄鸭叫", "辐射鲈", "鬼刀鱼", "鬼虎鱼", "鬼牙鱼", "芭蕃蓬蓬鱼", "幻光鱼", "甲方满意鱼", "蓝眼泪", "飞机头", "鳅鳅鱼", "拟岩鱼", "粗红线", "水法老", "大罐子鱼", "粉丝虾", "狼蛛蟹", "金蛙", "拳击虾", "大师龟"]
 
 
 def should_release_fish(quality, fish_name=""):
@@ -5018,22 +5571,14 @@ def should_release_fish(quality, fish_name=""):
     global release_standard_enabled, release_uncommon_enabled, release_rare_enabled, release_epic_enabled, release_legendary_enabled, release_phantom_rare_enabled
 
     # 处理品质名称，统一转换为标准格式
-    quality = (
-        quality.replace("標準", "标准")
-               .replace("傳奇", "传奇")
-               .replace("史詩", "史诗")
-               .replace("传说", "传奇")  # 合并传说和传奇为同一品质
-    )
+    quality = canonical_quality(quality)
 
     # 高品质鱼（史诗、传奇）直接返回False，不允许放生
     if quality in ["史诗", "传奇"]:
         return False
 
-    # 幻神稀有鱼列表
-    phantom_rare_fishes = ["地包天鱼", "黄鸭叫", "辐射鲈", "鬼刀鱼", "鬼虎鱼", "鬼牙鱼", "芭蕃蓬蓬鱼", "幻光鱼", "甲方满意鱼", "蓝眼泪", "飞机头", "鳅鳅鱼", "拟岩鱼", "粗红线", "水法老", "大罐子鱼", "粉丝虾", "狼蛛蟹", "金蛙", "拳击虾", "大师龟"]
-    
     # 检查是否是幻神稀有鱼
-    if fish_name in phantom_rare_fishes and release_phantom_rare_enabled:
+    if fish_name in PHANTOM_RARE_FISHES and release_phantom_rare_enabled:
         return True
     elif quality == "标准" and release_standard_enabled:
         return True
@@ -5045,6 +5590,11 @@ def should_release_fish(quality, fish_name=""):
     return False
 
 
+def release_needs_fish_name(quality):
+    """仅凭品质无法决定是否放生、还需要鱼名时返回True（幻神稀有鱼放生开启时）"""
+    return release_phantom_rare_enabled and canonical_quality(quality) not in ["史诗", "传奇"]
+
+
 def scale_corner_anchored(base_x, base_y, base_w, base_h, anchor="bottom_right"):
     """
     缩放锚定在角落的UI元素坐标
@@ -5255,47 +5805,7 @@ class BaitRecognizer:
         Returns:
             int: 识别出的鱼饵数量，如果识别失败则返回None
         """
-        # 根据统一缩放比例动态计算裁切尺寸
-        scale = SCALE_UNIFORM
-        crop_h = max(1, int(BAIT_CROP_HEIGHT_BASE * scale))
-        crop_w = max(1, int(BAIT_CROP_WIDTH1_BASE * scale))
-
-        # 确保不超出图像边界
-        img_h, img_w = gray_img.shape[:2]
-        crop_h = min(crop_h, img_h)
-        crop_w = min(crop_w, img_w // 2)  # 确保单个数字宽度不超过一半
-
-        # 初始化匹配结果
-        best_match1 = None
-        best_match2 = None
-        best_match3 = None
-
-        # 截取并处理区域1（第一个数字）
-        if crop_w <= img_w:
-            region1 = gray_img[0:crop_h, 0:crop_w]
-            best_match1 = match_digit_template(region1)
-
-        # 截取并处理区域2（第二个数字）
-        if crop_w * 2 <= img_w:
-            region2 = gray_img[0:crop_h, crop_w : crop_w * 2]
-            best_match2 = match_digit_template(region2)
-
-        # 单个数字居中区域 - 动态计算起始位置，适应各种分辨率
-        mid_start = max(0, (img_w - crop_w) // 2)
-        mid_end = min(mid_start + crop_w, img_w)
-        region3 = gray_img[0:crop_h, mid_start:mid_end]
-        best_match3 = match_digit_template(region3)
-
-        if best_match1 and best_match2:
-            # 从best_match中提取数字索引（i），并拼接成整数
-            best_match1_val = best_match1[0]  # 提取区域1的数字索引
-            best_match2_val = best_match2[0]  # 提取区域2的数字索引
-            # 拼接两个匹配的数字，转换为整数
-            return int(f"{best_match1_val}{best_match2_val}")
-        elif best_match3:
-            return int(f"{best_match3[0]}")
-        else:
-            return None
+        return recognize_bait_digits(gray_img)
 
     def _match_digit_template(self, image):
         """匹配数字模板
@@ -5330,14 +5840,15 @@ class BaitRecognizer:
         Returns:
             int: 识别出的鱼饵数量，如果识别失败则返回None
         """
-        if not OCR_AVAILABLE or ocr_engine is None:
+        engine = get_ocr_engine()
+        if engine is None:
             return None
 
         try:
             # 将RGBA图像转换为RGB
             img_rgb = cv2.cvtColor(image, cv2.COLOR_RGBA2RGB)
             # 使用OCR识别文本
-            result = ocr_engine(img_rgb)
+            result = engine(img_rgb)
 
             if result and len(result) > 0:
                 for line in result:
@@ -5439,7 +5950,8 @@ bait_recognizer = BaitRecognizer()
 # =========================
 # 钓鱼记录系统
 # =========================
-FISH_RECORD_FILE = "./fish_records.txt"
+FISH_RECORD_FILE = "./fish_records.txt"  # 旧版文本记录，首次启动时导入数据库
+FISH_RECORD_DB = "./fish_records.db"
 
 # 鱼信息识别区域（2K分辨率基准值）
 FISH_INFO_REGION_BASE = (915, 75, 1640, 225)  # 左上角x, y, 右下角x, y
@@ -5468,10 +5980,150 @@ QUALITY_COLORS = {
     **{q: "🟡" for q in ["传奇", "傳奇", "傅奇"]},  # 传奇与傳奇、傅奇同级，使用相同图标
 }
 
+# 品质别名（繁体、OCR常见误识别）到标准名称的映射
+QUALITY_ALIASES = {
+    "標準": "标准",
+    "史詩": "史诗",
+    "傳奇": "传奇",
+    "傅奇": "传奇",
+    "传说": "传奇",
+}
+
+
+def canonical_quality(quality):
+    """将品质名称统一为简体标准名称"""
+    return QUALITY_ALIASES.get(quality, quality)
+
+
+# =========================
+# 品质徽章颜色识别
+# =========================
+# 品质徽章所在的文字行（相对鱼信息区域的比例，按弹窗截图估算）
+QUALITY_BADGE_REGION = (0.0, 0.0, 1.0, 0.55)
+QUALITY_HUE_BINS = 36  # OpenCV色相范围0-180，每格5
+QUALITY_MIN_SATURATION = 90  # 低于此饱和度的像素视为白/灰（标准品质和普通文字）
+QUALITY_MIN_VALUE = 90  # 低于此亮度的像素视为背景
+# 各品质徽章的色相范围（OpenCV色相，0-180）
+QUALITY_HUE_RANGES = {
+    "传奇": (10, 35),  # 金/橙
+    "非凡": (35, 85),  # 绿
+    "稀有": (85, 125),  # 蓝
+    "史诗": (125, 165),  # 紫
+}
+QUALITY_MIN_COLORED_RATIO = 0.004  # 彩色像素占比低于此值判定为标准品质
+QUALITY_COLOR_MIN_CONFIDENCE = 0.8  # 颜色判定的最低置信度
+QUALITY_COLOR_MIN_SAMPLES = 5  # 某品质与OCR核对至少这么多次后才单独信任颜色判定
+QUALITY_COLOR_MIN_AGREEMENT = 0.95  # 与OCR结果的一致率不低于此值才信任颜色判定
+
+
+class QualityColorClassifier:
+    """根据品质徽章颜色的色相直方图判断鱼的品质
+
+    判定只需一次颜色转换和直方图统计，不依赖OCR。色相范围是按游戏配色估计的，
+    因此每次OCR识别出品质后都会与颜色判定核对，只有一致率足够高的品质才会被单独信任。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checks = {}  # 品质 -> [核对次数, 一致次数]
+        self.classify_count = 0
+        self.total_time = 0.0
+
+    def histogram(self, img):
+        """统计徽章区域内彩色像素的色相直方图
+
+        Returns:
+            (直方图, 彩色像素占比)
+        """
+        height, width = img.shape[:2]
+        fx1, fy1, fx2, fy2 = QUALITY_BADGE_REGION
+        region = img[int(height * fy1) : int(height * fy2), int(width * fx1) : int(width * fx2)]
+        hsv = cv2.cvtColor(region, cv2.COLOR_RGB2HSV)
+        mask = cv2.inRange(
+            hsv, (0, QUALITY_MIN_SATURATION, QUALITY_MIN_VALUE), (180, 255, 255)
+        )
+        hist = cv2.calcHist([hsv], [0], mask, [QUALITY_HUE_BINS], [0, 180]).ravel()
+        total_pixels = max(region.shape[0] * region.shape[1], 1)
+        return hist, float(hist.sum()) / total_pixels
+
+    def classify(self, img):
+        """判断鱼信息图像（RGB）的品质
+
+        Returns:
+            (品质, 置信度0-1)，图像无效时返回 (None, 0.0)
+        """
+        if img is None or img.size == 0:
+            return None, 0.0
+        start_time = time.perf_counter()
+        hist, colored_ratio = self.histogram(img)
+
+        if colored_ratio < QUALITY_MIN_COLORED_RATIO:
+            quality = "标准"
+            confidence = 1.0 - colored_ratio / QUALITY_MIN_COLORED_RATIO
+        else:
+            bin_width = 180 / QUALITY_HUE_BINS
+            colored_total = float(hist.sum())
+            scores = {}
+            for name, (low, high) in QUALITY_HUE_RANGES.items():
+                first, last = int(low / bin_width), int(high / bin_width)
+                scores[name] = float(hist[first:last].sum()) / colored_total
+            quality = max(scores, key=scores.get)
+            confidence = scores[quality]
+
+        with self._lock:
+            self.classify_count += 1
+            self.total_time += time.perf_counter() - start_time
+        return quality, confidence
+
+    def record_check(self, color_quality, ocr_quality):
+        """用OCR识别出的品质核对颜色判定结果"""
+        if color_quality is None or not ocr_quality:
+            return
+        with self._lock:
+            entry = self._checks.setdefault(color_quality, [0, 0])
+            entry[0] += 1
+            if canonical_quality(ocr_quality) == color_quality:
+                entry[1] += 1
+
+    def is_trusted(self, quality, confidence):
+        """颜色判定是否足够可靠，可以不等OCR直接使用"""
+        if quality is None or confidence < QUALITY_COLOR_MIN_CONFIDENCE:
+            return False
+        with self._lock:
+            checked, agreed = self._checks.get(quality, (0, 0))
+        return (
+            checked >= QUALITY_COLOR_MIN_SAMPLES
+            and agreed / checked >= QUALITY_COLOR_MIN_AGREEMENT
+        )
+
+    def stats(self):
+        with self._lock:
+            checked = sum(entry[0] for entry in self._checks.values())
+            agreed = sum(entry[1] for entry in self._checks.values())
+            return {
+                "classify_count": self.classify_count,
+                "average_time": (
+                    self.total_time / self.classify_count if self.classify_count else None
+                ),
+                "checked": checked,
+                "agreement": agreed / checked if checked else None,
+                "trusted": [
+                    quality
+                    for quality, (count, ok) in self._checks.items()
+                    if count >= QUALITY_COLOR_MIN_SAMPLES
+                    and ok / count >= QUALITY_COLOR_MIN_AGREEMENT
+                ],
+            }
+
+
+quality_classifier = QualityColorClassifier()
+
 # 当前会话数据
 current_session_id = None
-current_session_fish = []  # 当前会话钓到的鱼
-all_fish_records = []  # 所有钓鱼记录（从文件加载）
+current_session_fish = None  # 当前会话钓到的鱼（FishRecordTable，在类定义后创建）
+all_fish_records = None  # 内存中的近期钓鱼记录（当天 + 最近若干条），完整历史在数据库中
+FISH_RECORD_RECENT_COUNT = 500  # 启动时至少加载的最近记录条数
+FISH_RECORD_PAGE_SIZE = 100  # 记录列表每页显示的条数
 fish_record_lock = threading.Lock()  # 钓鱼记录锁
 
 # GUI更新回调（将在create_gui中设置）
@@ -5481,12 +6133,15 @@ gui_fish_update_callback = None
 class FishRecord:
     """单条鱼的记录"""
 
-    def __init__(self, name, quality, weight):
+    __slots__ = ("name", "quality", "weight", "timestamp", "session_id", "name_confidence")
+
+    def __init__(self, name, quality, weight, name_confidence=None):
         self.name = name if name else "未知"
         self.quality = quality if quality in QUALITY_LEVELS else "标准"
         self.weight = weight if weight else "0"
         self.timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         self.session_id = current_session_id
+        self.name_confidence = name_confidence  # 鱼名与词典匹配的置信度，旧记录为None
 
     def to_dict(self):
         return {
@@ -5495,11 +6150,15 @@ class FishRecord:
             "weight": self.weight,
             "timestamp": self.timestamp,
             "session_id": self.session_id,
+            "name_confidence": self.name_confidence,
         }
 
     def to_line(self):
-        """转换为文件存储格式"""
-        return f"{self.session_id}|{self.timestamp}|{self.name}|{self.quality}|{self.weight}\n"
+        """转换为文件存储格式（第6列为鱼名置信度，可选）"""
+        line = f"{self.session_id}|{self.timestamp}|{self.name}|{self.quality}|{self.weight}"
+        if self.name_confidence is not None:
+            line += f"|{self.name_confidence:.2f}"
+        return line + "\n"
 
     @staticmethod
     def from_line(line):
@@ -5513,43 +6172,947 @@ class FishRecord:
                 record.name = parts[2]
                 record.quality = parts[3]
                 record.weight = parts[4]
+                record.name_confidence = None
+                if len(parts) >= 6 and parts[5]:
+                    try:
+                        record.name_confidence = float(parts[5])
+                    except ValueError:
+                        pass
                 return record
         except:
             pass
         return None
 
+    @staticmethod
+    def from_row(row):
+        """从数据库行解析（session_id, timestamp, name, quality, weight, name_confidence）"""
+        record = FishRecord.__new__(FishRecord)
+        (
+            record.session_id,
+            record.timestamp,
+            record.name,
+            record.quality,
+            record.weight,
+            record.name_confidence,
+        ) = row
+        return record
+
+    def to_row(self):
+        return (
+            self.session_id,
+            self.timestamp,
+            self.name,
+            self.quality,
+            self.weight,
+            self.name_confidence,
+        )
+
+
+FISH_RECORD_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def parse_weight_kg(weight):
+    """将 "1.23kg" 形式的重量转换为浮点数（千克），无法解析时返回NaN"""
+    try:
+        return float(str(weight).lower().replace("kg", "").strip())
+    except ValueError:
+        return float("nan")
+
+
+def parse_record_time(timestamp):
+    """将记录时间戳转换为epoch秒，无法解析时返回NaN"""
+    try:
+        return time.mktime(time.strptime(timestamp, FISH_RECORD_TIME_FORMAT))
+    except (TypeError, ValueError, OverflowError):
+        return float("nan")
+
+
+class _StringTable:
+    """字符串驻留表：相同的字符串只保存一份，列中存整数编码"""
+
+    __slots__ = ("values", "codes")
+
+    def __init__(self):
+        self.values = []
+        self.codes = {}
+
+    def encode(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+        return code
+
+    def matching_codes(self, predicate):
+        return [code for code, value in enumerate(self.values) if predicate(value)]
+
+
+class FishRecordTable:
+    """列式存储的钓鱼记录
+
+    鱼名、品质、会话以驻留字符串的整数编码保存，时间为epoch秒，重量为千克浮点数，
+    每条记录只占几十字节；品质统计和筛选都是numpy数组运算。
+    支持 append/len/迭代/下标，按需临时生成FishRecord对象。
+    """
+
+    _COLUMNS = (
+        ("name", np.int32),
+        ("quality", np.int16),
+        ("session", np.int32),
+        ("time", np.float64),
+        ("weight", np.float32),
+        ("confidence", np.float32),
+    )
+    _INITIAL_CAPACITY = 256
+
+    def __init__(self, records=()):
+        self._names = _StringTable()
+        self._qualities = _StringTable()
+        self._sessions = _StringTable()
+        self.clear()
+        self.extend(records)
+
+    def clear(self):
+        self._size = 0
+        self._columns = {
+            name: np.empty(self._INITIAL_CAPACITY, dtype=dtype) for name, dtype in self._COLUMNS
+        }
+
+    def __len__(self):
+        return self._size
+
+    def __bool__(self):
+        return self._size > 0
+
+    def _reserve(self, capacity):
+        current = len(self._columns["name"])
+        if capacity <= current:
+            return
+        new_capacity = max(capacity, current * 2)
+        for name, column in self._columns.items():
+            grown = np.empty(new_capacity, dtype=column.dtype)
+            grown[: self._size] = column[: self._size]
+            self._columns[name] = grown
+
+    def append(self, record):
+        self._reserve(self._size + 1)
+        i = self._size
+        columns = self._columns
+        columns["name"][i] = self._names.encode(record.name)
+        columns["quality"][i] = self._qualities.encode(record.quality)
+        columns["session"][i] = self._sessions.encode(record.session_id)
+        columns["time"][i] = parse_record_time(record.timestamp)
+        columns["weight"][i] = parse_weight_kg(record.weight)
+        columns["confidence"][i] = (
+            np.nan if record.name_confidence is None else record.name_confidence
+        )
+        self._size += 1
+
+    def extend(self, records):
+        for record in records:
+            self.append(record)
+
+    def _record(self, i):
+        columns = self._columns
+        record = FishRecord.__new__(FishRecord)
+        record.name = self._names.values[columns["name"][i]]
+        record.quality = self._qualities.values[columns["quality"][i]]
+        record.session_id = self._sessions.values[columns["session"][i]]
+        epoch = columns["time"][i]
+        record.timestamp = (
+            "" if np.isnan(epoch) else time.strftime(FISH_RECORD_TIME_FORMAT, time.localtime(epoch))
+        )
+        weight = columns["weight"][i]
+        record.weight = "0" if np.isnan(weight) else f"{weight:.2f}kg"
+        confidence = columns["confidence"][i]
+        record.name_confidence = None if np.isnan(confidence) else round(float(confidence), 2)
+        return record
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._record(i) for i in range(*index.indices(self._size))]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("FishRecordTable index out of range")
+        return self._record(index)
+
+    def __iter__(self):
+        for i in range(self._size):
+            yield self._record(i)
+
+    def trim_front(self, count):
+        """丢弃最早的count条记录"""
+        count = min(count, self._size)
+        if count <= 0:
+            return
+        for column in self._columns.values():
+            column[: self._size - count] = column[count : self._size]
+        self._size -= count
+
+    def count_before(self, epoch):
+        """时间早于epoch的记录条数（记录按时间顺序追加）"""
+        times = self._columns["time"][: self._size]
+        return int(np.searchsorted(times, epoch, side="left"))
+
+    def quality_counts(self):
+        """按品质计数，返回 {品质（原始写法）: 条数}"""
+        counts = np.bincount(
+            self._columns["quality"][: self._size], minlength=len(self._qualities.values)
+        )
+        return {
+            quality: int(count)
+            for quality, count in zip(self._qualities.values, counts)
+            if count
+        }
+
+    def search(self, keyword="", qualities=None, names=None):
+        """按鱼名关键词、精确鱼名和品质筛选，按时间从旧到新返回FishRecord列表"""
+        mask = self._filter_mask(keyword, qualities, names)
+        return [self._record(i) for i in np.flatnonzero(mask)]
+
+    def _filter_mask(self, keyword="", qualities=None, names=None):
+        mask = np.ones(self._size, dtype=bool)
+        if names is not None:
+            codes = [self._names.codes[name] for name in names if name in self._names.codes]
+            mask &= np.isin(self._columns["name"][: self._size], codes)
+        if qualities:
+            quality_set = set(qualities)
+            codes = self._qualities.matching_codes(lambda value: value in quality_set)
+            mask &= np.isin(self._columns["quality"][: self._size], codes)
+        if keyword:
+            keyword = keyword.lower()
+            codes = self._names.matching_codes(lambda value: keyword in value.lower())
+            mask &= np.isin(self._columns["name"][: self._size], codes)
+        return mask
+
+    def search_page(self, keyword="", qualities=None, offset=0, limit=None, names=None):
+        """按条件筛选并分页，只为这一页生成FishRecord
+
+        Returns:
+            (按时间从新到旧的记录列表, 符合条件的总条数)
+        """
+        mask = self._filter_mask(keyword, qualities, names)
+        indices = np.flatnonzero(mask)[::-1]
+        stop = None if limit is None else offset + limit
+        return [self._record(i) for i in indices[offset:stop]], len(indices)
+
+    def memory_bytes(self):
+        """列数据占用的字节数（不含驻留字符串）"""
+        return sum(column[: self._size].nbytes for column in self._columns.values())
+
+
+def quality_filter_values(quality_filter):
+    """品质筛选项对应的所有品质写法（含繁体和别名），"全部"返回None"""
+    if not quality_filter or quality_filter == "全部":
+        return None
+    return [
+        quality
+        for quality in QUALITY_LEVELS + list(QUALITY_ALIASES)
+        if canonical_quality(quality) == quality_filter
+    ] or [quality_filter]
+
+
+def today_timestamp_range():
+    """当天记录的时间戳范围 [开始, 结束)，时间戳格式为 YYYY-MM-DD HH:MM:SS"""
+    today = datetime.date.today()
+    tomorrow = today + datetime.timedelta(days=1)
+    return today.strftime("%Y-%m-%d"), tomorrow.strftime("%Y-%m-%d")
+
+
+class FishRecordStore:
+    """基于SQLite的钓鱼记录存储
+
+    时间、会话、品质、鱼名都建有索引，查询和统计交给数据库完成，
+    不需要把全部历史读进内存。首次打开时会把旧版 fish_records.txt 导入一次。
+    """
+
+    IMPORT_BATCH_SIZE = 5000
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def open(self):
+        """打开数据库，建表建索引，并导入旧版文本记录"""
+        with self._lock:
+            if self._conn is not None:
+                return
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS fish_records (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    session_id TEXT,
+                    timestamp TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    quality TEXT NOT NULL,
+                    weight TEXT,
+                    name_confidence REAL
+                );
+                CREATE INDEX IF NOT EXISTS idx_fish_records_timestamp ON fish_records(timestamp);
+                CREATE INDEX IF NOT EXISTS idx_fish_records_session ON fish_records(session_id);
+                CREATE INDEX IF NOT EXISTS idx_fish_records_quality ON fish_records(quality, timestamp);
+                CREATE INDEX IF NOT EXISTS idx_fish_records_name ON fish_records(name);
+                CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+                """
+            )
+            self._conn.commit()
+        self.import_text_file(FISH_RECORD_FILE)
+
+    def _get_meta(self, key):
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value)
+        )
+
+    def import_text_file(self, path):
+        """一次性导入旧版 session|timestamp|name|quality|weight 文本记录
+
+        Returns:
+            int: 导入的记录条数，已导入过或文件不存在时为0
+        """
+        if not os.path.exists(path):
+            return 0
+        with self._lock:
+            if self._get_meta("text_import") is not None:
+                return 0
+            start_time = time.perf_counter()
+            imported = 0
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    batch = []
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        record = FishRecord.from_line(line)
+                        if record is None:
+                            continue
+                        batch.append(record.to_row())
+                        if len(batch) >= self.IMPORT_BATCH_SIZE:
+                            self._insert_rows(batch)
+                            imported += len(batch)
+                            batch = []
+                    if batch:
+                        self._insert_rows(batch)
+                        imported += len(batch)
+                self._set_meta(
+                    "text_import",
+                    json.dumps(
+                        {
+                            "path": os.path.abspath(path),
+                            "records": imported,
+                            "imported_at": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                        },
+                        ensure_ascii=False,
+                    ),
+                )
+                self._conn.commit()
+            except Exception as e:
+                # 导入失败时整体回滚，下次启动重新导入
+                self._conn.rollback()
+                print(f"❌ [错误] 导入旧版钓鱼记录失败: {e}")
+                return 0
+        print(
+            f"📦 [记录] 已从 {path} 导入 {imported} 条钓鱼记录到数据库"
+            f"（{time.perf_counter() - start_time:.1f}s）"
+        )
+        return imported
+
+    def _insert_rows(self, rows):
+        self._conn.executemany(
+            "INSERT INTO fish_records (session_id, timestamp, name, quality, weight, name_confidence) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+    def add(self, record):
+        """保存单条记录"""
+        with self._lock:
+            self._insert_rows([record.to_row()])
+            self._conn.commit()
+
+    def clear(self):
+        """删除所有记录（保留导入标记，旧版文本记录不会被再次导入）"""
+        with self._lock:
+            self._conn.execute("DELETE FROM fish_records")
+            self._conn.commit()
+
+    @staticmethod
+    def _where(keyword="", qualities=None, since=None, until=None, session_id=None, names=None):
+        clauses = []
+        params = []
+        if names is not None:
+            # 鱼名索引已解析出的精确鱼名，走name索引
+            if names:
+                clauses.append(f"name IN ({', '.join('?' * len(names))})")
+                params.extend(names)
+            else:
+                clauses.append("0")
+        if keyword:
+            clauses.append("name LIKE ? ESCAPE '\\'")
+            escaped = keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params.append(f"%{escaped}%")
+        if qualities:
+            clauses.append(f"quality IN ({', '.join('?' * len(qualities))})")
+            params.extend(qualities)
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("timestamp < ?")
+            params.append(until)
+        if session_id is not None:
+            clauses.append("session_id = ?")
+            params.append(session_id)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def search(self, keyword="", qualities=None, since=None, until=None, session_id=None, limit=None, offset=0, names=None):
+        """按条件查询记录，按时间从新到旧返回FishRecord列表"""
+        where, params = self._where(keyword, qualities, since, until, session_id, names)
+        sql = (
+            "SELECT session_id, timestamp, name, quality, weight, name_confidence "
+            f"FROM fish_records{where} ORDER BY id DESC"
+        )
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [FishRecord.from_row(row) for row in rows]
+
+    def count(self, keyword="", qualities=None, since=None, until=None, session_id=None, names=None):
+        """按条件统计记录条数"""
+        where, params = self._where(keyword, qualities, since, until, session_id, names)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM fish_records{where}", params).fetchone()[0]
+
+    def quality_counts(self, since=None, until=None, session_id=None):
+        """按品质分组计数，返回 {品质: 条数}（品质为原始写法）"""
+        where, params = self._where(since=since, until=until, session_id=session_id)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT quality, COUNT(*) FROM fish_records{where} GROUP BY quality", params
+            ).fetchall()
+        return dict(rows)
+
+    def all_names(self):
+        """所有记录中出现过的鱼名及次数"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT name, COUNT(*) FROM fish_records GROUP BY name"
+            ).fetchall()
+
+
+fish_record_store = FishRecordStore(FISH_RECORD_DB)
+
+FISH_NAME_INDEX_MAX_NAMES = 500  # 关键词匹配的鱼名超过此数量时改用LIKE查询（SQLite参数个数有限）
+
+
+class FishNameIndex:
+    """鱼名n-gram索引，搜索框输入关键词时直接得到包含它的所有鱼名
+
+    索引的是不重复的鱼名（单字和相邻两字），随新记录增量维护；
+    查询得到的精确鱼名再交给数据库的name索引或记录表的编码筛选。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._names = set()
+        self._grams = {}  # n-gram -> 鱼名集合
+
+    @staticmethod
+    def _ngrams(text):
+        grams = set(text)
+        grams.update(text[i : i + 2] for i in range(len(text) - 1))
+        return grams
+
+    def add(self, name):
+        if not name:
+            return
+        with self._lock:
+            if name in self._names:
+                return
+            self._names.add(name)
+            for gram in self._ngrams(name.lower()):
+                self._grams.setdefault(gram, set()).add(name)
+
+    def rebuild(self, names):
+        with self._lock:
+            self._names = set()
+            self._grams = {}
+        for name in names:
+            self.add(name)
+
+    def lookup(self, keyword):
+        """返回包含关键词的所有鱼名（不区分大小写）"""
+        keyword = keyword.lower()
+        if not keyword:
+            return []
+        with self._lock:
+            if len(keyword) == 1:
+                return sorted(self._grams.get(keyword, ()))
+            # 用最少候选的两字组缩小范围，再确认完整包含
+            grams = [keyword[i : i + 2] for i in range(len(keyword) - 1)]
+            candidate_sets = [self._grams.get(gram, set()) for gram in grams]
+            candidates = min(candidate_sets, key=len)
+            return sorted(name for name in candidates if keyword in name.lower())
+
+    def __len__(self):
+        return len(self._names)
+
+
+fish_name_index = FishNameIndex()
+
+
+def resolve_keyword_names(keyword):
+    """把搜索关键词解析为精确鱼名列表
+
+    Returns:
+        (LIKE关键词, 鱼名列表)：能用索引时关键词为空、鱼名列表为匹配结果；
+        匹配鱼名过多时退回LIKE查询，鱼名列表为None
+    """
+    if not keyword:
+        return "", None
+    names = fish_name_index.lookup(keyword)
+    if len(names) > FISH_NAME_INDEX_MAX_NAMES:
+        return keyword, None
+    return "", names
+
+
+class QualityStats:
+    """本次会话、当天、全部历史的品质计数
+
+    启动时从数据库各统计一次，之后每条新记录O(1)累加，统计面板刷新不再扫描记录。
+    跨过零点后当天计数自动清零。
+    """
+
+    SCOPES = ("session", "today", "all")
+    TIERS = ("标准", "非凡", "稀有", "史诗", "传奇")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {scope: collections.Counter() for scope in self.SCOPES}
+        self._day = datetime.date.today()
+
+    def _roll_day(self):
+        today = datetime.date.today()
+        if today != self._day:
+            self._day = today
+            self._counts["today"] = collections.Counter()
+
+    @staticmethod
+    def _canonical_counts(raw_counts):
+        counts = collections.Counter()
+        for quality, count in raw_counts.items():
+            counts[canonical_quality(quality)] += count
+        return counts
+
+    def load(self, store):
+        """从数据库统计当天和全部历史的计数"""
+        since, until = today_timestamp_range()
+        today_counts = self._canonical_counts(store.quality_counts(since, until))
+        all_counts = self._canonical_counts(store.quality_counts())
+        with self._lock:
+            self._day = datetime.date.today()
+            self._counts["today"] = today_counts
+            self._counts["all"] = all_counts
+
+    def add(self, quality):
+        """累加一条新记录"""
+        quality = canonical_quality(quality)
+        with self._lock:
+            self._roll_day()
+            for counts in self._counts.values():
+                counts[quality] += 1
+
+    def reset(self, scope):
+        """清零某个范围（清空全部历史时当天计数一并清零）"""
+        with self._lock:
+            scopes = ("today", "all") if scope == "all" else (scope,)
+            for name in scopes:
+                self._counts[name] = collections.Counter()
+
+    def snapshot(self, scope):
+        """返回 (各品质计数, 总数)"""
+        with self._lock:
+            self._roll_day()
+            counts = self._counts[scope]
+            tier_counts = {tier: counts.get(tier, 0) for tier in self.TIERS}
+            return tier_counts, sum(counts.values())
+
+
+quality_stats = QualityStats()
+current_session_fish = FishRecordTable()
+all_fish_records = FishRecordTable()
+
+
+def trim_recent_fish_records():
+    """丢弃内存中超出近期范围的旧记录（调用方需持有fish_record_lock）
+
+    超出两倍上限时才整理一次，保证追加记录的均摊开销为O(1)；当天的记录始终保留。
+    """
+    excess = len(all_fish_records) - FISH_RECORD_RECENT_COUNT
+    if excess <= FISH_RECORD_RECENT_COUNT:
+        return
+    today_start = parse_record_time(today_timestamp_range()[0] + " 00:00:00")
+    all_fish_records.trim_front(min(excess, all_fish_records.count_before(today_start)))
+
+
+def page_fish_records(offset=0, limit=FISH_RECORD_PAGE_SIZE, keyword="", quality_filter="全部", today_only=False):
+    """按页从数据库读取历史记录（最新的在前）"""
+    since, until = today_timestamp_range() if today_only else (None, None)
+    like_keyword, names = resolve_keyword_names(keyword)
+    return fish_record_store.search(
+        like_keyword,
+        quality_filter_values(quality_filter),
+        since,
+        until,
+        limit=limit,
+        offset=offset,
+        names=names,
+    )
+
+
+def query_fish_record_page(mode, page, keyword="", quality_filter="全部"):
+    """查询记录列表的一页（最新的在前）
+
+    Returns:
+        (这一页的记录列表, 符合条件的总条数)
+    """
+    offset = page * FISH_RECORD_PAGE_SIZE
+    if mode == "current":
+        # 本次钓鱼（内存中）：鱼名先经索引解析，锁内只做向量化筛选
+        like_keyword, names = resolve_keyword_names(keyword)
+        qualities = quality_filter_values(quality_filter)
+        with fish_record_lock:
+            return current_session_fish.search_page(
+                like_keyword, qualities, offset, FISH_RECORD_PAGE_SIZE, names
+            )
+
+    # 当天钓鱼 / 历史总览：由数据库按索引只查询这一页，不需要记录锁
+    today_only = mode == "today"
+    records = page_fish_records(offset, FISH_RECORD_PAGE_SIZE, keyword, quality_filter, today_only)
+    if keyword or quality_filter != "全部":
+        filtered_total = count_fish_records(keyword, quality_filter, today_only)
+    else:
+        filtered_total = quality_stats.snapshot("today" if today_only else "all")[1]
+    return records, filtered_total
+
+
+class FishRecordQueryWorker:
+    """记录列表的后台查询线程
+
+    GUI提交查询后立即返回，查询在后台线程执行，结果通过回调交回；
+    连续提交时只执行最新的一次，过期的结果直接丢弃。
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._thread = None
+
+    def submit(self, callback, *args):
+        """提交查询：在后台执行 query_fish_record_page(*args)，完成后调用 callback(generation, result)
+
+        Returns:
+            本次查询的序号
+        """
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        self._queue.put((generation, callback, args))
+        return generation
+
+    def is_latest(self, generation):
+        return generation == self._generation
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            # 只保留队列里最新的一次查询
+            while True:
+                try:
+                    job = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            generation, callback, args = job
+            if not self.is_latest(generation):
+                continue
+            try:
+                result = query_fish_record_page(*args)
+            except Exception as e:
+                print(f"❌ [错误] 查询钓鱼记录失败: {e}")
+                continue
+            if self.is_latest(generation):
+                callback(generation, result)
+
+
+fish_record_query_worker = FishRecordQueryWorker()
+FISH_RECORD_SEARCH_DEBOUNCE_MS = 250  # 搜索框停止输入多久后才开始搜索
+
 
 def save_fish_record(fish_record):
-    """保存单条钓鱼记录到文件"""
+    """保存单条钓鱼记录到数据库
+
+    Returns:
+        bool: 是否保存成功
+    """
     try:
-        with open(FISH_RECORD_FILE, "a", encoding="utf-8") as f:
-            f.write(fish_record.to_line())
+        fish_record_store.add(fish_record)
+        return True
     except Exception as e:
         print(f"❌ [错误] 保存钓鱼记录失败: {e}")
+        return False
 
 
 def load_all_fish_records():
-    """加载所有历史钓鱼记录"""
+    """打开记录数据库并加载近期钓鱼记录
+
+    只加载当天的记录和最近 FISH_RECORD_RECENT_COUNT 条记录，启动耗时和内存占用
+    不随历史增长；更早的历史在切换到历史总览时按页从数据库查询。
+    """
     global all_fish_records
-    all_fish_records = []
+    all_fish_records = FishRecordTable()
     try:
-        if os.path.exists(FISH_RECORD_FILE):
-            with open(FISH_RECORD_FILE, "r", encoding="utf-8") as f:
-                for line in f:
-                    if line.strip():
-                        record = FishRecord.from_line(line)
-                        if record:
-                            all_fish_records.append(record)
-            print(f"📊 [信息] 已加载 {len(all_fish_records)} 条历史钓鱼记录")
+        fish_record_store.open()
+        since, until = today_timestamp_range()
+        today_count = fish_record_store.count(since=since, until=until)
+        recent = fish_record_store.search(limit=max(today_count, FISH_RECORD_RECENT_COUNT))
+        recent.reverse()
+        all_fish_records = FishRecordTable(recent)
+        quality_stats.load(fish_record_store)
+        print(
+            f"📊 [信息] 已加载 {len(all_fish_records)} 条近期钓鱼记录"
+            f"（共 {quality_stats.snapshot('all')[1]} 条历史记录）"
+        )
+        name_counts = fish_record_store.all_names()
     except Exception as e:
         print(f"❌ [错误] 加载钓鱼记录失败: {e}")
+        name_counts = []
+    fish_name_dictionary.rebuild(name_counts)
+    fish_name_index.rebuild(name for name, _ in name_counts)
+
+
+# =========================
+# 鱼名词典
+# =========================
+# 内置的已知鱼名，其余鱼名从历史记录中学习
+KNOWN_FISH_NAMES = ["美髯公"] + PHANTOM_RARE_FISHES
+FISH_NAME_MIN_OCCURRENCES = 5  # 历史记录中出现至少这么多次的鱼名才视为已知鱼名（偶发的OCR错字不会被学进词典）
+FISH_NAME_MAX_DISTANCE = 2  # 模糊匹配允许的最大编辑距离
+FISH_NAME_MIN_CONFIDENCE = 0.75  # 低于此置信度不吸附（三个字错一个只有0.67，不会被改成另一种鱼）
+FISH_NAME_EXACT_MAX_LENGTH = 3  # 不超过这个长度的中文鱼名只接受完全一致，错一个字可能就是另一种鱼
+
+
+def edit_distance(a, b, max_distance=None):
+    """计算两个字符串的编辑距离（Levenshtein），超过max_distance时提前返回max_distance+1"""
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    if max_distance is not None and len(a) - len(b) > max_distance:
+        return max_distance + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (char_a != char_b),
+                )
+            )
+        if max_distance is not None and min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+def _name_deletes(name, depth):
+    """生成删除最多depth个字符后的所有变体（含原名），用于编辑距离索引"""
+    variants = {name}
+    frontier = {name}
+    for _ in range(depth):
+        next_frontier = set()
+        for variant in frontier:
+            for i in range(len(variant)):
+                next_frontier.add(variant[:i] + variant[i + 1 :])
+        variants |= next_frontier
+        frontier = next_frontier
+    return variants
+
+
+class FishNameDictionary:
+    """已知鱼名词典，将OCR识别出的鱼名吸附到最接近的标准名称
+
+    使用删除变体索引：编辑距离不超过d的两个词，各自删除不超过d个字符后必有相同的变体，
+    因此查询只需生成查询词的删除变体并核对候选词，不用遍历整个词典。
+    """
+
+    def __init__(self, seed_names=(), exact_names=()):
+        """
+        Args:
+            seed_names: 内置的已知鱼名
+            exact_names: 只接受完全一致、不做模糊吸附的鱼名（吸附错了会导致误放生）
+        """
+        self._lock = threading.Lock()
+        self._seed_names = list(seed_names)
+        self._exact_names = set(exact_names)
+        self._names = set()
+        self._index = {}  # 删除变体 -> 鱼名集合
+        self._occurrences = collections.Counter()  # 未知鱼名出现次数
+        self.snap_count = 0  # 鱼名被纠正的次数
+        self.unknown_count = 0  # 未能匹配到已知鱼名的次数
+        for name in self._seed_names:
+            self._add(name)
+
+    @staticmethod
+    def max_distance_for(name):
+        """按名称长度决定允许的编辑距离：短中文名称必须完全一致，其余短名称只容忍1个字的误差"""
+        if len(name) <= FISH_NAME_EXACT_MAX_LENGTH and re.search(r"[\u4e00-\u9fff]", name):
+            return 0
+        return min(FISH_NAME_MAX_DISTANCE, max(1, len(name) // 3))
+
+    @staticmethod
+    def _key(name):
+        """词典中使用的鱼名：中文鱼名去掉OCR插入的空格"""
+        return name.replace(" ", "") if re.search(r"[\u4e00-\u9fff]", name) else name
+
+    def _add(self, name):
+        if name in self._names:
+            return
+        self._names.add(name)
+        for variant in _name_deletes(name, self.max_distance_for(name)):
+            self._index.setdefault(variant, set()).add(name)
+
+    def rebuild(self, name_counts):
+        """根据历史记录中的鱼名重建词典
+
+        Args:
+            name_counts: (鱼名, 出现次数) 序列
+        """
+        counter = collections.Counter()
+        for name, count in name_counts:
+            if name and name != "未知":
+                counter[name] += count
+        with self._lock:
+            self._names = set()
+            self._index = {}
+            self._occurrences = collections.Counter()
+            for name in self._seed_names:
+                self._add(name)
+            for name, count in counter.items():
+                if count >= FISH_NAME_MIN_OCCURRENCES:
+                    self._add(name)
+                else:
+                    self._occurrences[name] = count
+            size = len(self._names)
+        print(f"📖 [鱼名词典] 已知鱼名 {size} 种")
+
+    def _lookup(self, name):
+        """查找最接近的已知鱼名，返回 (鱼名, 编辑距离)，找不到时返回 (None, None)"""
+        max_distance = self.max_distance_for(name)
+        candidates = set()
+        for variant in _name_deletes(name, max_distance):
+            candidates |= self._index.get(variant, set())
+        best_name, best_distance = None, None
+        for candidate in candidates:
+            if candidate in self._exact_names:
+                continue
+            distance = edit_distance(name, candidate, max_distance)
+            # 两个名称的容忍度都要满足，短鱼名不会被长一个字的OCR结果吸附
+            if distance > min(max_distance, self.max_distance_for(candidate)):
+                continue
+            if best_distance is None or (distance, candidate) < (best_distance, best_name):
+                best_name, best_distance = candidate, distance
+        return best_name, best_distance
+
+    def snap(self, name, record_stats=True):
+        """将OCR鱼名吸附到最接近的已知鱼名
+
+        Args:
+            name: OCR解析出的鱼名
+            record_stats: 是否计入纠正/未匹配统计（基准测试时关闭）
+
+        Returns:
+            (鱼名, 置信度0-1)；匹配不到已知鱼名时返回原名和None
+        """
+        if not name:
+            return name, None
+        key = self._key(name)
+        with self._lock:
+            if key in self._names:
+                return key, 1.0
+            best_name, distance = self._lookup(key)
+            if best_name is not None:
+                confidence = 1.0 - distance / max(len(key), len(best_name))
+                if confidence >= FISH_NAME_MIN_CONFIDENCE:
+                    if record_stats:
+                        self.snap_count += 1
+                    return best_name, round(confidence, 2)
+            if record_stats:
+                self.unknown_count += 1
+            return name, None
+
+    def observe(self, name):
+        """记录一次OCR解析出的原始鱼名；未知鱼名出现次数足够后加入词典
+
+        传入吸附前的名称：被吸附到别的鱼名的新鱼种也能积累出现次数，最终学进词典。
+        """
+        if not name or name == "未知":
+            return
+        name = self._key(name)
+        with self._lock:
+            if name in self._names:
+                return
+            self._occurrences[name] += 1
+            if self._occurrences[name] >= FISH_NAME_MIN_OCCURRENCES:
+                del self._occurrences[name]
+                self._add(name)
+                print(f"📖 [鱼名词典] 新增鱼名: {name}")
+
+    def contains(self, name):
+        """鱼名是否与某个已知鱼名完全一致"""
+        if not name:
+            return False
+        with self._lock:
+            return self._key(name) in self._names
+
+    def names(self):
+        with self._lock:
+            return sorted(self._names)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._names),
+                "snap_count": self.snap_count,
+                "unknown_count": self.unknown_count,
+            }
+
+
+fish_name_dictionary = FishNameDictionary(KNOWN_FISH_NAMES, exact_names=PHANTOM_RARE_FISHES)
 
 
 def start_new_session():
     """开始新的钓鱼会话"""
     global current_session_id, current_session_fish
     current_session_id = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    current_session_fish = []
+    current_session_fish = FishRecordTable()
+    quality_stats.reset("session")
     print(f"🎣 [会话] 新钓鱼会话开始: {current_session_id}")
 
 
@@ -5559,9 +7122,7 @@ def end_current_session():
     if current_session_fish:
         print(f"📊 [会话] 本次钓鱼结束，共钓到 {len(current_session_fish)} 条鱼")
         # 统计品质
-        quality_count = {}
-        for fish in current_session_fish:
-            quality_count[fish.quality] = quality_count.get(fish.quality, 0) + 1
+        quality_count = current_session_fish.quality_counts()
         for q, count in quality_count.items():
             emoji = QUALITY_COLORS.get(q, "⚪")
             print(f"   {emoji} {q}: {count} 条")
@@ -5572,14 +7133,13 @@ def capture_fish_info_region(scr_param=None):
     """截取鱼信息区域的图像
 
     Args:
-        scr_param: 截图对象，如果为None则使用全局scr对象
+        scr_param: 截图对象，如果为None则使用当前线程的截图会话
 
     Returns:
         img_rgb: RGB格式的鱼信息区域图像，如果截取失败则返回None
     """
-    global scr
-    # 优先使用传入的scr_param，如果为None则使用全局scr
-    current_scr = scr_param if scr_param is not None else scr
+    # 优先使用传入的scr_param，如果为None则使用当前线程的截图会话
+    current_scr = scr_param if scr_param is not None else get_capture_session()
 
     if current_scr is None:
         # 调试信息：记录错误
@@ -5590,7 +7150,7 @@ def capture_fish_info_region(scr_param=None):
                 ],
                 "action": "capture_error",
                 "error": "截图对象未初始化",
-                "scr_source": "传入参数" if scr_param is not None else "全局对象",
+                "scr_source": "传入参数" if scr_param is not None else "线程会话",
             }
             add_debug_info(debug_info)
         return None
@@ -5623,7 +7183,7 @@ def capture_fish_info_region(scr_param=None):
                     },
                     "action": "capture_error",
                     "error": "截取图像失败",
-                    "scr_source": "传入参数" if scr_param is not None else "全局对象",
+                    "scr_source": "传入参数" if scr_param is not None else "线程会话",
                 }
                 add_debug_info(debug_info)
             return None
@@ -5647,7 +7207,7 @@ def capture_fish_info_region(scr_param=None):
                 },
                 "action": "capture_region",
                 "message": "成功截取鱼信息区域",
-                "scr_source": "传入参数" if scr_param is not None else "全局对象",
+                "scr_source": "传入参数" if scr_param is not None else "线程会话",
             }
             add_debug_info(debug_info)
 
@@ -5670,15 +7230,731 @@ def capture_fish_info_region(scr_param=None):
                 },
                 "action": "capture_error",
                 "error": str(e),
-                "scr_source": "传入参数" if scr_param is not None else "全局对象",
+                "scr_source": "传入参数" if scr_param is not None else "线程会话",
             }
             add_debug_info(debug_info)
         return None
 
 
+# 鱼信息文本的词法规则，模块加载时编译一次
+_QUALITY_ALTERNATION = "|".join(
+    re.escape(quality) for quality in sorted(QUALITY_LEVELS, key=len, reverse=True)
+)
+_FISH_INFO_TOKEN_RE = re.compile(
+    r"(?P<prefix>你?[钓釣約]到了|(?P<first>首次)?捕[获獲])"
+    r"|(?P<first_only>首次)"
+    rf"|(?P<quality>{_QUALITY_ALTERNATION})"
+    # 重量数值支持千位分隔符（1,250g）
+    r"|(?P<weight>(?P<value>\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+\.?\d*)\s*(?P<unit>kg|g|千克|克|公斤)?)"
+    # 鱼名片段：中文和英文，遇到品质词时截断
+    rf"|(?P<word>(?:(?!{_QUALITY_ALTERNATION})[\u4e00-\u9fff\uf900-\ufaffa-zA-Z])+)"
+    r"|(?P<space>\s+)"
+    r"|(?P<junk>.)",
+    re.IGNORECASE,
+)
+_QUALITY_PRIORITY = {quality: index for index, quality in enumerate(QUALITY_LEVELS)}
+
+
+def _join_fish_name(words):
+    """合并鱼名片段，丢弃单个字符（可能是OCR误识别）"""
+    filtered_words = [word for word in words if len(word) > 1 or word in ["a", "A"]]
+    name = " ".join(filtered_words)
+    # OCR误差由鱼名词典纠正（FishNameDictionary.snap）
+    return name if len(name) >= 2 else None
+
+
+def parse_fish_info_text(full_text):
+    """从OCR合并文本中解析鱼的信息
+
+    只对文本做一次词法扫描：前缀（你钓到了/首次捕获）之后的中英文片段组成鱼名，
+    品质取优先级最高的品质词，重量取最后一个带单位的数字（没有带单位的数字时取最后一个数字），
+    避免把重量后面的杂散数字当作重量。片段之间只隔着标点时视为同一个词。
+
+    Args:
+        full_text: OCR识别到的所有文本，以空格连接
+
+    Returns:
+        (鱼名, 品质, 重量, 是否首次捕获)，无法识别的字段为None
+    """
+    if not full_text:
+        return None, None, None, False
+
+    fish_quality = None
+    weight_token = None  # 最后一个带单位的重量
+    bare_weight_token = None  # 最后一个不带单位的数字
+    is_first_capture = False
+    seen_prefix = False
+    words = []  # 前缀之前的片段，未识别到前缀时作为鱼名
+    name_words = []  # 前缀之后的片段
+    current_word = ""
+    for token in _FISH_INFO_TOKEN_RE.finditer(full_text):
+        kind = token.lastgroup
+        if kind == "word":
+            current_word += token.group("word")
+            continue
+        if kind == "junk":
+            continue
+        # 其余记号都会结束当前片段
+        if current_word:
+            (name_words if seen_prefix else words).append(current_word)
+            current_word = ""
+        if kind == "prefix":
+            if token.group("first"):
+                is_first_capture = True
+            if not seen_prefix:
+                seen_prefix = True
+        elif kind == "first_only":
+            is_first_capture = True
+        elif kind == "quality":
+            quality = token.group("quality")
+            if fish_quality is None or _QUALITY_PRIORITY[quality] < _QUALITY_PRIORITY[fish_quality]:
+                fish_quality = quality
+        elif kind == "weight":
+            if token.group("unit"):
+                weight_token = (token.group("value"), token.group("unit"))
+            else:
+                bare_weight_token = (token.group("value"), None)
+    if current_word:
+        (name_words if seen_prefix else words).append(current_word)
+
+    if weight_token is None:
+        weight_token = bare_weight_token
+    fish_weight = None
+    if weight_token is not None:
+        value = float(weight_token[0].replace(",", ""))
+        unit = weight_token[1].lower() if weight_token[1] else "kg"
+        if unit in ["g", "克"]:
+            value /= 1000
+        fish_weight = f"{value:.2f}kg"
+
+    fish_name = _join_fish_name(name_words if seen_prefix else words)
+    return fish_name, fish_quality, fish_weight, is_first_capture
+
+
+# 解析器的内置校验语料：OCR合并文本 → 期望的 (鱼名, 品质, 重量, 是否首次捕获)
+# 鱼名为解析器直接给出的结果（未经词典吸附）。这里只放边界情况，
+# 真实弹窗的OCR文本由调试窗口的"冻结解析语料"写入 FISH_INFO_CORPUS_FILE
+FISH_INFO_PARSER_CORPUS = [
+    ("你钓到了 鲈鱼 标准 1.25kg", ("鲈鱼", "标准", "1.25kg", False)),
+    ("你钓到了 黄鸭叫 稀有 850g", ("黄鸭叫", "稀有", "0.85kg", False)),
+    ("首次捕获 美髯公 传奇 12.3kg", ("美髯公", "传奇", "12.30kg", True)),
+    ("你約到了 地包天鱼 非凡 2.1千克", ("地包天鱼", "非凡", "2.10kg", False)),
+    ("首次捕獲 鬼刀鱼 史詩 3.5公斤", ("鬼刀鱼", "史詩", "3.50kg", True)),
+    ("你钓到了【大师龟】 傳奇 20.00kg", ("大师龟", "傳奇", "20.00kg", False)),
+    ("釣到了 Big Fish 非凡 5.5KG", ("Big Fish", "非凡", "5.50kg", False)),
+    ("鲈鱼 标准 0.8kg", ("鲈鱼", "标准", "0.80kg", False)),
+    ("你钓到了 拳击虾", ("拳击虾", None, None, False)),
+    # 没有单位时取最后一个数字
+    ("你钓到了 金蛙 非凡 3", ("金蛙", "非凡", "3.00kg", False)),
+    # 重量后面的杂散数字不能当作重量
+    ("你钓到了 鲈鱼 标准 1.5 kg 2024", ("鲈鱼", "标准", "1.50kg", False)),
+    # 千位分隔符
+    ("你钓到了 大罐子鱼 稀有 1,250g", ("大罐子鱼", "稀有", "1.25kg", False)),
+    ("首次 你钓到了 粉丝虾 史诗 1,024.5g", ("粉丝虾", "史诗", "1.02kg", True)),
+]
+
+
+FISH_INFO_CORPUS_FILE = "./fish_info_corpus.json"  # 从真实弹窗冻结的OCR文本及期望结果
+
+
+def load_fish_info_corpus():
+    """内置语料加上冻结的真实OCR文本
+
+    Returns:
+        list: (OCR合并文本, 期望的 (鱼名, 品质, 重量, 是否首次捕获)) 列表
+    """
+    corpus = list(FISH_INFO_PARSER_CORPUS)
+    try:
+        with open(FISH_INFO_CORPUS_FILE, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+    except FileNotFoundError:
+        return corpus
+    except Exception as e:
+        print(f"⚠️  [警告] 读取解析语料失败: {e}")
+        return corpus
+    for entry in entries:
+        corpus.append((entry["text"], tuple(entry["expected"])))
+    return corpus
+
+
+def freeze_fish_info_corpus():
+    """把调试历史中真实弹窗的OCR文本连同当前解析结果追加到语料文件
+
+    已冻结的文本不会重复写入，也不会覆盖手工改过的期望结果；
+    新追加的期望结果来自当前解析器，请打开文件核对后再作为校验依据。
+
+    Returns:
+        int: 新追加的条数
+    """
+    with debug_history_lock:
+        history = list(debug_info_history)
+    try:
+        with open(FISH_INFO_CORPUS_FILE, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+    except FileNotFoundError:
+        entries = []
+    seen = {entry["text"] for entry in entries}
+    seen.update(full_text for full_text, _ in FISH_INFO_PARSER_CORPUS)
+    added = 0
+    for info in history:
+        full_text = info.get("full_text") if isinstance(info, dict) else None
+        if not full_text or full_text in seen:
+            continue
+        seen.add(full_text)
+        entries.append({"text": full_text, "expected": list(parse_fish_info_text(full_text))})
+        added += 1
+    if added:
+        with open(FISH_INFO_CORPUS_FILE, "w", encoding="utf-8") as f:
+            json.dump(entries, f, ensure_ascii=False, indent=1)
+        print(f"💾 [保存] 已冻结 {added} 条OCR文本到 {FISH_INFO_CORPUS_FILE}，请核对其中的期望结果")
+    else:
+        print("📄 [信息] 调试历史中没有新的OCR文本（需开启调试模式后钓鱼）")
+    return added
+
+
+def check_fish_info_parser(corpus=None):
+    """用语料逐条核对解析结果，不依赖界面和OCR，可以在命令行中运行
+
+    Returns:
+        list: 与期望不一致的条目，每条为 {"text", "expected", "parsed"}
+    """
+    if corpus is None:
+        corpus = load_fish_info_corpus()
+    failures = []
+    for full_text, expected in corpus:
+        try:
+            parsed = tuple(parse_fish_info_text(full_text))
+        except Exception as e:
+            parsed = f"{type(e).__name__}: {e}"
+        if parsed != expected:
+            failures.append({"text": full_text, "expected": expected, "parsed": parsed})
+    if failures:
+        print(f"❌ [校验] 鱼信息解析 {len(failures)}/{len(corpus)} 条与期望不一致")
+        for failure in failures:
+            print(f"   ↳ {failure['text']}: 期望 {failure['expected']} → 实际 {failure['parsed']}")
+    else:
+        print(f"✅ [校验] 鱼信息解析 {len(corpus)} 条全部符合期望")
+    return failures
+
+
+def benchmark_fish_info_parser(iterations=200):
+    """校验解析结果并测量每条文本的平均解析耗时（命令行 --check-parser 调用）
+
+    Returns:
+        dict: 语料条数、校验失败的条目、每条的平均耗时（微秒）
+    """
+    corpus = load_fish_info_corpus()
+    failures = check_fish_info_parser(corpus)
+    texts = [full_text for full_text, _ in corpus]
+
+    start_time = time.perf_counter()
+    for _ in range(iterations):
+        for full_text in texts:
+            parse_fish_info_text(full_text)
+    parsed_us = (time.perf_counter() - start_time) / (iterations * len(texts)) * 1e6
+
+    print(f"⏱️  [基准] 鱼信息解析 {len(texts)} 条文本: 平均 {parsed_us:.1f}µs")
+    return {"corpus_size": len(texts), "failures": failures, "parsed_us": parsed_us}
+
+
+def join_ocr_text(result):
+    """合并OCR结果中的所有文本"""
+    full_text = ""
+    for line in result:
+        if isinstance(line, list) and len(line) >= 2:
+            full_text += line[1] + " "
+    return full_text.strip()
+
+
+# 快速识别：弹窗布局固定，直接裁出文字行只做识别（跳过文字检测和方向分类）
+# 文字行的位置不靠估算，而是从真实弹窗的完整OCR结果中学习（相对鱼信息区域的比例，各分辨率通用）
+FISH_INFO_STRIP_MIN_SAMPLES = 5  # 至少学到这么多个弹窗的文字行位置后才启用快速识别
+FISH_INFO_STRIP_PADDING = 0.04  # 文字行上下各留出的余量（占鱼信息区域高度的比例）
+FISH_INFO_FAST_MIN_SCORE = 0.85  # 任一行置信度低于此值时改用完整OCR
+fish_info_fast_ocr_enabled = True  # 当前OCR版本不支持只识别模式时自动关闭
+
+_FISH_INFO_WEIGHT_TEXT_RE = re.compile(r"\d+\.?\d*\s*(kg|g|千克|克|公斤)", re.IGNORECASE)
+_FISH_INFO_TITLE_TEXT_RE = re.compile(
+    rf"你?[钓釣約]到了|首次|捕[获獲]|{_QUALITY_ALTERNATION}", re.IGNORECASE
+)
+
+
+class FishInfoStripCalibrator:
+    """从完整OCR（检测+识别）的结果中学习弹窗里各文字行的位置
+
+    每次完整识别解析出鱼名、品质和重量后，记录标题行（前缀/鱼名/品质）和重量行的
+    上下边界；样本足够后取中位数并留出余量，作为快速识别的裁剪区域。
+    """
+
+    ROLES = ("title", "weight")
+
+    def __init__(self, max_samples=50):
+        self._lock = threading.Lock()
+        self._samples = collections.deque(maxlen=max_samples)  # 每个弹窗的 {行: (上, 下)}
+        self._strips = None
+
+    @staticmethod
+    def _line_bounds(result, height, fish_name):
+        """按文字内容把检测到的文本框归到标题行或重量行，返回各行的上下边界比例"""
+        bounds = {}
+        for box, text, _ in result:
+            compact = text.replace(" ", "")
+            if _FISH_INFO_WEIGHT_TEXT_RE.search(compact):
+                role = "weight"
+            elif fish_name.replace(" ", "") in compact or _FISH_INFO_TITLE_TEXT_RE.search(compact):
+                role = "title"
+            else:
+                continue
+            ys = [point[1] for point in box]
+            top, bottom = min(ys) / height, max(ys) / height
+            if role in bounds:
+                top, bottom = min(top, bounds[role][0]), max(bottom, bounds[role][1])
+            bounds[role] = (top, bottom)
+        return bounds
+
+    def observe(self, result, shape, parsed):
+        """记录一次完整识别的结果，布局不符合预期时忽略"""
+        fish_name, fish_quality, fish_weight, _ = parsed
+        if not (fish_name and fish_quality and fish_weight) or not shape[0]:
+            return
+        bounds = self._line_bounds(result, shape[0], fish_name)
+        if len(bounds) != len(self.ROLES) or bounds["title"][1] > bounds["weight"][0]:
+            # 标题和重量在同一行或上下颠倒，无法分行裁剪
+            return
+        with self._lock:
+            self._samples.append(bounds)
+            if len(self._samples) >= FISH_INFO_STRIP_MIN_SAMPLES:
+                self._strips = self._fit()
+
+    def _fit(self):
+        strips = []
+        for role in self.ROLES:
+            tops = sorted(sample[role][0] for sample in self._samples)
+            bottoms = sorted(sample[role][1] for sample in self._samples)
+            top = max(0.0, tops[len(tops) // 2] - FISH_INFO_STRIP_PADDING)
+            bottom = min(1.0, bottoms[len(bottoms) // 2] + FISH_INFO_STRIP_PADDING)
+            strips.append((role, (0.0, top, 1.0, bottom)))
+        return tuple(strips)
+
+    def strips(self):
+        """学到的裁剪区域 ((行, (x1, y1, x2, y2)), ...)，样本不足时为None"""
+        with self._lock:
+            return self._strips
+
+    def stats(self):
+        with self._lock:
+            return {"samples": len(self._samples), "calibrated": self._strips is not None}
+
+
+fish_info_strip_calibrator = FishInfoStripCalibrator()
+
+
+def crop_fish_info_strips(img, strips):
+    """按比例裁出鱼信息弹窗中的各个文字行"""
+    height, width = img.shape[:2]
+    cropped = []
+    for name, (fx1, fy1, fx2, fy2) in strips:
+        x1, y1 = int(width * fx1), int(height * fy1)
+        x2, y2 = int(width * fx2), int(height * fy2)
+        cropped.append((name, (x1, y1, x2, y2), img[y1:y2, x1:x2]))
+    return cropped
+
+
+def run_fish_info_ocr_fast(engine, img, strips):
+    """只识别固定文字行的快速OCR
+
+    Returns:
+        dict: 与完整OCR相同格式的结果；置信度不足、关键字段缺失或鱼名不是词典中的
+              已知鱼名（可能被裁剪截断）时返回None
+    """
+    global fish_info_fast_ocr_enabled
+    result = []
+    elapse = []
+    for name, (x1, y1, x2, y2), strip in crop_fish_info_strips(img, strips):
+        try:
+            rec_result, rec_elapse = engine(
+                np.ascontiguousarray(strip), use_det=False, use_cls=False, use_rec=True
+            )
+        except TypeError:
+            # 旧版rapidocr不支持关闭检测，之后都直接走完整OCR
+            fish_info_fast_ocr_enabled = False
+            return None
+        if not rec_result:
+            return None
+        text, score = rec_result[0][0], float(rec_result[0][1])
+        if score < FISH_INFO_FAST_MIN_SCORE:
+            return None
+        elapse.append(rec_elapse)
+        # 转成与完整OCR一致的 [文本框, 文本, 置信度] 格式，方便调试日志和合并文本
+        box = [[x1, y1], [x2, y1], [x2, y2], [x1, y2]]
+        result.append([box, text, score])
+
+    full_text = join_ocr_text(result)
+    parsed = parse_fish_info_text(full_text)
+    fish_name, fish_quality, fish_weight, _ = parsed
+    if not (fish_name and fish_quality and fish_weight):
+        return None
+    if not fish_name_dictionary.contains(fish_name):
+        return None
+    return {"result": result, "elapse": elapse, "full_text": full_text, "parsed": parsed}
+
+
+def run_fish_info_ocr(engine, img):
+    """对鱼信息图像执行OCR并解析（在主进程中决定识别方式，engine 可以是OCR工作进程）
+
+    文字行位置学好后先尝试只识别固定文字行的快速OCR，结果不可信时再做完整的检测+识别；
+    完整识别的结果用于学习文字行位置。
+
+    Returns:
+        dict: result/elapse/full_text 为原始识别结果，parsed 为解析后的四元组，
+              path 为最终采用的识别方式，timings 为各方式耗时（秒）
+    """
+    timings = {"fast": None, "full": None}
+    strips = fish_info_strip_calibrator.strips()
+    if fish_info_fast_ocr_enabled and strips is not None:
+        start_time = time.perf_counter()
+        output = run_fish_info_ocr_fast(engine, img, strips)
+        timings["fast"] = time.perf_counter() - start_time
+        if output is not None:
+            output["path"] = "fast"
+            output["timings"] = timings
+            return output
+
+    start_time = time.perf_counter()
+    result, elapse = engine(img)
+    timings["full"] = time.perf_counter() - start_time
+    # 确保result是列表类型
+    if result is None:
+        result = []
+    full_text = join_ocr_text(result)
+    if len(result) > 0 and full_text:
+        parsed = parse_fish_info_text(full_text)
+        fish_info_strip_calibrator.observe(result, img.shape, parsed)
+    else:
+        parsed = (None, None, None, False)
+    return {
+        "result": result,
+        "elapse": elapse,
+        "full_text": full_text,
+        "parsed": parsed,
+        "path": "full",
+        "timings": timings,
+    }
+
+
+class OcrLatencyStats:
+    """按识别方式统计鱼信息OCR耗时"""
+
+    PATH_NAMES = {"fast": "快速识别", "full": "完整OCR"}
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._paths = {
+                path: {"count": 0, "total": 0.0, "last": None, "max": 0.0}
+                for path in self.PATH_NAMES
+            }
+            self.fast_hits = 0
+            self.fallbacks = 0
+
+    def record(self, ocr_output):
+        """记录一次识别的各方式耗时"""
+        timings = ocr_output.get("timings") or {}
+        with self._lock:
+            for path, seconds in timings.items():
+                if seconds is None or path not in self._paths:
+                    continue
+                entry = self._paths[path]
+                entry["count"] += 1
+                entry["total"] += seconds
+                entry["last"] = seconds
+                entry["max"] = max(entry["max"], seconds)
+            if ocr_output.get("path") == "fast":
+                self.fast_hits += 1
+            elif timings.get("fast") is not None:
+                self.fallbacks += 1
+
+    def stats(self):
+        with self._lock:
+            paths = {}
+            for path, entry in self._paths.items():
+                paths[path] = {
+                    "count": entry["count"],
+                    "average": entry["total"] / entry["count"] if entry["count"] else None,
+                    "last": entry["last"],
+                    "max": entry["max"],
+                }
+            return {"paths": paths, "fast_hits": self.fast_hits, "fallbacks": self.fallbacks}
+
+
+fish_info_ocr_stats = OcrLatencyStats()
+
+
+# =========================
+# OCR工作进程
+# =========================
+OCR_WORKER_TIMEOUT = 15  # 单次识别最长等待时间（秒），包含首次加载模型
+OCR_WORKER_MAX_RESTARTS = 3  # 超过后不再重启，改为进程内识别
+
+
+def _spawn_without_main(start):
+    """启动spawn子进程时不让子进程重新执行主模块
+
+    工作进程的入口在 ocr_worker 模块中，不需要主模块里的任何东西；把主模块临时标记为
+    "__main__" 包，multiprocessing 就不会在子进程里以 __mp_main__ 重新运行 PartyFish.py。
+    """
+    main_module = sys.modules.get("__main__")
+    saved_spec = getattr(main_module, "__spec__", None)
+    try:
+        if main_module is not None:
+            main_module.__spec__ = importlib.machinery.ModuleSpec("__main__", None)
+        start()
+    finally:
+        if main_module is not None:
+            main_module.__spec__ = saved_spec
+
+
+class OcrWorkerProcess:
+    """常驻的OCR工作进程
+
+    可以像RapidOCR引擎一样调用：图像通过共享内存传给子进程，推理不再与钓鱼线程和界面争抢GIL。
+    锁只保护进程启停和请求登记，等待结果时不持有，单个慢请求不会挡住其他调用方；
+    响应由读取线程按 job_id 分发。子进程崩溃或超时会自动重启，多次失败后停用。
+    """
+
+    def __init__(self):
+        self._process = None
+        self._requests = None
+        self._lock = threading.Lock()
+        self._pending = {}  # job_id -> [完成事件, 响应]
+        self._next_job_id = OCR_WORKER_LOAD_JOB_ID
+        self._loaded = threading.Event()  # 当前子进程已报告模型加载结果
+        self.load_error = None
+        self.restart_count = 0
+        self.failure_count = 0
+        self.request_count = 0
+        self.disabled = False
+
+    def is_alive(self):
+        return self._process is not None and self._process.is_alive()
+
+    def is_ready(self):
+        """子进程是否已成功加载模型"""
+        return self.is_alive() and self._loaded.is_set() and self.load_error is None
+
+    def _start_process(self):
+        context = multiprocessing.get_context("spawn")
+        requests = context.Queue()
+        responses = context.Queue()
+        process = context.Process(
+            target=ocr_worker_main,
+            args=(requests, responses),
+            name="OCRWorker",
+            daemon=True,
+        )
+        self._loaded.clear()
+        self.load_error = None
+        _spawn_without_main(process.start)
+        self._process = process
+        self._requests = requests
+        threading.Thread(
+            target=self._read_responses,
+            args=(process, responses),
+            name="OCRWorkerReader",
+            daemon=True,
+        ).start()
+
+    def _read_responses(self, process, responses):
+        """读取线程：把响应交给对应的请求，子进程退出后让所有等待中的请求失败"""
+        while True:
+            try:
+                job_id, payload = responses.get(timeout=0.5)
+            except queue.Empty:
+                if process.is_alive():
+                    continue
+                break
+            except (EOFError, OSError):
+                break
+            if job_id == OCR_WORKER_LOAD_JOB_ID:
+                self.load_error = payload.get("error")
+                self._loaded.set()
+                continue
+            with self._lock:
+                waiter = self._pending.pop(job_id, None)
+            if waiter is not None:
+                waiter[1] = payload
+                waiter[0].set()
+        with self._lock:
+            if self._process is process:
+                if not self._loaded.is_set():
+                    self.load_error = "OCR工作进程已退出"
+                    self._loaded.set()
+                self._fail_pending("OCR工作进程已退出")
+
+    def _fail_pending(self, message):
+        """让所有等待中的请求失败（调用方需持有锁）"""
+        for waiter in self._pending.values():
+            waiter[1] = {"error": message}
+            waiter[0].set()
+        self._pending.clear()
+
+    def _detach_process(self):
+        """摘下当前子进程并通知它退出，等待中的请求随之失败（调用方需持有锁）
+
+        Returns:
+            摘下的子进程，调用方释放锁后交给 _reap_process() 结束；没有子进程时为None
+        """
+        if self._process is None:
+            return None
+        process, self._process = self._process, None
+        requests, self._requests = self._requests, None
+        self._fail_pending("OCR工作进程已停止")
+        try:
+            requests.put(None)
+        except Exception:
+            pass
+        if not self._loaded.is_set():
+            self.load_error = "OCR工作进程已停止"
+            self._loaded.set()
+        return process
+
+    @staticmethod
+    def _reap_process(process):
+        """等待摘下的子进程退出，必要时强制结束（最多约2秒，不能持有锁）"""
+        if process is None:
+            return
+        try:
+            process.join(1)
+            if process.is_alive():
+                process.terminate()
+                process.join(1)
+        except Exception:
+            pass
+
+    def _restart(self):
+        """换上新的子进程，超过次数后停用（调用方需持有锁）
+
+        Returns:
+            被换下的旧子进程，调用方释放锁后交给 _reap_process()
+        """
+        old_process = self._detach_process()
+        self.restart_count += 1
+        if self.restart_count > OCR_WORKER_MAX_RESTARTS:
+            self.disabled = True
+            print("⚠️  [OCR] 工作进程多次异常，已停用")
+            return old_process
+        self._start_process()
+        return old_process
+
+    def start(self):
+        """启动工作进程，模型在子进程中加载"""
+        with self._lock:
+            if not self.disabled and not self.is_alive():
+                try:
+                    self._start_process()
+                    print("✅ [OCR] OCR工作进程已启动")
+                except Exception as e:
+                    self.disabled = True
+                    self.load_error = f"{type(e).__name__}: {e}"
+                    self._loaded.set()
+                    print(f"⚠️  [OCR] 启动OCR工作进程失败: {e}")
+
+    def wait_ready(self, timeout=None):
+        """等待子进程报告模型加载结果
+
+        Returns:
+            bool: 模型是否加载成功
+        """
+        self._loaded.wait(timeout)
+        return self.is_ready()
+
+    def stop(self):
+        with self._lock:
+            old_process = self._detach_process()
+        self._reap_process(old_process)
+
+    def disable(self):
+        """停止并停用工作进程，之后由主进程内的引擎识别"""
+        with self._lock:
+            old_process = self._detach_process()
+            self.disabled = True
+        self._reap_process(old_process)
+
+    def __call__(self, img, **kwargs):
+        """在工作进程中执行一次 RapidOCR 调用，参数和返回值与 RapidOCR 相同
+
+        Raises:
+            RuntimeError/TimeoutError: 工作进程不可用、超时或识别出错
+        """
+        img = np.ascontiguousarray(img)
+        waiter = [threading.Event(), None]
+        old_process = None
+        with self._lock:
+            if not self.disabled and not self.is_alive():
+                old_process = self._restart()
+            disabled = self.disabled
+        # 换下的子进程在锁外结束，不挡住其他调用方和界面的状态刷新
+        self._reap_process(old_process)
+        if disabled:
+            raise RuntimeError("OCR工作进程已停用")
+
+        with self._lock:
+            if self.disabled or not self.is_alive():
+                raise RuntimeError("OCR工作进程不可用")
+            process = self._process
+            self._next_job_id += 1
+            job_id = self._next_job_id
+            self.request_count += 1
+            shm = shared_memory.SharedMemory(create=True, size=max(img.nbytes, 1))
+            np.ndarray(img.shape, dtype=img.dtype, buffer=shm.buf)[:] = img
+            self._pending[job_id] = waiter
+            self._requests.put((job_id, shm.name, img.shape, img.dtype.str, kwargs))
+
+        try:
+            # 等待时不持有锁，每个请求单独计时
+            if not waiter[0].wait(OCR_WORKER_TIMEOUT):
+                old_process = None
+                with self._lock:
+                    self._pending.pop(job_id, None)
+                    self.failure_count += 1
+                    # 卡住的子进程需要重启，其他请求随之失败
+                    if self._process is process:
+                        old_process = self._restart()
+                self._reap_process(old_process)
+                raise TimeoutError("OCR工作进程响应超时")
+        finally:
+            shm.close()
+            shm.unlink()
+
+        payload = waiter[1]
+        if "error" in payload:
+            if payload.get("error_type") == "TypeError":
+                # 保持与进程内调用一致，例如旧版rapidocr不支持关闭检测
+                raise TypeError(payload["error"])
+            raise RuntimeError(payload["error"])
+        return payload["result"], payload["elapse"]
+
+    def stats(self):
+        return {
+            "alive": self.is_alive(),
+            "ready": self.is_ready(),
+            "disabled": self.disabled,
+            "request_count": self.request_count,
+            "failure_count": self.failure_count,
+            "restart_count": self.restart_count,
+        }
+
+
+ocr_worker = OcrWorkerProcess()
+
+
 def recognize_fish_info_ocr(img):
     """使用OCR识别鱼的信息"""
-    if not OCR_AVAILABLE or ocr_engine is None:
+    engine = get_ocr_engine()
+    if engine is None:
         # 调试信息：记录错误
         if debug_mode:
             debug_info = {
@@ -5686,10 +7962,10 @@ def recognize_fish_info_ocr(img):
                     :-3
                 ],
                 "action": "ocr_error",
-                "error": "OCR引擎不可用",
+                "error": f"OCR引擎不可用（{OCR_STATE_NAMES[ocr_engine_state]}）",
             }
             add_debug_info(debug_info)
-        return None, None, None
+        return None, None, None, False
 
     if img is None:
         # 调试信息：记录错误
@@ -5702,197 +7978,23 @@ def recognize_fish_info_ocr(img):
                 "error": "输入图像为空",
             }
             add_debug_info(debug_info)
-        return None, None, None
+        return None, None, None, False
 
     try:
-        # 执行OCR识别
-        result, elapse = ocr_engine(img)
-
-        # 确保result是列表类型
-        if result is None:
-            result = []
-
-        # 合并所有识别到的文本
-        full_text = ""
-        for line in result:
-            if isinstance(line, list) and len(line) >= 2:
-                full_text += line[1] + " "
-
-        full_text = full_text.strip()
-
-        # 解析鱼的信息
-        fish_name = None
-        fish_quality = None
-        fish_weight = None
-        is_first_capture = False
-
-        if len(result) > 0 and full_text:
-            # 识别品质
-            for quality in QUALITY_LEVELS:
-                if quality in full_text:
-                    fish_quality = quality
-                    break
-
-            # 识别重量（匹配数字+kg或g的模式，支持简繁体）
-            weight_pattern = r"(\d+\.?\d*)\s*(kg|g|千克|克|公斤|KG|G)?"
-            weight_matches = re.findall(weight_pattern, full_text, re.IGNORECASE)
-            if weight_matches:
-                # 取最后一个匹配的数字作为重量
-                for match in weight_matches:
-                    if match[0]:
-                        fish_weight = match[0]
-                        unit = match[1].lower() if match[1] else "kg"
-                        if unit in ["g", "克", "g"]:
-                            fish_weight = str(float(fish_weight) / 1000)
-                        fish_weight = f"{float(fish_weight):.2f}kg"
-
-            # 识别鱼名 - 优先匹配"你钓到了XXX"或"首次捕获XXX"格式（支持简繁体）
-            # 优化正则表达式，处理OCR可能将"钓"识别为"约"的情况
-            fish_name_patterns = [
-                r"(?:你?[钓釣約]到了|首次?捕[获獲])\s*[「【\[]?\s*(.+?)\s*[」】\]]?\s*(?:[标標][准準]|非凡|稀有|史[诗詩]|传奇|傳奇|[傳傅]奇)?$"
-            ]
-
-            for pattern in fish_name_patterns:
-                match = re.search(pattern, full_text)
-                if match:
-                    # 检查是否是首次捕获
-                    if "首次" in match.group(0) or "首次" in full_text:
-                        is_first_capture = True
-                    
-                    extracted_name = match.group(1).strip()
-                    # 清理鱼名中的数字、单位和特殊字符
-                    extracted_name = re.sub(
-                        r"\d+\.?\d*\s*(kg|g|千克|克|公斤|KG|G)?",
-                        "",
-                        extracted_name,
-                        flags=re.IGNORECASE,
-                    )
-                    # 清理鱼名中可能包含的品质词
-                    for quality in QUALITY_LEVELS:
-                        if quality in extracted_name:
-                            extracted_name = extracted_name.replace(quality, " ")
-                    # 清理鱼名中的多余字符，保留中文和英文
-                    extracted_name = re.sub(
-                        r"[^\u4e00-\u9fff\uf900-\ufaffa-zA-Z\s]",
-                        "",
-                        extracted_name,
-                    )
-                    # 移除多余空格，只保留必要的空格
-                    extracted_name = re.sub(r"\s+", " ", extracted_name).strip()
-                    # 移除单个字符（可能是OCR误识别）
-                    if extracted_name:
-                        words = extracted_name.split()
-                        filtered_words = [word for word in words if len(word) > 1 or word in ["a", "A"]]
-                        extracted_name = " ".join(filtered_words).strip()
-                    if extracted_name and len(extracted_name) >= 2:
-                        fish_name = extracted_name
-                        # 特别处理美髯公，确保能被正确识别
-                        cleaned_fish_name = fish_name.replace(" ", "")
-                if "美髯公" in cleaned_fish_name or (
-                    ("美" in cleaned_fish_name)
-                    and ("公" in cleaned_fish_name)
-                    and len(cleaned_fish_name) <= 3
-                ):
-                    fish_name = "美髯公"
-                break
-
-            # 如果上述模式都没匹配到，尝试备用方案
-            if not fish_name:
-                name_text = full_text
-                # 移除常见前缀（支持简繁体）
-                prefixes_to_remove = [r"你?[钓釣約](?:到了|到)|(?:首次)?捕[获獲]"]
-                for prefix in prefixes_to_remove:
-                    name_text = name_text.replace(prefix, " ")
-                # 移除所有品质词
-                for quality in QUALITY_LEVELS:
-                    name_text = name_text.replace(quality, " ")
-                # 移除数字和单位
-                name_text = re.sub(
-                    r"\d+\.?\d*\s*(kg|g|千克|克|公斤|KG|G)?",
-                    "",
-                    name_text,
-                    flags=re.IGNORECASE,
-                )
-                # 清理特殊字符，保留中文和英文（包括繁体）
-                name_text = re.sub(
-                    r"[^\u4e00-\u9fff\uf900-\ufaffa-zA-Z\s]",
-                    " ",
-                    name_text,
-                )
-                # 移除多余空格
-                name_text = re.sub(r"\s+", " ", name_text).strip()
-                # 移除单个字符（可能是OCR误识别）
-                if name_text:
-                    words = name_text.split()
-                    filtered_words = [word for word in words if len(word) > 1 or word in ["a", "A"]]
-                    name_text = " ".join(filtered_words).strip()
-
-                # 改进的鱼名提取逻辑
-                # 1. 尝试直接使用清理后的文本作为鱼名
-                if name_text and len(name_text) >= 2:
-                    fish_name = name_text
-                    # 特别处理美髯公，确保能被正确识别
-                    cleaned_fish_name = fish_name.replace(" ", "")
-                    if "美髯公" in cleaned_fish_name or (
-                        ("美" in cleaned_fish_name)
-                        and ("公" in cleaned_fish_name)
-                        and len(cleaned_fish_name) <= 3
-                    ):
-                        fish_name = "美髯公"
-
-                # 2. 如果直接使用不行，尝试提取连续的中文词
-                if not fish_name:
-                    # 取最长的连续中文词作为鱼名（支持繁体）
-                    chinese_words = re.findall(r"[\u4e00-\u9fff]{2,}", name_text)
-                    if chinese_words:
-                        # 选择最长的词作为鱼名
-                        fish_name = max(chinese_words, key=len)
-                        # 特别处理美髯公，确保能被正确识别
-                        cleaned_fish_name = fish_name.replace(" ", "")
-                        if "美髯公" in cleaned_fish_name or (
-                            ("美" in cleaned_fish_name)
-                            and ("公" in cleaned_fish_name)
-                            and len(cleaned_fish_name) <= 3
-                        ):
-                            fish_name = "美髯公"
-
-            # 如果还是没匹配到，尝试直接从完整文本中提取鱼名
-            if not fish_name:
-                # 移除品质词和重量
-                clean_text = full_text
-                for quality in QUALITY_LEVELS:
-                    clean_text = clean_text.replace(quality, " ")
-                # 移除数字和单位
-                weight_pattern = r"\d+\.?\d*\s*(kg|g|千克|克|公斤|KG|G)?"
-                clean_text = re.sub(weight_pattern, "", clean_text, flags=re.IGNORECASE)
-                # 移除前缀
-                for prefix in prefixes_to_remove:
-                    clean_text = clean_text.replace(prefix, " ")
-                # 清理特殊字符
-                clean_text = re.sub(
-                    r"[^\u4e00-\u9fff\uf900-\ufaffa-zA-Z\s]",
-                    " ",
-                    clean_text,
-                )
-                # 移除多余空格
-                clean_text = re.sub(r"\s+", " ", clean_text).strip()
-                # 移除单个字符（可能是OCR误识别）
-                if clean_text:
-                    words = clean_text.split()
-                    filtered_words = [word for word in words if len(word) > 1 or word in ["a", "A"]]
-                    clean_text = " ".join(filtered_words).strip()
-                # 直接使用清理后的文本作为鱼名（如果长度合适）
-                if clean_text and len(clean_text) >= 2:
-                    fish_name = clean_text
-                    # 特别处理美髯公，确保能被正确识别
-                    cleaned_fish_name = fish_name.replace(" ", "")
-                    # 特别处理各种鱼名，确保能被正确识别
-                    if "美髯公" in cleaned_fish_name or (
-                        ("美" in cleaned_fish_name)
-                        and ("公" in cleaned_fish_name)
-                        and len(cleaned_fish_name) <= 3
-                    ):
-                        fish_name = "美髯公"
+        # engine 为OCR工作进程或主进程内的RapidOCR
+        try:
+            ocr_output = run_fish_info_ocr(engine, img)
+        except Exception:
+            if engine is ocr_worker and ocr_worker.disabled:
+                fall_back_to_in_process_ocr()
+            raise
+        if "error" in ocr_output:
+            raise RuntimeError(ocr_output["error"])
+        fish_info_ocr_stats.record(ocr_output)
+        result = ocr_output["result"]
+        elapse = ocr_output["elapse"]
+        full_text = ocr_output["full_text"]
+        fish_name, fish_quality, fish_weight, is_first_capture = ocr_output["parsed"]
 
         # 调试信息：记录OCR识别结果和详细的鱼信息识别
         if debug_mode:
@@ -5906,6 +8008,8 @@ def recognize_fish_info_ocr(img):
                 "ocr_result": result,
                 "full_text": full_text,
                 "elapse": elapse,
+                "ocr_path": ocr_output.get("path"),
+                "timings": ocr_output.get("timings"),
                 "image_shape": img.shape if img is not None else "无图像",
                 "result_count": len(result),
                 "has_text": bool(full_text),
@@ -5946,14 +8050,33 @@ def recognize_fish_info_ocr(img):
                 "exception_type": type(e).__name__,
             }
             add_debug_info(debug_info)
-        return None, None, None
+        return None, None, None, False
 
 
-def record_caught_fish():
-    """识别并记录钓到的鱼"""
-    global current_session_fish, all_fish_records
-    global record_fish_enabled
+class FishRecordJob:
+    """一次上鱼的记录任务：钓鱼线程截取的图像 + 后台处理结果"""
 
+    def __init__(self, info_img, screen_img=None, screen_bytes=0):
+        self.info_img = info_img  # 鱼信息区域（RGB）
+        # 弹窗收起前的全屏截图：原始BGRA图像或已编码的PNG数据，未开启截屏时为None
+        self.screen_img = screen_img
+        self.screen_bytes = screen_bytes  # 原始截图占用的截图内存额度，处理完后归还
+        self.captured_at = time.time()
+        self.fish = None  # 识别并保存后的FishRecord
+        self.is_first_capture = False
+        self.parsed_event = threading.Event()  # OCR识别并保存完成（无论成功与否）
+        # 品质徽章颜色判定，不依赖OCR
+        self.color_quality, self.color_confidence = quality_classifier.classify(info_img)
+
+
+def capture_fish_record_job():
+    """在钓鱼线程中截取鱼信息弹窗并收起弹窗
+
+    只做必须在弹窗消失前完成的截图工作，OCR、保存和截图编码交给后台处理。
+
+    Returns:
+        FishRecordJob: 截图成功时返回任务，否则返回None
+    """
     # 调试信息：记录函数开始执行
     if debug_mode:
         debug_info = {
@@ -5961,11 +8084,14 @@ def record_caught_fish():
             "action": "fish_record_start",
             "message": "开始记录钓到的鱼",
             "ocr_available": OCR_AVAILABLE,
+            "ocr_state": ocr_engine_state,
             "record_fish_enabled": record_fish_enabled,
         }
         add_debug_info(debug_info)
 
-    if not OCR_AVAILABLE or not record_fish_enabled:
+    if not record_fish_enabled or get_ocr_engine() is None:
+        if record_fish_enabled and ocr_engine_state != OCR_STATE_FAILED:
+            print("⏳ [OCR] OCR引擎仍在加载，本条鱼不做记录")
         # 调试信息：记录钓鱼记录开关状态
         if debug_mode:
             debug_info = {
@@ -5974,8 +8100,13 @@ def record_caught_fish():
                 ],
                 "action": "fish_record_check",
                 "message": "钓鱼记录未执行",
-                "reason": "OCR不可用" if not OCR_AVAILABLE else "钓鱼记录开关已关闭",
+                "reason": (
+                    "钓鱼记录开关已关闭"
+                    if not record_fish_enabled
+                    else f"OCR{OCR_STATE_NAMES[ocr_engine_state]}"
+                ),
                 "ocr_available": OCR_AVAILABLE,
+                "ocr_state": ocr_engine_state,
                 "record_fish_enabled": record_fish_enabled,
             }
             add_debug_info(debug_info)
@@ -6017,6 +8148,97 @@ def record_caught_fish():
             "image_shape": img.shape if img is not None else "无图像",
         }
         add_debug_info(debug_info)
+
+    # 开启了自动截屏时，在弹窗收起前先截取全屏，是否保存由识别结果决定
+    screen_img = None
+    if legendary_screenshot_enabled or first_capture_screenshot_enabled:
+        try:
+            current_width, current_height = get_current_screen_resolution()
+            screen_img = np.array(
+                get_capture_session().grab((0, 0, current_width, current_height))
+            )
+        except Exception as e:
+            print(f"❌ [错误] 截图失败: {e}")
+
+    # 鼠标左键收起 - 截图完成后再收起
+    print("🐠 [操作] 执行鼠标左键收起")
+
+    try:
+        # 直接在屏幕中心执行收起操作
+        screen_width, screen_height = get_current_screen_resolution()
+        center_x = screen_width // 2
+        center_y = screen_height // 2
+
+        # 执行点击
+        mouse_controller.position = (center_x, center_y)
+        time.sleep(0.3)
+        mouse_controller.click(mouse.Button.left, 1)
+        time.sleep(0.5)  # 增加延迟，确保左键点击完成
+        print("🐠 [操作] 在屏幕中心执行收起操作")
+    except Exception as e:
+        print(f"🐠 [操作] 执行收起操作失败: {str(e)}")
+
+    # 原始全屏截图计入截图内存额度；积压的截图已占满额度时先编码为PNG再排队（约为原始大小的1/5），
+    # 编码耗时只在后台处理跟不上时出现，相当于对钓鱼线程的背压
+    screen_bytes = 0
+    if screen_img is not None:
+        if fish_record_pipeline.reserve_screen(screen_img.nbytes):
+            screen_bytes = screen_img.nbytes
+        else:
+            try:
+                screen_img = encode_fish_screenshot(screen_img)
+            except Exception as e:
+                print(f"❌ [错误] 截图编码失败: {e}")
+                screen_img = None
+
+    return FishRecordJob(img, screen_img, screen_bytes)
+
+
+def encode_fish_screenshot(screen_img):
+    """把BGRA全屏截图编码为PNG数据（一维uint8数组）"""
+    bgr = cv2.cvtColor(screen_img, cv2.COLOR_BGRA2BGR)
+    success, encoded = cv2.imencode(".png", bgr)
+    if not success:
+        raise IOError("PNG编码失败")
+    return encoded
+
+
+def save_fish_screenshot(screen_img, subdir, file_name):
+    """把全屏截图保存为PNG到 ./截图/<subdir>/
+
+    Args:
+        screen_img: 原始BGRA截图，或 encode_fish_screenshot() 编码好的PNG数据
+
+    Returns:
+        str: 截图保存路径
+    """
+    screenshot_dir = os.path.join(".", "截图", subdir)
+    os.makedirs(screenshot_dir, exist_ok=True)
+    screenshot_path = os.path.join(screenshot_dir, file_name)
+    encoded = screen_img if screen_img.ndim == 1 else encode_fish_screenshot(screen_img)
+    # 使用imencode+tofile，避免cv2.imwrite不支持中文路径
+    encoded.tofile(screenshot_path)
+    return screenshot_path
+
+
+def process_fish_record_job(job):
+    """后台处理记录任务：OCR识别、保存记录、保存截图并通知GUI
+
+    Returns:
+        FishRecord: 保存的记录，识别失败时返回None
+    """
+    try:
+        return _process_fish_record_job(job)
+    finally:
+        # 无论成功与否都要通知等待中的钓鱼线程
+        job.parsed_event.set()
+
+
+def _process_fish_record_job(job):
+    global current_session_fish, all_fish_records
+
+    img = job.info_img
+    if debug_mode:
         debug_info = {
             "timestamp": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3],
             "action": "fish_record_ocr_start",
@@ -6027,6 +8249,12 @@ def record_caught_fish():
     # OCR识别
     fish_name, fish_quality, fish_weight, is_first_capture = recognize_fish_info_ocr(img)
 
+    # OCR识别出品质时核对颜色判定；没识别出时改用可信的颜色判定
+    if fish_quality:
+        quality_classifier.record_check(job.color_quality, fish_quality)
+    elif fish_name and quality_classifier.is_trusted(job.color_quality, job.color_confidence):
+        fish_quality = job.color_quality
+
     # 调试信息：记录OCR识别结果
     if debug_mode:
         debug_info = {
@@ -6067,17 +8295,27 @@ def record_caught_fish():
 
     try:
         # 创建记录
-        with fish_record_lock:
-            # 合并"传奇"和"傳奇"品质，统一使用"传奇"（包含繁体）
-            if fish_quality in ["传奇", "傳奇"]:
-                fish_quality = "传奇"
-            fish = FishRecord(fish_name, fish_quality, fish_weight)
-            current_session_fish.append(fish)
-            all_fish_records.append(fish)
-            save_fish_record(fish)
+        # 合并"传奇"和"傳奇"品质，统一使用"传奇"（包含繁体）
+        if fish_quality in ["传奇", "傳奇"]:
+            fish_quality = "传奇"
+        # 鱼名吸附到词典中的标准名称，记录和放生判断使用同一个名字
+        raw_fish_name = fish_name
+        fish_name, name_confidence = fish_name_dictionary.snap(fish_name)
+        fish = FishRecord(fish_name, fish_quality, fish_weight, name_confidence)
+        # 写数据库在锁外进行，磁盘延迟不会阻塞记录查询和界面翻页；
+        # 记录表、品质计数、搜索索引和鱼名词典都与数据库保持一致，保存失败时都不更新
+        saved = save_fish_record(fish)
+        if saved:
+            with fish_record_lock:
+                current_session_fish.append(fish)
+                all_fish_records.append(fish)
+                trim_recent_fish_records()
+                quality_stats.add(fish.quality)
+                fish_name_index.add(fish.name)
+                fish_name_dictionary.observe(raw_fish_name)
 
         # 调试信息：记录保存成功
-        if debug_mode:
+        if debug_mode and saved:
             debug_info = {
                 "timestamp": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[
                     :-3
@@ -6086,6 +8324,8 @@ def record_caught_fish():
                 "message": "钓鱼记录保存成功",
                 "record": {
                     "name": fish.name,
+                    "raw_name": raw_fish_name,
+                    "name_confidence": fish.name_confidence,
                     "quality": fish.quality,
                     "weight": fish.weight,
                     "timestamp": fish.timestamp,
@@ -6100,56 +8340,48 @@ def record_caught_fish():
 
         # 终端输出
         quality_emoji = QUALITY_COLORS.get(fish.quality, "⚪")
-        print(
-            f"🐟 [钓到] {quality_emoji} {fish.name} | 品质: {fish.quality} | 重量: {fish.weight}"
+        log(
+            LOG_INFO,
+            "钓到",
+            "%s %s | 品质: %s | 重量: %s",
+            quality_emoji,
+            fish.name,
+            fish.quality,
+            fish.weight,
         )
 
+        # 识别结果已可用，钓鱼线程可以据此决定是否放生
+        job.fish = fish
+        job.is_first_capture = is_first_capture
+        job.parsed_event.set()
+
         # 传奇鱼自动截屏
         if legendary_screenshot_enabled and fish.quality in ["传奇", "傳奇"]:
-            try:
-                # 调试信息：记录开始传奇鱼截屏
-                if debug_mode:
-                    debug_info = {
-                        "timestamp": datetime.datetime.now().strftime(
-                            "%Y-%m-%d %H:%M:%S.%f"
-                        )[:-3],
-                        "action": "fish_record_screenshot_start",
-                        "message": "开始传奇鱼自动截屏",
-                    }
-                    add_debug_info(debug_info)
-
-                # 使用当前屏幕分辨率进行截图
-                current_width, current_height = get_current_screen_resolution()
-                
-                # 使用mss截取当前分辨率的屏幕
-                with mss.mss() as sct:
-                    # 创建一个与当前分辨率匹配的截图区域
-                    monitor = {
-                        "top": 0,
-                        "left": 0,
-                        "width": current_width,
-                        "height": current_height
-                    }
-                    
-                    # 执行截图
-                    screenshot = sct.grab(monitor)
-
-                    # 创建截图保存目录
-                    screenshot_dir = os.path.join(".", "截图", "传奇")
-                    os.makedirs(screenshot_dir, exist_ok=True)
+            if job.screen_img is None:
+                print("❌ [错误] 截图失败: 未截取到全屏图像")
+            else:
+                try:
+                    # 调试信息：记录开始传奇鱼截屏
+                    if debug_mode:
+                        debug_info = {
+                            "timestamp": datetime.datetime.now().strftime(
+                                "%Y-%m-%d %H:%M:%S.%f"
+                            )[:-3],
+                            "action": "fish_record_screenshot_start",
+                            "message": "开始传奇鱼自动截屏",
+                        }
+                        add_debug_info(debug_info)
 
                     # 生成截图文件名（包含时间戳和鱼名）
-                    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+                    timestamp = datetime.datetime.fromtimestamp(
+                        job.captured_at
+                    ).strftime("%Y%m%d_%H%M%S")
                     fish_name_clean = re.sub(r"[^\w\s]", "", fish.name)
-                    screenshot_path = os.path.join(
-                        screenshot_dir,
+                    screenshot_path = save_fish_screenshot(
+                        job.screen_img,
+                        "传奇",
                         f"{timestamp}_{fish_name_clean}_{fish.quality}.png",
                     )
-
-                    # 保存截图
-                    mss.tools.to_png(
-                        screenshot.rgb, screenshot.size, output=screenshot_path
-                    )
                     print(
                         f"📸 [截屏] 传奇鱼已自动保存到主显示器截图: {screenshot_path}"
                     )
@@ -6163,70 +8395,51 @@ def record_caught_fish():
                             "action": "fish_record_screenshot_success",
                             "message": "传奇鱼自动截屏成功",
                             "screenshot_path": screenshot_path,
-                            "monitor_info": monitor,
+                            "image_shape": job.screen_img.shape,
+                        }
+                        add_debug_info(debug_info)
+                except Exception as e:
+                    print(f"❌ [错误] 截图失败: {e}")
+                    # 调试信息：记录传奇鱼截屏失败
+                    if debug_mode:
+                        debug_info = {
+                            "timestamp": datetime.datetime.now().strftime(
+                                "%Y-%m-%d %H:%M:%S.%f"
+                            )[:-3],
+                            "action": "fish_record_screenshot_failed",
+                            "message": "传奇鱼自动截屏失败",
+                            "error": str(e),
+                            "exception_type": type(e).__name__,
                         }
                         add_debug_info(debug_info)
-            except Exception as e:
-                print(f"❌ [错误] 截图失败: {e}")
-                # 调试信息：记录传奇鱼截屏失败
-                if debug_mode:
-                    debug_info = {
-                        "timestamp": datetime.datetime.now().strftime(
-                            "%Y-%m-%d %H:%M:%S.%f"
-                        )[:-3],
-                        "action": "fish_record_screenshot_failed",
-                        "message": "传奇鱼自动截屏失败",
-                        "error": str(e),
-                        "exception_type": type(e).__name__,
-                    }
-                    add_debug_info(debug_info)
 
         # 首次捕获截图
         if first_capture_screenshot_enabled and is_first_capture:
-            try:
-                # 调试信息：记录开始首次捕获截屏
-                if debug_mode:
-                    debug_info = {
-                        "timestamp": datetime.datetime.now().strftime(
-                            "%Y-%m-%d %H:%M:%S.%f"
-                        )[:-3],
-                        "action": "first_capture_screenshot_start",
-                        "message": "开始首次捕获自动截屏",
-                    }
-                    add_debug_info(debug_info)
-
-                # 使用当前屏幕分辨率进行截图
-                current_width, current_height = get_current_screen_resolution()
-                
-                # 使用mss截取当前分辨率的屏幕
-                with mss.mss() as sct:
-                    # 创建一个与当前分辨率匹配的截图区域
-                    monitor = {
-                        "top": 0,
-                        "left": 0,
-                        "width": current_width,
-                        "height": current_height
-                    }
-                    
-                    # 执行截图
-                    screenshot = sct.grab(monitor)
-
-                    # 创建截图保存目录
-                    screenshot_dir = os.path.join(".", "截图", "首次")
-                    os.makedirs(screenshot_dir, exist_ok=True)
+            if job.screen_img is None:
+                print("❌ [错误] 首次捕获截图失败: 未截取到全屏图像")
+            else:
+                try:
+                    # 调试信息：记录开始首次捕获截屏
+                    if debug_mode:
+                        debug_info = {
+                            "timestamp": datetime.datetime.now().strftime(
+                                "%Y-%m-%d %H:%M:%S.%f"
+                            )[:-3],
+                            "action": "first_capture_screenshot_start",
+                            "message": "开始首次捕获自动截屏",
+                        }
+                        add_debug_info(debug_info)
 
                     # 生成截图文件名（包含时间戳、鱼名和品质）
-                    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+                    timestamp = datetime.datetime.fromtimestamp(
+                        job.captured_at
+                    ).strftime("%Y%m%d_%H%M%S")
                     fish_name_clean = re.sub(r"[^\w\s]", "", fish.name)
-                    screenshot_path = os.path.join(
-                        screenshot_dir,
+                    screenshot_path = save_fish_screenshot(
+                        job.screen_img,
+                        "首次",
                         f"{timestamp}_{fish_name_clean}_{fish.quality}_首次捕获.png",
                     )
-
-                    # 保存截图
-                    mss.tools.to_png(
-                        screenshot.rgb, screenshot.size, output=screenshot_path
-                    )
                     print(
                         f"📸 [截屏] 首次捕获已自动保存到主显示器截图: {screenshot_path}"
                     )
@@ -6240,59 +8453,28 @@ def record_caught_fish():
                             "action": "first_capture_screenshot_success",
                             "message": "首次捕获自动截屏成功",
                             "screenshot_path": screenshot_path,
-                            "monitor_info": monitor,
+                            "image_shape": job.screen_img.shape,
+                        }
+                        add_debug_info(debug_info)
+                except Exception as e:
+                    print(f"❌ [错误] 首次捕获截图失败: {e}")
+                    # 调试信息：记录首次捕获截屏失败
+                    if debug_mode:
+                        debug_info = {
+                            "timestamp": datetime.datetime.now().strftime(
+                                "%Y-%m-%d %H:%M:%S.%f"
+                            )[:-3],
+                            "action": "first_capture_screenshot_failed",
+                            "message": "首次捕获自动截屏失败",
+                            "error": str(e),
+                            "exception_type": type(e).__name__,
                         }
                         add_debug_info(debug_info)
-            except Exception as e:
-                print(f"❌ [错误] 首次捕获截图失败: {e}")
-                # 调试信息：记录首次捕获截屏失败
-                if debug_mode:
-                    debug_info = {
-                        "timestamp": datetime.datetime.now().strftime(
-                            "%Y-%m-%d %H:%M:%S.%f"
-                        )[:-3],
-                        "action": "first_capture_screenshot_failed",
-                        "message": "首次捕获自动截屏失败",
-                        "error": str(e),
-                        "exception_type": type(e).__name__,
-                    }
-                    add_debug_info(debug_info)
-        
-        # 鼠标左键收起 - 截图完成后再收起
-        print("🐠 [操作] 执行鼠标左键收起")
-        
-        try:
-            # 直接在屏幕中心执行收起操作
-            screen_width, screen_height = get_current_screen_resolution()
-            center_x = screen_width // 2
-            center_y = screen_height // 2
-            
-            # 执行点击
-            mouse_controller.position = (center_x, center_y)
-            time.sleep(0.3)
-            mouse_controller.click(mouse.Button.left, 1)
-            time.sleep(0.5)  # 增加延迟，确保左键点击完成
-            print("🐠 [操作] 在屏幕中心执行收起操作")
-        except Exception as e:
-            print(f"🐠 [操作] 执行收起操作失败: {str(e)}")
-            
 
-        # 放生判断和执行
-        if release_fish_enabled:  # 先检查全局开关是否开启
-            if should_release_fish(fish.quality, fish.name):  # 再检查鱼的稀有度
-                print(f"🐠 [放生] 开始放生 {fish.quality}品质的 {fish.name}")
-                # 执行放生操作
-                success = release_fish()
-                if success:
-                    print(f"🐠 [放生] {fish.quality}品质的 {fish.name} 放生成功")
-                else:
-                    print(f"🐠 [放生] {fish.quality}品质的 {fish.name} 放生失败")
-        else:
-            print(f"⏹️ [放生] 放生功能已禁用，跳过放生判断")
         # 通知GUI更新
         if gui_fish_update_callback:
             try:
-                gui_fish_update_callback()
+                gui_fish_update_callback(fish)
                 # 调试信息：记录GUI更新成功
                 if debug_mode:
                     debug_info = {
@@ -6337,6 +8519,147 @@ def record_caught_fish():
         return None
 
 
+FISH_RECORD_BACKPRESSURE_TIMEOUT = 30  # 积压已满时钓鱼线程最多等待的时间（秒）
+FISH_RECORD_SCREEN_BUDGET = 64 * 1024 * 1024  # 积压任务中原始全屏截图最多占用的内存（2560×1440约4张）
+
+
+class FishRecordPipeline:
+    """钓鱼记录后台流水线
+
+    钓鱼线程只负责截图和收起弹窗，OCR识别、保存记录和截图编码在后台线程中按顺序处理。
+    积压的记录任务有上限，满了以后钓鱼线程等待后台腾出位置（背压），不会在钓鱼线程里做OCR；
+    会话开始/结束等操作通过 call_in_order() 排在已提交的记录之后执行，调用方无需等待。
+    积压任务中的原始全屏截图另有内存额度（reserve_screen），任务处理完立即归还。
+    """
+
+    def __init__(self, max_backlog=8, screen_budget=FISH_RECORD_SCREEN_BUDGET):
+        self._queue = queue.Queue()
+        self._slots = threading.BoundedSemaphore(max_backlog)  # 记录任务的积压名额
+        self._screen_lock = threading.Lock()
+        self._screen_budget = screen_budget
+        self.screen_bytes = 0  # 积压任务中原始全屏截图占用的内存
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self.processed_count = 0
+        self.dropped_count = 0  # 背压等待超时而丢弃的记录任务数
+
+    def _ensure_worker(self):
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._worker, name="FishRecordWorker", daemon=True
+                )
+                self._thread.start()
+
+    def _worker(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if callable(job):
+                    job()
+                else:
+                    process_fish_record_job(job)
+                    self.processed_count += 1
+            except Exception as e:
+                log(LOG_WARNING, "警告", "记录鱼信息失败: %s", e)
+            finally:
+                if not callable(job):
+                    self._release_job(job)
+                self._queue.task_done()
+
+    def reserve_screen(self, nbytes):
+        """为一张原始全屏截图占用内存额度，额度不足时返回False（调用方应先压缩再排队）"""
+        with self._screen_lock:
+            # 没有积压的截图时总是允许，额度小于一张截图也能正常截屏
+            if self.screen_bytes and self.screen_bytes + nbytes > self._screen_budget:
+                return False
+            self.screen_bytes += nbytes
+            return True
+
+    def _release_screen(self, job):
+        """释放任务中的全屏截图并归还截图内存额度"""
+        job.screen_img = None
+        if job.screen_bytes:
+            with self._screen_lock:
+                self.screen_bytes -= job.screen_bytes
+            job.screen_bytes = 0
+
+    def _release_job(self, job):
+        """任务处理完：释放截图并归还积压名额"""
+        self._release_screen(job)
+        self._slots.release()
+
+    def submit(self, job):
+        """提交记录任务，积压已满时阻塞等待后台处理（背压）
+
+        Returns:
+            bool: 是否已提交；等待超时时丢弃本条并返回False
+        """
+        self._ensure_worker()
+        if not self._slots.acquire(timeout=FISH_RECORD_BACKPRESSURE_TIMEOUT):
+            self.dropped_count += 1
+            log(LOG_WARNING, "警告", "钓鱼记录积压过多，丢弃本条鱼的记录")
+            self._release_screen(job)
+            job.parsed_event.set()
+            return False
+        self._queue.put(job)
+        return True
+
+    def call_in_order(self, func):
+        """在后台线程中、已提交的记录任务全部处理完之后调用 func，立即返回"""
+        self._ensure_worker()
+        self._queue.put(func)
+
+    def backlog(self):
+        return self._queue.unfinished_tasks
+
+
+fish_record_pipeline = FishRecordPipeline()
+
+
+def record_caught_fish():
+    """截取并收起鱼信息弹窗，识别和保存交给后台流水线
+
+    Returns:
+        FishRecordJob: 已提交的记录任务，未记录时返回None
+    """
+    job = capture_fish_record_job()
+    if job is not None:
+        fish_record_pipeline.submit(job)
+    return job
+
+
+def fish_needs_release(fish):
+    """判断钓到的鱼是否需要放生（放生开关 + 品质/名称规则）"""
+    if fish is None:
+        return False
+    if not release_fish_enabled:  # 先检查全局开关是否开启
+        print(f"⏹️ [放生] 放生功能已禁用，跳过放生判断")
+        return False
+    return should_release_fish(fish.quality, fish.name)  # 再检查鱼的稀有度
+
+
+def release_caught_fish(quality, fish_name=None):
+    """放生钓到的鱼
+
+    Args:
+        quality: 鱼的品质
+        fish_name: 鱼名，仅凭徽章颜色放生时还没有识别结果，为None
+
+    Returns:
+        bool: 放生是否成功
+    """
+    fish_desc = f"{quality}品质的 {fish_name if fish_name else '鱼'}"
+    print(f"🐠 [放生] 开始放生 {fish_desc}")
+    # 执行放生操作
+    success = release_fish()
+    if success:
+        print(f"🐠 [放生] {fish_desc} 放生成功")
+    else:
+        print(f"🐠 [放生] {fish_desc} 放生失败")
+    return success
+
+
 def play_fish_bucket_warning_sound():
     """播放鱼桶满/没鱼饵警告!音效"""
     if not fish_bucket_sound_enabled:
@@ -6736,41 +9059,45 @@ def get_session_fish_list():
 
 
 def get_all_fish_list():
-    """获取所有钓鱼记录"""
+    """获取内存中的近期钓鱼记录（完整历史请用 page_fish_records 分页查询）"""
     with fish_record_lock:
         return list(all_fish_records)
 
 
-def search_fish_records(keyword="", quality_filter="全部", use_session=True):
-    """搜索钓鱼记录"""
+def search_fish_records(keyword="", quality_filter="全部", use_session=True, today_only=False, limit=None):
+    """搜索钓鱼记录
+
+    当前会话在内存中筛选；历史记录交给数据库按索引查询。
+
+    Args:
+        today_only: 只查询当天的历史记录（use_session为False时有效）
+        limit: 历史记录最多返回的条数（取最新的）
+
+    Returns:
+        list: 按时间从旧到新排列的记录
+    """
+    like_keyword, names = resolve_keyword_names(keyword)
+    if not use_session:
+        since, until = today_timestamp_range() if today_only else (None, None)
+        records = fish_record_store.search(
+            like_keyword, quality_filter_values(quality_filter), since, until, limit=limit, names=names
+        )
+        records.reverse()
+        return records
+
     with fish_record_lock:
-        records = current_session_fish if use_session else all_fish_records
+        return current_session_fish.search(
+            like_keyword, quality_filter_values(quality_filter), names=names
+        )
 
-        filtered = []
-        for record in records:
-            # 品质筛选 - 合并"传奇"和"传奇"，以及"标准"和"標準"
-            if quality_filter != "全部":
-                if quality_filter == "传奇":
-                    # 筛选传奇时也包含传奇
-                    if record.quality not in ["传奇", "傳奇"]:
-                        continue
-                elif quality_filter == "标准":
-                    # 筛选标准时也包含繁体標準
-                    if record.quality not in ["标准", "標準"]:
-                        continue
-                elif quality_filter == "史诗":
-                    if record.quality not in ["史詩", "史诗"]:
-                        continue
-                else:
-                    # 其他品质正常筛选
-                    if record.quality != quality_filter:
-                        continue
-            # 关键词搜索
-            if keyword and keyword.lower() not in record.name.lower():
-                continue
-            filtered.append(record)
 
-        return filtered
+def count_fish_records(keyword="", quality_filter="全部", today_only=False):
+    """统计符合条件的历史记录条数"""
+    since, until = today_timestamp_range() if today_only else (None, None)
+    like_keyword, names = resolve_keyword_names(keyword)
+    return fish_record_store.count(
+        like_keyword, quality_filter_values(quality_filter), since, until, names=names
+    )
 
 
 # 定义区域的坐标 (x, y, w, h) - 基于2K分辨率的基准值
@@ -7077,6 +9404,468 @@ result_val_is = None
 scr = None
 
 
+# =========================
+# 截图后端
+# =========================
+capture_backend = "mss"  # 默认使用mss截图
+# 实际钓鱼可选的截图后端；回放后端只用于 --replay 基准测试，不会驱动真实的鼠标操作
+capture_backends = {
+    "mss": "MSS截图",
+    "dxgi": "DXGI桌面复制",
+}
+
+REPLAY_IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+class CaptureBackend:
+    """截图后端基类
+
+    grab(region) 接收 (left, top, right, bottom)，返回 (h, w, 4) 的 BGRA 图像
+    （mss 的 ScreenShot 或 NumPy 数组），失败时返回 None。
+    """
+
+    name = "base"
+
+    def grab(self, region):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class MssCaptureBackend(CaptureBackend):
+    """基于mss（GDI BitBlt）的截图后端"""
+
+    name = "mss"
+
+    def __init__(self):
+        self._sct = mss.mss()
+
+    def grab(self, region):
+        return self._sct.grab(region)
+
+    def close(self):
+        self._sct.close()
+
+
+class DxgiCaptureBackend(CaptureBackend):
+    """基于 resources/dxgi4py.dll 的 DXGI 桌面复制截图后端
+
+    DLL 内部的桌面复制状态是进程全局的，所有线程共用同一份：
+    第一个实例加载并初始化，最后一个实例关闭时才销毁，截图调用串行执行。
+    """
+
+    name = "dxgi"
+
+    _shared_dll = None
+    _shared_refs = 0
+    _shared_lock = threading.Lock()
+
+    def __init__(self):
+        cls = DxgiCaptureBackend
+        with cls._shared_lock:
+            if cls._shared_dll is None:
+                cls._shared_dll = cls._load_dll()
+            cls._shared_refs += 1
+        self._dll = cls._shared_dll
+        self._closed = False
+
+    @staticmethod
+    def _load_dll():
+        dll_path = os.path.abspath(os.path.join(get_resources_path(), "dxgi4py.dll"))
+        if not os.path.exists(dll_path):
+            raise FileNotFoundError(f"未找到DXGI截图库: {dll_path}")
+        dll = ctypes.CDLL(dll_path)
+        dll.grab.argtypes = (
+            ctypes.POINTER(ctypes.c_ubyte),
+            ctypes.c_int,
+            ctypes.c_int,
+            ctypes.c_int,
+            ctypes.c_int,
+        )
+        dll.grab.restype = ctypes.POINTER(ctypes.c_ubyte)
+        # 以桌面窗口初始化，区域坐标即屏幕坐标
+        dll.init_dxgi(ctypes.windll.user32.GetDesktopWindow())
+        return dll
+
+    def grab(self, region):
+        left, top, right, bottom = region
+        width, height = right - left, bottom - top
+        if width <= 0 or height <= 0:
+            return None
+        frame = np.empty((height, width, 4), dtype=np.uint8)
+        with DxgiCaptureBackend._shared_lock:
+            buffer = self._dll.grab(
+                frame.ctypes.data_as(ctypes.POINTER(ctypes.c_ubyte)),
+                left,
+                top,
+                width,
+                height,
+            )
+        if not buffer:
+            return None
+        return frame
+
+    def close(self):
+        cls = DxgiCaptureBackend
+        with cls._shared_lock:
+            if self._closed:
+                return
+            self._closed = True
+            cls._shared_refs -= 1
+            if cls._shared_refs > 0:
+                return
+            dll, cls._shared_dll = cls._shared_dll, None
+            try:
+                dll.destroy()
+            except Exception:
+                pass
+
+
+class ReplayCaptureBackend(CaptureBackend):
+    """回放录制画面的截图后端，用于无游戏、无显示器环境下的基准测试和回归测试
+
+    path 可以是图片目录（按文件名排序逐帧回放）或视频文件。
+    fps > 0 时按时间自动切换帧，否则由调用方通过 advance() 切换。
+    """
+
+    name = "replay"
+
+    def __init__(self, path, fps=0, loop=True):
+        self.path = path
+        self.fps = fps
+        self.loop = loop
+        self.frame_index = 0
+        self._images = None
+        self._video = None
+        self._video_pos = 0  # 视频下一次读取的帧序号
+        self._frame = None
+        self._start_time = time.time()
+
+        if os.path.isdir(path):
+            self._images = sorted(
+                os.path.join(path, name)
+                for name in os.listdir(path)
+                if name.lower().endswith(REPLAY_IMAGE_EXTENSIONS)
+            )
+            if not self._images:
+                raise FileNotFoundError(f"回放目录中没有图片: {path}")
+            self.frame_count = len(self._images)
+        elif os.path.isfile(path):
+            self._video = cv2.VideoCapture(path)
+            if not self._video.isOpened():
+                raise IOError(f"无法打开回放视频: {path}")
+            self.frame_count = int(self._video.get(cv2.CAP_PROP_FRAME_COUNT))
+        else:
+            raise FileNotFoundError(f"回放路径不存在: {path}")
+        self._load_frame(0)
+
+    @staticmethod
+    def _to_bgra(img):
+        if img is None:
+            return None
+        if img.ndim == 2:
+            return cv2.cvtColor(img, cv2.COLOR_GRAY2BGRA)
+        if img.shape[2] == 3:
+            return cv2.cvtColor(img, cv2.COLOR_BGR2BGRA)
+        return img
+
+    def _load_frame(self, index):
+        """加载指定帧，返回是否成功"""
+        if self._images is not None:
+            if index >= len(self._images):
+                if not self.loop:
+                    return False
+                index %= len(self._images)
+            self._frame = self._to_bgra(
+                cv2.imread(self._images[index], cv2.IMREAD_UNCHANGED)
+            )
+        else:
+            # 视频只支持顺序读取，回退时从头开始
+            if index < self._video_pos - 1:
+                self._video.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                self._video_pos = 0
+            while self._video_pos <= index:
+                ok, img = self._video.read()
+                if not ok:
+                    if not self.loop or index == 0:
+                        return False
+                    return self._load_frame(0)
+                self._video_pos += 1
+                if self._video_pos > index:
+                    self._frame = self._to_bgra(img)
+        self.frame_index = index
+        return self._frame is not None
+
+    @property
+    def frame_shape(self):
+        return self._frame.shape if self._frame is not None else (0, 0, 4)
+
+    def advance(self):
+        """切换到下一帧，回放结束（且不循环）时返回False"""
+        return self._load_frame(self.frame_index + 1)
+
+    def grab(self, region):
+        if self.fps:
+            target = int((time.time() - self._start_time) * self.fps)
+            if self.loop and self.frame_count:
+                target %= self.frame_count
+            if target != self.frame_index:
+                self._load_frame(target)
+        if self._frame is None:
+            return None
+        left, top, right, bottom = region
+        h, w = self._frame.shape[:2]
+        if left < 0 or top < 0 or right > w or bottom > h:
+            return None
+        return self._frame[top:bottom, left:right]
+
+    def close(self):
+        if self._video is not None:
+            self._video.release()
+            self._video = None
+
+
+def create_capture_backend():
+    """根据当前配置创建截图后端，失败时回退到mss"""
+    if capture_backend == "dxgi":
+        try:
+            return DxgiCaptureBackend()
+        except Exception as e:
+            print(f"⚠️  [截图] DXGI截图后端初始化失败，回退到mss: {e}")
+    return MssCaptureBackend()
+
+
+# =========================
+# 截图会话管理
+# =========================
+class CaptureSession:
+    """长期复用的截图会话
+
+    每个线程持有一个会话，底层截图后端只在首次使用、截图失败、分辨率或后端配置变化时重建，
+    避免每次循环都重新创建和销毁设备上下文。
+    """
+
+    def __init__(self, name=None):
+        self.name = name or threading.current_thread().name
+        self._backend = None
+        self._backend_key = None
+        self.grab_count = 0  # 成功截图次数
+        self.rebuild_count = 0  # 创建/重建截图后端次数
+        self.failure_count = 0  # 截图失败次数
+
+    @property
+    def backend_name(self):
+        return self._backend.name if self._backend is not None else "未创建"
+
+    def _close_backend(self):
+        if self._backend is not None:
+            try:
+                self._backend.close()
+            except:
+                pass
+            self._backend = None
+
+    def _ensure_backend(self):
+        """确保截图后端可用，分辨率或后端配置变化时重建"""
+        backend_key = (TARGET_WIDTH, TARGET_HEIGHT, capture_backend)
+        if self._backend is not None and self._backend_key != backend_key:
+            print(f"🔄 [截图] 分辨率或截图后端变化，重建截图对象（{self.name}）")
+            self._close_backend()
+        if self._backend is None:
+            self._backend = create_capture_backend()
+            self._backend_key = backend_key
+            self.rebuild_count += 1
+        return self._backend
+
+    def grab(self, region):
+        """截取指定区域，失败（抛出异常或返回None）时重建截图后端并重试一次
+
+        Args:
+            region: (left, top, right, bottom)
+
+        Returns:
+            (h, w, 4) 的 BGRA 图像，重试后仍失败时为 None
+        """
+        try:
+            frame = self._ensure_backend().grab(region)
+            if frame is None:
+                raise RuntimeError("截图后端返回空图像")
+        except Exception as e:
+            self.failure_count += 1
+            print(f"⚠️  [截图] 截图失败，重建截图对象（{self.name}）: {e}")
+            self._close_backend()
+            frame = self._ensure_backend().grab(region)
+        self.grab_count += 1
+        return frame
+
+    def close(self):
+        self._close_backend()
+
+    def stats(self):
+        return {
+            "name": self.name,
+            "backend": self.backend_name,
+            "grab_count": self.grab_count,
+            "rebuild_count": self.rebuild_count,
+            "failure_count": self.failure_count,
+        }
+
+
+_capture_local = threading.local()
+capture_sessions = []  # 所有存活的截图会话，供调试窗口统计
+capture_sessions_lock = threading.Lock()
+
+
+def get_capture_session():
+    """获取当前线程的截图会话，不存在时创建"""
+    session = getattr(_capture_local, "session", None)
+    if session is None:
+        session = CaptureSession()
+        _capture_local.session = session
+        with capture_sessions_lock:
+            capture_sessions.append(session)
+    return session
+
+
+def close_capture_session():
+    """关闭并移除当前线程的截图会话（线程退出前调用）"""
+    session = getattr(_capture_local, "session", None)
+    if session is None:
+        return
+    session.close()
+    _capture_local.session = None
+    with capture_sessions_lock:
+        if session in capture_sessions:
+            capture_sessions.remove(session)
+
+
+def get_capture_session_stats():
+    """获取所有截图会话的统计信息"""
+    with capture_sessions_lock:
+        return [session.stats() for session in capture_sessions]
+
+
+# 快照区域合并：截图耗时随面积增长，只合并外接矩形不比各区域面积之和大太多的区域
+SNAPSHOT_MERGE_RATIO = 4  # 合并后的外接矩形面积最多为各区域面积之和的倍数
+SNAPSHOT_MERGE_MIN_AREA = 128 * 128  # 外接矩形不超过此面积时总是合并（小区域截图耗时以固定开销为主）
+
+
+def _bbox_area(bbox):
+    return (bbox[2] - bbox[0]) * (bbox[3] - bbox[1])
+
+
+def _union_bbox(a, b):
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+
+def cluster_snapshot_regions(regions):
+    """把检测区域分组，每组截取一次外接矩形
+
+    相邻的区域（如底部HUD上的F1/F2/上鱼右键）合并为一次截图；相距很远的区域
+    （如屏幕中央的加时图标、右下角的鱼饵数字）单独截图，避免截取中间大片无用画面。
+
+    Returns:
+        list: 每组的外接矩形 (left, top, right, bottom)
+    """
+    clusters = [(tuple(region), _bbox_area(region)) for region in regions]
+    while len(clusters) > 1:
+        best = None
+        for i in range(len(clusters)):
+            for j in range(i + 1, len(clusters)):
+                bbox = _union_bbox(clusters[i][0], clusters[j][0])
+                area = _bbox_area(bbox)
+                member_area = clusters[i][1] + clusters[j][1]
+                if area > max(SNAPSHOT_MERGE_RATIO * member_area, SNAPSHOT_MERGE_MIN_AREA):
+                    continue
+                if best is None or area < best[0]:
+                    best = (area, i, j, bbox, member_area)
+        if best is None:
+            break
+        _, i, j, bbox, member_area = best
+        clusters[i] = (bbox, member_area)
+        del clusters[j]
+    return [bbox for bbox, _ in clusters]
+
+
+class FrameSnapshot:
+    """单帧快照：一次截取多个检测区域
+
+    区域先按位置分组（cluster_snapshot_regions），每组截取一次外接矩形，组间只相隔
+    几次截图调用的时间。同一轮检测中的各个识别函数通过 grab() 取得快照上的零拷贝视图，
+    所有判断基于同一轮的画面；不在快照范围内的区域回退到实时截图。
+    """
+
+    def __init__(self, source, regions):
+        """
+        Args:
+            source: 实时截图对象（CaptureSession 或 mss 对象）
+            regions: (left, top, right, bottom) 区域列表
+        """
+        self.source = source
+        self.parts = []  # (外接矩形, 图像) 列表
+        for bbox in cluster_snapshot_regions(regions):
+            frame = source.grab(bbox)
+            if frame is None:
+                # 不能把None当作图像，后续切片会全部出错
+                raise RuntimeError(f"截图失败，无法创建单帧快照: {bbox}")
+            self.parts.append((bbox, np.asarray(frame)))
+
+    @staticmethod
+    def _bbox_contains(bbox, region):
+        return (
+            region[0] >= bbox[0]
+            and region[1] >= bbox[1]
+            and region[2] <= bbox[2]
+            and region[3] <= bbox[3]
+        )
+
+    def contains(self, region):
+        return any(self._bbox_contains(bbox, region) for bbox, _ in self.parts)
+
+    def grab(self, region):
+        """返回区域在快照中的视图 (h, w, 4)，超出范围时实时截图"""
+        for bbox, frame in self.parts:
+            if self._bbox_contains(bbox, region):
+                left, top = bbox[0], bbox[1]
+                return frame[
+                    region[1] - top : region[3] - top, region[0] - left : region[2] - left
+                ]
+        return self.source.grab(region)
+
+
+def region_to_bbox(x, y, w, h):
+    """(x, y, w, h) 转换为 (left, top, right, bottom)"""
+    return (x, y, x + w, y + h)
+
+
+def take_reel_snapshot(source):
+    """截取收线阶段需要检测的区域（星星/加时/F1/F2）的单帧快照"""
+    if jiashi_region_coords is None:
+        update_region_coords()
+    regions = [
+        region_to_bbox(*region3_coords),
+        region_to_bbox(*region4_coords),
+        region_to_bbox(*region5_coords),
+        region_to_bbox(*jiashi_region_coords),
+    ]
+    return FrameSnapshot(source, regions)
+
+
+def take_tick_snapshot(source):
+    """截取主循环每轮需要检测的所有区域（F1/F2/上鱼/加时/鱼饵）的单帧快照"""
+    if jiashi_region_coords is None:
+        update_region_coords()
+    regions = [
+        region_to_bbox(*region4_coords),
+        region_to_bbox(*region5_coords),
+        region_to_bbox(*region6_coords),
+        region_to_bbox(*jiashi_region_coords),
+        get_bait_region(),
+    ]
+    return FrameSnapshot(source, regions)
+
+
 # =========================
 # 模板加载
 # =========================
@@ -7259,10 +10048,25 @@ mouse_lock = threading.Lock()
 mouse_is_down = False
 
 
-def handle_jiashi_in_action(scr):
-    """
-    在动作执行过程中处理加时，返回是否检测到并处理了加时
-    """
+JIASHI_CLICK_COOLDOWN = 0.5  # 点击加时按钮后，提示消失前不重复点击
+jiashi_last_click_time = 0
+
+
+def handle_jiashi_in_action(scr):
+    """
+    加时检测阶段：检测到加时界面时按设置点击“是/否”，返回是否检测到并处理了加时
+
+    只在钓鱼线程中调用，作为每帧检测流程的一个阶段，是唯一点击加时按钮的地方。
+    """
+    global previous_result, jiashi_last_click_time
+
+    if not fangzhu_jiashi(scr):
+        return False
+
+    # 刚点过按钮、提示还未消失时不重复点击
+    if time.time() - jiashi_last_click_time < JIASHI_CLICK_COOLDOWN:
+        return True
+
     # 处理加时选择（使用锁保护读取jiashi_var）
     with param_lock:
         current_jiashi = jiashi_var
@@ -7271,55 +10075,130 @@ def handle_jiashi_in_action(scr):
     if btn_no_jiashi_coords is None or btn_yes_jiashi_coords is None:
         update_region_coords()
 
-    if current_jiashi == 0:
-        if fangzhu_jiashi(scr):
-            btn_x, btn_y = btn_no_jiashi_coords
-            user32.SetCursorPos(btn_x, btn_y)
-            time.sleep(0.05)
-            user32.mouse_event(0x02, 0, 0, 0, 0)
-            time.sleep(0.1)
-            user32.mouse_event(0x04, 0, 0, 0, 0)
-            time.sleep(0.05)
-            if bait_math_val(scr):
-                with param_lock:
-                    previous_result = result_val_is
-            return True
-    elif current_jiashi == 1:
-        if fangzhu_jiashi(scr):
-            btn_x, btn_y = btn_yes_jiashi_coords
-            user32.SetCursorPos(btn_x, btn_y)
-            time.sleep(0.05)
-            user32.mouse_event(0x02, 0, 0, 0, 0)
-            time.sleep(0.1)
-            user32.mouse_event(0x04, 0, 0, 0, 0)
-            time.sleep(0.05)
-            if bait_math_val(scr):
-                with param_lock:
-                    previous_result = result_val_is
-            return True
-    return False
+    btn_x, btn_y = btn_yes_jiashi_coords if current_jiashi == 1 else btn_no_jiashi_coords
+    user32.SetCursorPos(btn_x, btn_y)
+    time.sleep(0.05)
+    user32.mouse_event(0x02, 0, 0, 0, 0)
+    time.sleep(0.1)
+    user32.mouse_event(0x04, 0, 0, 0, 0)
+    jiashi_last_click_time = time.time()
+    time.sleep(0.05)
+    # 点击后画面已变化，快照需回退到实时截图
+    if bait_math_val(getattr(scr, "source", scr)):
+        with param_lock:
+            previous_result = result_val_is
+    return True
 
 
-def pressandreleasemousebutton():
-    # 先检查是否需要处理加时
-    with mss.mss() as temp_scr:
-        if handle_jiashi_in_action(temp_scr):
-            return True
+REEL_SAMPLE_INTERVAL = 0.03  # 收线/放线期间的检测间隔（秒）
+
+REEL_CONTINUE = "continue"  # 继续收线
+REEL_LANDED = "landed"  # 已上鱼
+REEL_ABORTED = "aborted"  # 断线、鱼跑了或脚本暂停
+REEL_OVERTIME = "overtime"  # 出现加时界面
+
+
+class ReelController:
+    """收线控制器
+
+    按住/松开鼠标的时间窗口内持续检测星星、加时和F1/F2，
+    上鱼时立即松开鼠标结束本次收线，并统计因此节省的时间。
+    """
+
+    def __init__(self):
+        self.saved_time = 0.0  # 当前这条鱼节省的时间
+        self.total_saved_time = 0.0
+        self.catch_count = 0
+
+    def start_catch(self):
+        self.saved_time = 0.0
+
+    def finish_catch(self):
+        """上鱼后汇总本条鱼节省的时间"""
+        self.catch_count += 1
+        self.total_saved_time += self.saved_time
+        if self.saved_time > 0:
+            log(LOG_DEBUG, "时间", "检测到上鱼提前结束收线，本条节省 %.2fs", self.saved_time)
+
+    def _watch(self, source, duration):
+        """在 duration 秒内持续检测，返回 (检测结果, 剩余时间)"""
+        deadline = time.perf_counter() + duration
+        while True:
+            if not run_event.is_set():
+                return REEL_ABORTED, 0
+            frame = take_reel_snapshot(source)
+            remaining = max(0, deadline - time.perf_counter())
+            if fished(frame):
+                return REEL_LANDED, remaining
+            if fangzhu_jiashi(frame):
+                return REEL_OVERTIME, remaining
+            if f1_mached(frame) or f2_mached(frame):
+                return REEL_ABORTED, remaining
+            if remaining <= 0:
+                return REEL_CONTINUE, 0
+            time.sleep(min(REEL_SAMPLE_INTERVAL, remaining))
+
+    def pull(self, frame):
+        """执行一次收线+放线
+
+        Args:
+            frame: 收线前的单帧快照（take_reel_snapshot）
+
+        Returns:
+            REEL_CONTINUE / REEL_LANDED / REEL_ABORTED
+        """
+        # 先检查是否需要处理加时
+        if handle_jiashi_in_action(frame):
+            return REEL_CONTINUE
 
         # [新增] 故障检测：检查是否断线或超时（回到待机状态）
-        if f1_mached(temp_scr) or f2_mached(temp_scr):
-            print("⚠️ [监测] 检测到异常，判定为断线或鱼跑了，本轮结束")
-            return False
+        if f1_mached(frame) or f2_mached(frame):
+            log(LOG_WARNING, "监测", "检测到异常，判定为断线或鱼跑了，本轮结束")
+            return REEL_ABORTED
+
+        source = getattr(frame, "source", frame)
+        jittered_down = add_jitter(leftclickdown)
+        jittered_up = add_jitter(leftclickup)
+
+        ensure_mouse_down()
+        result, remaining = self._watch(source, jittered_down)
+        ensure_mouse_up()
+        print_timing_info("收线", leftclickdown, jittered_down - remaining)
+        if result == REEL_LANDED:
+            # 原本还要按完剩余时间并完整放线一次才会检测到上鱼
+            self.saved_time += remaining + jittered_up
+            return REEL_LANDED
+        if result != REEL_CONTINUE:
+            return self._interrupted(result, source)
+
+        result, remaining = self._watch(source, jittered_up)
+        print_timing_info("放线", leftclickup, jittered_up - remaining)
+        if result == REEL_LANDED:
+            self.saved_time += remaining
+            return REEL_LANDED
+        if result != REEL_CONTINUE:
+            return self._interrupted(result, source)
+        return REEL_CONTINUE
+
+    def _interrupted(self, result, source):
+        if result == REEL_OVERTIME:
+            handle_jiashi_in_action(source)
+            return REEL_CONTINUE
+        if run_event.is_set():
+            log(LOG_WARNING, "监测", "检测到异常，判定为断线或鱼跑了，本轮结束")
+        return REEL_ABORTED
+
+    def stats(self):
+        return {
+            "catch_count": self.catch_count,
+            "total_saved_time": self.total_saved_time,
+            "average_saved_time": (
+                self.total_saved_time / self.catch_count if self.catch_count else 0
+            ),
+        }
 
-    user32.mouse_event(0x02, 0, 0, 0, 0)
-    jittered_down = add_jitter(leftclickdown)
-    time.sleep(jittered_down)
-    print_timing_info("收线", leftclickdown, jittered_down)
-    user32.mouse_event(0x04, 0, 0, 0, 0)
-    jittered_up = add_jitter(leftclickup)
-    time.sleep(jittered_up)
-    print_timing_info("放线", leftclickup, jittered_up)
-    return True
+
+reel_controller = ReelController()
 
 
 def ensure_mouse_down():
@@ -7430,8 +10309,22 @@ def get_max_screen_resolution():
             return None, None
 
 
+def get_bait_region():
+    """计算鱼饵数量区域的截图坐标 (left, top, right, bottom)"""
+    # 鱼饵数量显示在屏幕右下角，使用锚定方式计算坐标
+    x1, y1, x2, y2 = BAIT_REGION_BASE
+    base_w = x2 - x1
+    base_h = y2 - y1
+
+    # 使用现有的scale_corner_anchored函数计算坐标，确保与其他UI元素使用相同的缩放逻辑
+    actual_x1, actual_y1, actual_w, actual_h = scale_corner_anchored(
+        x1, y1, base_w, base_h, anchor="bottom_right"
+    )
+    return (actual_x1, actual_y1, actual_x1 + actual_w, actual_y1 + actual_h)
+
+
 def bait_math_val(scr):
-    global region1, region2, result_val_is
+    global result_val_is
     # 记录日志：开始鱼饵识别
     if debug_mode:
         debug_info = {
@@ -7442,19 +10335,8 @@ def bait_math_val(scr):
         }
         add_debug_info(debug_info)
 
-    # 鱼饵数量显示在屏幕右下角，使用锚定方式计算坐标
-    x1, y1, x2, y2 = BAIT_REGION_BASE
-    base_w = x2 - x1
-    base_h = y2 - y1
-
-    # 使用现有的scale_corner_anchored函数计算坐标，确保与其他UI元素使用相同的缩放逻辑
-    actual_x1, actual_y1, actual_w, actual_h = scale_corner_anchored(
-        x1, y1, base_w, base_h, anchor="bottom_right"
-    )
-    actual_x2 = actual_x1 + actual_w
-    actual_y2 = actual_y1 + actual_h
-
-    region = (actual_x1, actual_y1, actual_x2, actual_y2)
+    region = get_bait_region()
+    actual_x1, actual_y1, actual_x2, actual_y2 = region
 
     # 记录日志：识别区域
     if debug_mode:
@@ -7487,49 +10369,9 @@ def bait_math_val(scr):
             add_debug_info(debug_info)
         return None
     else:
-        img = np.array(math_frame)  # screenshot 是 ScreenShot 类型，转换为 NumPy 数组
+        img = np.asarray(math_frame)  # ScreenShot 或快照视图，转换为 NumPy 数组（不复制）
         gray_img = cv2.cvtColor(img, cv2.COLOR_RGBA2GRAY)
-
-        # 根据统一缩放比例动态计算裁切尺寸
-        scale = SCALE_UNIFORM
-        crop_h = max(1, int(BAIT_CROP_HEIGHT_BASE * scale))
-        crop_w = max(1, int(BAIT_CROP_WIDTH1_BASE * scale))
-
-        # 确保不超出图像边界
-        img_h, img_w = gray_img.shape[:2]
-        crop_h = min(crop_h, img_h)
-        crop_w = min(crop_w, img_w // 2)  # 确保单个数字宽度不超过一半
-
-        # 初始化匹配结果
-        best_match1 = None
-        best_match2 = None
-        best_match3 = None
-
-        # 截取并处理区域1（第一个数字）
-        if crop_w <= img_w:
-            region1 = gray_img[0:crop_h, 0:crop_w]
-            best_match1 = match_digit_template(region1)
-
-        # 截取并处理区域2（第二个数字）
-        if crop_w * 2 <= img_w:
-            region2 = gray_img[0:crop_h, crop_w : crop_w * 2]
-            best_match2 = match_digit_template(region2)
-
-        # 单个数字居中区域 - 动态计算起始位置，适应各种分辨率
-        mid_start = max(0, (img_w - crop_w) // 2)
-        mid_end = min(mid_start + crop_w, img_w)
-        region3 = gray_img[0:crop_h, mid_start:mid_end]
-        best_match3 = match_digit_template(region3)
-        if best_match1 and best_match2:
-            # 从best_match中提取数字索引（i），并拼接成整数
-            best_match1_val = best_match1[0]  # 提取区域1的数字索引
-            best_match2_val = best_match2[0]  # 提取区域2的数字索引
-            # 拼接两个匹配的数字，转换为整数
-            result_val_is = int(f"{best_match1_val}{best_match2_val}")
-        elif best_match3:
-            result_val_is = int(f"{best_match3[0]}")
-        else:
-            result_val_is = None
+        result_val_is = recognize_bait_digits(gray_img)
 
         # 记录日志：识别结果
         if debug_mode:
@@ -7549,26 +10391,224 @@ def bait_math_val(scr):
         return result_val_is
 
 
-def match_digit_template(image):
-    global templates
-    # 确保模板已加载
+def get_bait_digit_crops(gray_img):
+    """按当前缩放比例从鱼饵区域灰度图中裁出三个数字区域
+
+    Returns:
+        (region1, region2, region3)：十位、个位、单个数字居中区域，无法裁出时为None
+    """
+    # 根据统一缩放比例动态计算裁切尺寸
+    scale = SCALE_UNIFORM
+    crop_h = max(1, int(BAIT_CROP_HEIGHT_BASE * scale))
+    crop_w = max(1, int(BAIT_CROP_WIDTH1_BASE * scale))
+
+    # 确保不超出图像边界
+    img_h, img_w = gray_img.shape[:2]
+    crop_h = min(crop_h, img_h)
+    crop_w = min(crop_w, img_w // 2)  # 确保单个数字宽度不超过一半
+
+    region1 = None
+    region2 = None
+    # 截取区域1（第一个数字）
+    if crop_w <= img_w:
+        region1 = gray_img[0:crop_h, 0:crop_w]
+    # 截取区域2（第二个数字）
+    if crop_w * 2 <= img_w:
+        region2 = gray_img[0:crop_h, crop_w : crop_w * 2]
+    # 单个数字居中区域 - 动态计算起始位置，适应各种分辨率
+    mid_start = max(0, (img_w - crop_w) // 2)
+    mid_end = min(mid_start + crop_w, img_w)
+    region3 = gray_img[0:crop_h, mid_start:mid_end]
+    return region1, region2, region3
+
+
+class BaitDigitCache:
+    """鱼饵数字识别缓存
+
+    以鱼饵区域灰度图的 CRC32 和尺寸为键，画面未变化时直接返回上次的识别结果，
+    跳过模板匹配。数字模板重新加载后需调用 clear()。
+    """
+
+    def __init__(self, max_size=32):
+        self.max_size = max_size
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hit_count = 0
+        self.miss_count = 0
+
+    @staticmethod
+    def make_key(gray_img):
+        return (gray_img.shape, zlib.crc32(np.ascontiguousarray(gray_img)))
+
+    def get(self, key):
+        """返回 (是否命中, 缓存结果)"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hit_count += 1
+                return True, self._entries[key]
+            self.miss_count += 1
+            return False, None
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hit_count + self.miss_count
+            return {
+                "hit_count": self.hit_count,
+                "miss_count": self.miss_count,
+                "hit_rate": self.hit_count / total if total else 0,
+                "size": len(self._entries),
+            }
+
+
+bait_digit_cache = BaitDigitCache()
+
+
+def recognize_bait_digits(gray_img):
+    """识别鱼饵区域灰度图中的数字，画面未变化时直接使用缓存结果
+
+    Returns:
+        int: 鱼饵数量，识别失败返回None
+    """
+    # 先确认模板未变化，模板重新加载时会清空缓存
+    get_digit_classifier()
+    cache_key = BaitDigitCache.make_key(gray_img)
+    hit, cached_result = bait_digit_cache.get(cache_key)
+    if hit:
+        return cached_result
+    result = _recognize_bait_digits_uncached(gray_img)
+    bait_digit_cache.put(cache_key, result)
+    return result
+
+
+def _recognize_bait_digits_uncached(gray_img):
+    """三个裁切区域一次批量匹配数字模板"""
+    crops = get_bait_digit_crops(gray_img)
+    best_match1, best_match2, best_match3 = match_digit_templates(crops)
+    if best_match1 and best_match2:
+        # 从best_match中提取数字索引（i），拼接成整数
+        return int(f"{best_match1[0]}{best_match2[0]}")
+    elif best_match3:
+        return int(f"{best_match3[0]}")
+    return None
+
+
+class DigitClassifier:
+    """批量数字分类器
+
+    把缩放后的10个数字模板一次性堆叠成零均值、单位范数的矩阵，
+    所有待识别区域的滑动窗口同样归一化后，与模板矩阵做一次矩阵乘法即可得到
+    全部 TM_CCOEFF_NORMED 相关系数，结果与逐个 cv2.matchTemplate 一致。
+    """
+
+    def __init__(self, templates, threshold=0.8):
+        self.templates = templates
+        self.threshold = threshold
+        shapes = {template.shape[:2] for template in templates}
+        # 数字模板来自同尺寸的资源图并按同一比例缩放，尺寸必然一致
+        if len(shapes) != 1:
+            raise ValueError(f"数字模板尺寸不一致: {sorted(shapes)}")
+        self.template_shape = shapes.pop()
+        self._matrix = self._normalize(
+            np.stack([template.reshape(-1) for template in templates])
+        )
+
+    @staticmethod
+    def _normalize(vectors):
+        """逐行减均值并除以范数，方差为0的行置零（与OpenCV一致，相关系数为0）"""
+        vectors = vectors.astype(np.float64)
+        vectors -= vectors.mean(axis=1, keepdims=True)
+        norms = np.sqrt(np.einsum("ij,ij->i", vectors, vectors))
+        nonzero = norms > 1e-9
+        vectors[nonzero] /= norms[nonzero, None]
+        vectors[~nonzero] = 0
+        return vectors
+
+    def classify_many(self, images):
+        """批量识别多个区域
+
+        Args:
+            images: 灰度图像列表，元素可以为None
+
+        Returns:
+            list: 每个区域的 (数字索引, 匹配位置) 或 None
+        """
+        t_h, t_w = self.template_shape
+        window_blocks = []
+        block_shapes = []
+        for image in images:
+            if image is None or image.shape[0] < t_h or image.shape[1] < t_w:
+                block_shapes.append(None)
+                continue
+            windows = np.lib.stride_tricks.sliding_window_view(image, (t_h, t_w))
+            out_h, out_w = windows.shape[:2]
+            window_blocks.append(windows.reshape(out_h * out_w, t_h * t_w))
+            block_shapes.append((out_h, out_w))
+
+        results = [None] * len(images)
+        if not window_blocks:
+            return results
+
+        # 一次矩阵乘法得到所有窗口对所有模板的相关系数
+        scores = self._normalize(np.concatenate(window_blocks)) @ self._matrix.T
+
+        offset = 0
+        for index, block_shape in enumerate(block_shapes):
+            if block_shape is None:
+                continue
+            out_h, out_w = block_shape
+            block = scores[offset : offset + out_h * out_w]
+            offset += out_h * out_w
+            best_positions = block.argmax(axis=0)  # 每个模板的最佳位置
+            best_values = block[best_positions, np.arange(block.shape[1])]
+            digit = int(best_values.argmax())
+            if best_values[digit] > self.threshold:
+                position = int(best_positions[digit])
+                results[index] = (digit, (position % out_w, position // out_w))
+        return results
+
+    def classify(self, image):
+        return self.classify_many([image])[0]
+
+
+digit_classifier = None
+
+
+def get_digit_classifier():
+    """获取与当前数字模板对应的批量分类器，模板重新加载后自动重建"""
+    global digit_classifier
     if templates is None or len(templates) == 0:
         load_templates()
     if templates is None or len(templates) == 0:
         return None
-    best_match = None  # 最佳匹配信息
-    best_val = 0  # 存储最佳匹配度
-    h, w = image.shape[:2]  # 获取图像尺寸
-    for i, template in enumerate(templates):
-        t_h, t_w = template.shape[:2]  # 获取模板尺寸
-        # 安全检查：确保图像尺寸大于等于模板尺寸
-        if h >= t_h and w >= t_w:
-            res = cv2.matchTemplate(image, template, cv2.TM_CCOEFF_NORMED)
-            min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(res)
-            if max_val > 0.8 and max_val > best_val:  # 找到最佳匹配
-                best_val = max_val
-                best_match = (i, max_loc)  # 记录最佳匹配的数字和位置
-    return best_match
+    if digit_classifier is None or digit_classifier.templates is not templates:
+        digit_classifier = DigitClassifier(templates)
+        # 模板变化后旧的识别结果不再可信
+        bait_digit_cache.clear()
+    return digit_classifier
+
+
+def match_digit_templates(images):
+    """批量匹配多个区域的数字模板，返回每个区域的 (数字索引, 匹配位置) 或 None"""
+    classifier = get_digit_classifier()
+    if classifier is None:
+        return [None] * len(images)
+    return classifier.classify_many(images)
+
+
+def match_digit_template(image):
+    return match_digit_templates([image])[0]
 
 
 def capture_region(x, y, w, h, scr):
@@ -7576,7 +10616,7 @@ def capture_region(x, y, w, h, scr):
     frame = scr.grab(region)
     if frame is None:
         return None
-    img = np.array(frame)  # screenshot 是 ScreenShot 类型，转换为 NumPy 数组
+    img = np.asarray(frame)  # ScreenShot 或快照视图，转换为 NumPy 数组（不复制）
     gray_img = cv2.cvtColor(img, cv2.COLOR_RGBA2GRAY)
     return gray_img
 
@@ -7799,10 +10839,9 @@ def uno_continuous_recognition():
     print("🎮 [UNO] 开始持续识别")
 
     import time
-    import mss
 
-    # 创建截图对象
-    scr = mss.mss()
+    # 使用本线程的截图会话
+    scr = get_capture_session()
 
     try:
         while uno_recognition_running:
@@ -7842,8 +10881,8 @@ def uno_continuous_recognition():
     except Exception as e:
         print(f"❌ [UNO] 持续识别出错: {e}")
     finally:
-        # 关闭截图对象
-        scr.close()
+        # 关闭本线程的截图会话
+        close_capture_session()
         print("🎮 [UNO] 持续识别停止")
 
 
@@ -8106,13 +11145,14 @@ def fangzhu_jiashi(scr):
 # 程序主循环与热键监听
 # =========================
 def toggle_run():
-    global a, previous_result, scr
+    global a, previous_result
     if run_event.is_set():
         run_event.clear()  # 暂停
         a = 0
         previous_result = None
         ensure_mouse_up()  # 确保鼠标没有按下
-        end_current_session()  # 结束钓鱼会话
+        # 后台记录处理完已提交的鱼之后再结束会话，热键回调不能在这里等待
+        fish_record_pipeline.call_in_order(end_current_session)
 
         # 播放暂停音效
         sound_manager.play_pause()
@@ -8123,12 +11163,10 @@ def toggle_run():
         # 重置鱼桶满检测状态
         reset_fish_bucket_full_detection()
 
-        start_new_session()  # 开始新的钓鱼会话
+        fish_record_pipeline.call_in_order(start_new_session)  # 开始新的钓鱼会话
         if previous_result is None:
-            temp_scr = None
             try:
-                temp_scr = mss.mss()
-                bait_result = bait_math_val(temp_scr)
+                bait_result = bait_math_val(get_capture_session())
                 if bait_result is not None:
                     previous_result = result_val_is
                     run_event.set()  # 恢复运行
@@ -8143,13 +11181,6 @@ def toggle_run():
                     print("⚠️  [警告] 未识别到鱼饵，请确保游戏界面正确")
             except Exception as e:
                 print(f"❌ [错误] 初始化失败: {e}")
-            finally:
-                if temp_scr is not None:
-                    try:
-                        temp_scr.close()
-                    except:
-                        pass
-                scr = None
         else:
             run_event.set()
             # 播放恢复音效
@@ -8282,214 +11313,506 @@ def start_hotkey_listener():
 # 主函数
 # =========================
 # 主函数：定时识别并比较数字
-def handle_jiashi_thread():
-    global run_event, previous_result, result_val_is
-    while True:
-        if run_event.is_set():
-            try:
-                # 为每个线程创建独立的mss对象
-                scr = mss.mss()
+# =========================
+# 回放基准测试
+# =========================
+def run_replay_benchmark(path, output_file=None):
+    """使用回放后端逐帧运行检测流水线，统计耗时和检测结果
 
-                # 确保scr对象和_handles属性正确初始化
-                if (
-                    hasattr(scr, "_handles")
-                    and hasattr(scr._handles, "srcdc")
-                    and scr._handles.srcdc is not None
-                ):
-                    # 处理加时选择（使用锁保护读取jiashi_var）
-                    with param_lock:
-                        current_jiashi = jiashi_var
-
-                    if current_jiashi == 0:
-                        if fangzhu_jiashi(scr):
-                            # 确保按钮坐标已初始化
-                            if btn_no_jiashi_coords is None:
-                                update_region_coords()
-                            btn_x, btn_y = btn_no_jiashi_coords
-                            user32.SetCursorPos(btn_x, btn_y)
-                            time.sleep(0.05)
-                            user32.mouse_event(0x02, 0, 0, 0, 0)
-                            time.sleep(0.1)
-                            user32.mouse_event(0x04, 0, 0, 0, 0)
-                            time.sleep(0.05)
-                            if bait_math_val(scr):
-                                with param_lock:
-                                    previous_result = result_val_is
-                    elif current_jiashi == 1:
-                        if fangzhu_jiashi(scr):
-                            # 确保按钮坐标已初始化
-                            if btn_yes_jiashi_coords is None:
-                                update_region_coords()
-                            btn_x, btn_y = btn_yes_jiashi_coords
-                            user32.SetCursorPos(btn_x, btn_y)
-                            time.sleep(0.05)
-                            user32.mouse_event(0x02, 0, 0, 0, 0)
-                            time.sleep(0.1)
-                            user32.mouse_event(0x04, 0, 0, 0, 0)
-                            time.sleep(0.05)
-                            if bait_math_val(scr):
-                                with param_lock:
-                                    previous_result = result_val_is
-
-                # 确保资源被正确释放
-                scr.close()
-            except Exception as e:
-                print(f"❌ [错误] 加时线程异常: {e}")
-                # 确保即使发生异常也能释放资源
-                try:
-                    if "scr" in locals() and scr is not None:
-                        scr.close()
-                except:
-                    pass
-        time.sleep(0.05)
+    Args:
+        path: 录制画面的图片目录或视频文件
+        output_file: 逐帧结果的JSON输出路径，用于回归对比，为None时不输出
 
+    Returns:
+        list: 每帧的检测结果
+    """
+    global TARGET_WIDTH, TARGET_HEIGHT, SCALE_X, SCALE_Y
+    backend = ReplayCaptureBackend(path, loop=False)
 
-def main():
-    global templates, template_folder_path, current_result, previous_result, times, a, region1, region2, result_val_is, scr, jiashi_var
+    # 以录制画面的尺寸作为目标分辨率
+    first_h, first_w = backend.frame_shape[:2]
+    TARGET_WIDTH, TARGET_HEIGHT = first_w, first_h
+    SCALE_X = TARGET_WIDTH / BASE_WIDTH
+    SCALE_Y = TARGET_HEIGHT / BASE_HEIGHT
+    update_region_coords()
+    load_templates()
 
-    # 启动加时处理线程
-    jiashi_thread = threading.Thread(target=handle_jiashi_thread, daemon=True)
-    jiashi_thread.start()
+    print(f"🎬 [回放] 开始回放 {path}（{backend.frame_count} 帧，{first_w}×{first_h}）")
+    results = []
+    elapsed_list = []
+    try:
+        while True:
+            start_time = time.perf_counter()
+            frame = take_tick_snapshot(backend)
+            result = {
+                "frame": backend.frame_index,
+                "jiashi": bool(fangzhu_jiashi(frame)),
+                "f1": bool(f1_mached(frame)),
+                "f2": bool(f2_mached(frame)),
+                "shangyu": bool(shangyu_mached(frame)),
+                "star": bool(fished(backend)),
+                "bait": bait_math_val(frame),
+            }
+            elapsed = time.perf_counter() - start_time
+            result["elapsed_ms"] = round(elapsed * 1000, 3)
+            elapsed_list.append(elapsed)
+            results.append(result)
+            if not backend.advance():
+                break
+    finally:
+        backend.close()
 
-    # 启动鱼桶满独立检测线程
-    bucket_full_thread = threading.Thread(
-        target=bucket_full_detection_thread, daemon=True
-    )
-    bucket_full_thread.start()
+    if elapsed_list:
+        sorted_elapsed = sorted(elapsed_list)
+        p95 = sorted_elapsed[min(len(sorted_elapsed) - 1, int(len(sorted_elapsed) * 0.95))]
+        print(
+            f"🎬 [回放] 共 {len(results)} 帧 | 平均 {sum(elapsed_list) / len(elapsed_list) * 1000:.2f}ms"
+            f" | P95 {p95 * 1000:.2f}ms"
+        )
+        for key in ("jiashi", "f1", "f2", "shangyu", "star"):
+            print(f"🎬 [回放] {key}: {sum(1 for r in results if r[key])} 帧命中")
 
-    while True:
-        if run_event.is_set():
-            scr = None
-            try:
-                # 创建新的截图对象，确保每次都是新鲜的
-                scr = mss.mss()
+    if output_file:
+        with open(output_file, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=1)
+        print(f"💾 [回放] 逐帧结果已保存到 {output_file}")
+    return results
 
-                # 检查截图对象是否有效
-                if scr is None:
-                    print("⚠️  [警告] 截图对象创建失败")
-                    time.sleep(0.1)
-                    continue
 
-                # 先检查是否需要处理加时
-                if handle_jiashi_in_action(scr):
-                    # 确保释放截图对象
-                    try:
-                        scr.close()
-                    except:
-                        pass
-                    scr = None
-                    continue
+# =========================
+# 钓鱼状态机
+# =========================
+FISHING_STATE_IDLE = "idle"
+FISHING_STATE_CASTING = "casting"
+FISHING_STATE_WAITING_BITE = "waiting_bite"
+FISHING_STATE_REELING = "reeling"
+FISHING_STATE_LANDED = "landed"
+FISHING_STATE_RECORDING = "recording"
+FISHING_STATE_RELEASING = "releasing"
+
+FISHING_STATE_NAMES = {
+    FISHING_STATE_IDLE: "待机",
+    FISHING_STATE_CASTING: "抛竿",
+    FISHING_STATE_WAITING_BITE: "等待咬钩",
+    FISHING_STATE_REELING: "收线",
+    FISHING_STATE_LANDED: "上鱼",
+    FISHING_STATE_RECORDING: "记录",
+    FISHING_STATE_RELEASING: "放生",
+}
 
-                # 检测F1/F2抛竿
-                if f1_mached(scr) or f2_mached(scr):
-                    # 检查是否正在放生，如果是则等待
-                    with operation_lock:
-                        if is_releasing:
-                            print("⏳ [提示] 正在放生，等待放生完成后再抛杆")
-                            time.sleep(0.5)
-                            continue
-                        # 设置抛杆状态
-                        is_casting = True
-                    
-                    try:
-                        # 在这里记录抛竿时间
-                        current_time = time.time()
-                        with casting_interval_lock:
-                            casting_timestamps.append(current_time)
-                            # 保持队列长度，防止内存泄露
-                            if len(casting_timestamps) > 20:
-                                casting_timestamps.pop(0)
-                        user32.mouse_event(0x02, 0, 0, 0, 0)
-                        jittered_pao = add_jitter(paogantime)
-                        time.sleep(jittered_pao)
-                        print_timing_info("抛竿", paogantime, jittered_pao)
-                        user32.mouse_event(0x04, 0, 0, 0, 0)
-                        time.sleep(0.15)
-                    finally:
-                        # 无论是否异常，都要重置抛杆状态
-                        with operation_lock:
-                            is_casting = False
-                elif shangyu_mached(scr):
-                    user32.mouse_event(0x02, 0, 0, 0, 0)
-                    time.sleep(0.1)
-                    user32.mouse_event(0x04, 0, 0, 0, 0)
+# 停留在同一状态时两次检测之间的间隔（秒），状态切换时立即执行下一状态
+FISHING_STATE_POLL_INTERVALS = {
+    FISHING_STATE_IDLE: 0.05,
+    FISHING_STATE_CASTING: 0.5,  # 仅在等待放生完成时重试
+    FISHING_STATE_WAITING_BITE: 0.03,
+    FISHING_STATE_REELING: 0,  # 收线本身包含按住/松开的等待
+    FISHING_STATE_LANDED: 0,
+    FISHING_STATE_RECORDING: 0,
+    FISHING_STATE_RELEASING: 0,
+}
 
-                time.sleep(0.05)
+CAST_SETTLE_TIME = 0.15  # 抛竿后等待F1/F2提示消失的时间
+RECORD_RELEASE_WAIT_TIMEOUT = 10  # 开启放生时等待后台识别结果的最长时间（秒）
 
-                # 获取当前结果
-                bait_result = bait_math_val(scr)
-                if bait_result is not None:
-                    current_result = result_val_is
-                else:
-                    current_result = previous_result  # 将当前数字设为上次的数字
-                    time.sleep(0.1)
-                    # 确保释放截图对象
-                    try:
-                        scr.close()
-                    except:
-                        pass
-                    scr = None
-                    continue
+# 各状态检测CPU占用上限（检测耗费的CPU时间 / 墙钟时间）
+FISHING_STATE_CPU_CEILINGS = {
+    FISHING_STATE_IDLE: 0.10,
+    FISHING_STATE_WAITING_BITE: 0.15,
+}
 
-                # 比较并执行操作
-                comparison_result = compare_results()
-                time.sleep(0.01)
-
-                if comparison_result == -1:  # 当前结果小于上次结果
-                    previous_result = current_result  # 更新上次识别的结果
-                    while not fished(scr) and run_event.is_set():
-                        # 使用锁保护读取times
-                        with param_lock:
-                            current_times = times
-                        if a <= current_times:
-                            a += 1
-                            # 调用优化后的点击循环函数，如果返回False表示遇到异常需中断
-                            if not pressandreleasemousebutton():
-                                a = 0
-                                break
-                        else:
-                            a = 0
-                            print("🎣 [提示] 达到最大拉杆次数，本轮结束")
-                            break
-                    ensure_mouse_up()
-                    a = 0
-
-                    # 钓到鱼后，识别并记录鱼的信息
-                    if OCR_AVAILABLE and record_fish_enabled:
-                        try:
-                            record_caught_fish()
-                        except Exception as e:
-                            print(f"⚠️  [警告] 记录鱼信息失败: {e}")
-                elif comparison_result == 1:
-                    previous_result = current_result
-                    # continue会在finally中关闭scr
-            except Exception as e:
-                print(f"❌ [错误] 主循环异常: {e}")
-                # 记录更详细的错误信息
-                import traceback
 
-                traceback.print_exc()
-            finally:
-                # 确保mss资源被正确释放
-                if scr is not None:
-                    try:
-                        scr.close()
-                    except:
-                        pass
-                    scr = None
-        time.sleep(0.1)
+class AdaptivePollScheduler:
+    """自适应检测间隔
+
+    记录每次抛竿到咬钩的等待时长，抛竿后离预期咬钩时间还远时按循环间隔 t 慢速检测，
+    接近历史等待时长的低分位时逐步加快到最快间隔；同时按各状态的CPU上限拉长间隔。
+    咬钩信号（鱼饵数量减少）会一直保持，慢速检测只会推迟发现而不会漏掉；
+    慢速间隔上限只有0.1秒，并以低分位再留出余量，提前咬钩时最多晚0.1秒发现。
+    """
+
+    MIN_SAMPLES = 5  # 样本不足时始终使用最快间隔
+    LOW_QUANTILE = 0.05  # 以等待时长的5%分位作为最早可能咬钩时间的基准
+    EARLIEST_MARGIN = 0.8  # 再提前20%，留出余量
+    RAMP_START = 0.6  # 从最早咬钩时间的60%开始逐步加快
+    MAX_INTERVAL = 0.1  # 无论 t 设置多大，等待咬钩时检测间隔不超过0.1秒
+
+    def __init__(self, max_samples=50):
+        self.bite_waits = collections.deque(maxlen=max_samples)
+        self._step_cpu = {}  # 各状态单次检测CPU耗时的指数平均
+        self.total_cpu = 0.0  # 钓鱼线程检测累计CPU时间
+        self.fish_count = 0
+
+    def record_bite_wait(self, wait):
+        """记录一次抛竿到咬钩的等待时长（秒）"""
+        if wait > 0:
+            self.bite_waits.append(wait)
+
+    def record_step_cost(self, state, cpu_time):
+        """记录一次状态执行消耗的CPU时间"""
+        self.total_cpu += cpu_time
+        previous = self._step_cpu.get(state)
+        self._step_cpu[state] = (
+            cpu_time if previous is None else previous * 0.9 + cpu_time * 0.1
+        )
+
+    def record_fish(self):
+        self.fish_count += 1
+
+    def earliest_bite(self):
+        """最早可能咬钩的时间（历史等待时长的低分位再留出余量），样本不足时返回None"""
+        if len(self.bite_waits) < self.MIN_SAMPLES:
+            return None
+        ordered = sorted(self.bite_waits)
+        return ordered[int((len(ordered) - 1) * self.LOW_QUANTILE)] * self.EARLIEST_MARGIN
+
+    def interval(self, state, since_cast=None):
+        """计算停留在 state 时下一次检测前的等待时间
+
+        Args:
+            state: 当前状态
+            since_cast: 距离上次抛竿的秒数，未知时为None
+        """
+        fast = FISHING_STATE_POLL_INTERVALS[state]
+        interval = fast
+        if state == FISHING_STATE_WAITING_BITE and since_cast is not None:
+            earliest = self.earliest_bite()
+            if earliest is not None:
+                with param_lock:
+                    slow = min(max(t, fast), self.MAX_INTERVAL)
+                ramp_start = earliest * self.RAMP_START
+                if since_cast < ramp_start:
+                    interval = slow
+                elif since_cast < earliest:
+                    progress = (since_cast - ramp_start) / (earliest - ramp_start)
+                    interval = slow + (fast - slow) * progress
+                # 不要越过最早可能咬钩的时间
+                if since_cast < earliest:
+                    interval = max(fast, min(interval, earliest - since_cast))
+
+        # CPU上限：单次检测耗时 / (耗时 + 间隔) 不超过上限
+        ceiling = FISHING_STATE_CPU_CEILINGS.get(state)
+        step_cpu = self._step_cpu.get(state)
+        if ceiling and step_cpu:
+            interval = max(interval, step_cpu / ceiling - step_cpu)
+            if state == FISHING_STATE_WAITING_BITE:
+                # CPU上限也不能让咬钩发现延迟超过慢速间隔上限
+                interval = min(interval, max(fast, self.MAX_INTERVAL))
+        return interval
+
+    def stats(self):
+        earliest = self.earliest_bite()
+        return {
+            "samples": len(self.bite_waits),
+            "earliest_bite": earliest,
+            "fish_count": self.fish_count,
+            "total_cpu": self.total_cpu,
+            "cpu_per_fish": self.total_cpu / self.fish_count if self.fish_count else None,
+        }
+
+
+poll_scheduler = AdaptivePollScheduler()
+
+
+class FishingCycle:
+    """钓鱼流程状态机
+
+    待机 → 抛竿 → 等待咬钩 → 收线 → 上鱼 → 记录 → 放生 → 待机，
+    每个状态只运行与之相关的检测，并按状态设定检测间隔。
+    """
+
+    def __init__(self):
+        self.state = FISHING_STATE_IDLE
+        self.state_since = time.time()
+        self.last_fish = None  # 最近一次记录的鱼，供放生状态使用
+        self.release_target = None  # 待放生的鱼：(品质, 鱼名)，鱼名可能为None
+        self.cast_time = None  # 最近一次抛竿完成的时间，用于学习咬钩等待时长
+        self._handlers = {
+            FISHING_STATE_IDLE: self._idle,
+            FISHING_STATE_CASTING: self._casting,
+            FISHING_STATE_WAITING_BITE: self._waiting_bite,
+            FISHING_STATE_REELING: self._reeling,
+            FISHING_STATE_LANDED: self._landed,
+            FISHING_STATE_RECORDING: self._recording,
+            FISHING_STATE_RELEASING: self._releasing,
+        }
+
+    @property
+    def state_name(self):
+        return FISHING_STATE_NAMES.get(self.state, self.state)
+
+    def reset(self):
+        """脚本暂停时回到待机状态"""
+        global a
+        self.cast_time = None
+        self.release_target = None
+        if self.state != FISHING_STATE_IDLE:
+            a = 0
+            self._set_state(FISHING_STATE_IDLE)
+
+    def _set_state(self, state):
+        if state != self.state:
+            if debug_mode:
+                debug_info = {
+                    "timestamp": datetime.datetime.now().strftime(
+                        "%Y-%m-%d %H:%M:%S.%f"
+                    )[:-3],
+                    "action": "fishing_state_change",
+                    "message": f"{self.state_name} → {FISHING_STATE_NAMES.get(state, state)}"
+                    f"（停留 {time.time() - self.state_since:.2f}s）",
+                }
+                add_debug_info(debug_info)
+            self.state = state
+            self.state_since = time.time()
+
+    def step(self):
+        """执行当前状态一次，返回进入下一状态前需要等待的时间"""
+        state = self.state
+        cpu_start = time.thread_time()
+        next_state = self._handlers[state]()
+        poll_scheduler.record_step_cost(state, time.thread_time() - cpu_start)
+
+        interval = 0
+        if next_state == state:
+            since_cast = time.time() - self.cast_time if self.cast_time else None
+            interval = poll_scheduler.interval(state, since_cast)
+        self._set_state(next_state)
+        return interval
+
+    def _idle(self):
+        """待机：检测加时和F1/F2抛竿提示"""
+        global previous_result
+        scr = get_capture_session()
+        frame = take_tick_snapshot(scr)
+        if handle_jiashi_in_action(frame):
+            return FISHING_STATE_IDLE
+        if f1_mached(frame) or f2_mached(frame):
+            return FISHING_STATE_CASTING
+        # 没有抛竿提示说明鱼竿已经抛出（例如在等待中启动脚本），直接等待咬钩
+        if previous_result is None and bait_math_val(frame) is not None:
+            previous_result = result_val_is
+        return FISHING_STATE_WAITING_BITE
+
+    def _casting(self):
+        """抛竿：按住鼠标抛竿，放生进行中时等待"""
+        global is_casting
+        with operation_lock:
+            if is_releasing:
+                print("⏳ [提示] 正在放生，等待放生完成后再抛杆")
+                return FISHING_STATE_CASTING
+            # 设置抛杆状态
+            is_casting = True
+
+        try:
+            # 在这里记录抛竿时间
+            current_time = time.time()
+            with casting_interval_lock:
+                casting_timestamps.append(current_time)
+                # 保持队列长度，防止内存泄露
+                if len(casting_timestamps) > 20:
+                    casting_timestamps.pop(0)
+            user32.mouse_event(0x02, 0, 0, 0, 0)
+            jittered_pao = add_jitter(paogantime)
+            time.sleep(jittered_pao)
+            print_timing_info("抛竿", paogantime, jittered_pao)
+            user32.mouse_event(0x04, 0, 0, 0, 0)
+            self.cast_time = time.time()
+            time.sleep(CAST_SETTLE_TIME)
+        finally:
+            # 无论是否异常，都要重置抛杆状态
+            with operation_lock:
+                is_casting = False
+        return FISHING_STATE_WAITING_BITE
+
+    def _waiting_bite(self):
+        """等待咬钩：检测加时、F1/F2（鱼竿收回）、上鱼右键提示和鱼饵数量变化"""
+        global current_result, previous_result
+        scr = get_capture_session()
+        frame = take_tick_snapshot(scr)
+        if handle_jiashi_in_action(frame):
+            return FISHING_STATE_WAITING_BITE
+        if f1_mached(frame) or f2_mached(frame):
+            return FISHING_STATE_CASTING
+
+        clicked = False
+        if shangyu_mached(frame):
+            user32.mouse_event(0x02, 0, 0, 0, 0)
+            time.sleep(0.1)
+            user32.mouse_event(0x04, 0, 0, 0, 0)
+            clicked = True
+
+        # 执行过点击则画面已变化，使用实时截图
+        if bait_math_val(scr if clicked else frame) is None:
+            return FISHING_STATE_WAITING_BITE
+        current_result = result_val_is
+        if previous_result is None:
+            previous_result = current_result
+            return FISHING_STATE_WAITING_BITE
+
+        comparison_result = compare_results()
+        if comparison_result == -1:  # 鱼饵减少，说明鱼已咬钩
+            previous_result = current_result
+            if self.cast_time is not None:
+                poll_scheduler.record_bite_wait(time.time() - self.cast_time)
+                self.cast_time = None
+            reel_controller.start_catch()
+            return FISHING_STATE_REELING
+        elif comparison_result == 1:
+            previous_result = current_result
+        return FISHING_STATE_WAITING_BITE
+
+    def _reeling(self):
+        """收线：检测是否上鱼，未上鱼则执行一次边检测边收线/放线"""
+        global a
+        # 星星、加时和F1/F2共用同一帧
+        frame = take_reel_snapshot(get_capture_session())
+        if fished(frame):
+            return self._landed_now()
+
+        # 使用锁保护读取times
+        with param_lock:
+            current_times = times
+        if a > current_times:
+            ensure_mouse_up()
+            a = 0
+            log(LOG_INFO, "提示", "达到最大拉杆次数，本轮结束")
+            return FISHING_STATE_IDLE
+
+        a += 1
+        result = reel_controller.pull(frame)
+        if result == REEL_LANDED:
+            return self._landed_now()
+        if result == REEL_ABORTED:
+            ensure_mouse_up()
+            a = 0
+            return FISHING_STATE_IDLE
+        return FISHING_STATE_REELING
+
+    def _landed_now(self):
+        global a
+        ensure_mouse_up()
+        a = 0
+        poll_scheduler.record_fish()
+        reel_controller.finish_catch()
+        return FISHING_STATE_LANDED
+
+    def _landed(self):
+        """上鱼：根据设置决定是否识别记录"""
+        if record_fish_enabled and is_ocr_ready():
+            return FISHING_STATE_RECORDING
+        return FISHING_STATE_IDLE
+
+    def _recording(self):
+        """记录：截图并收起弹窗后交给后台识别，需要放生时等待识别结果"""
+        self.last_fish = None
+        try:
+            job = record_caught_fish()
+        except Exception as e:
+            print(f"⚠️  [警告] 记录鱼信息失败: {e}")
+            return FISHING_STATE_IDLE
+        if job is None or not release_fish_enabled:
+            return FISHING_STATE_IDLE
+
+        # 徽章颜色判定可信且结论是"保留"时不用等OCR；颜色判定可能出错，
+        # 只能用来跳过等待，放生必须由OCR识别出的品质确认，避免误放生稀有鱼
+        if quality_classifier.is_trusted(job.color_quality, job.color_confidence):
+            if not should_release_fish(job.color_quality) and not release_needs_fish_name(
+                job.color_quality
+            ):
+                return FISHING_STATE_IDLE
+
+        # 放生需要知道鱼的品质，必须在下一次抛竿前拿到识别结果
+        if not job.parsed_event.wait(RECORD_RELEASE_WAIT_TIMEOUT):
+            log(LOG_WARNING, "警告", "等待鱼信息识别超时，跳过放生")
+            return FISHING_STATE_IDLE
+        self.last_fish = job.fish
+        if fish_needs_release(self.last_fish):
+            self.release_target = (self.last_fish.quality, self.last_fish.name)
+            return FISHING_STATE_RELEASING
+        return FISHING_STATE_IDLE
+
+    def _releasing(self):
+        """放生：放生上一条记录的鱼"""
+        try:
+            if self.release_target is not None:
+                release_caught_fish(*self.release_target)
+        finally:
+            self.last_fish = None
+            self.release_target = None
+        return FISHING_STATE_IDLE
+
+
+fishing_cycle = FishingCycle()
+
+
+def main():
+    # 启动鱼桶满独立检测线程
+    bucket_full_thread = threading.Thread(
+        target=bucket_full_detection_thread, daemon=True
+    )
+    bucket_full_thread.start()
+
+    while True:
+        if not run_event.is_set():
+            fishing_cycle.reset()
+            time.sleep(0.1)
+            continue
+        try:
+            interval = fishing_cycle.step()
+        except Exception as e:
+            log(LOG_ERROR, "错误", "主循环异常: %s", e)
+            # 记录更详细的错误信息
+            import traceback
+
+            traceback.print_exc()
+            ensure_mouse_up()
+            fishing_cycle.reset()
+            interval = 0.1
+        if interval:
+            time.sleep(interval)
 
 
 # =========================
 # 程序入口
 # =========================
 if __name__ == "__main__":
+    # 解析器校验模式：python PartyFish.py --check-parser，不需要卡密和界面，校验失败时退出码为 1
+    if "--check-parser" in sys.argv:
+        parser_benchmark = benchmark_fish_info_parser()
+        sys.exit(1 if parser_benchmark["failures"] else 0)
+
     # 卡密验证 - 在所有初始化之前执行
     verify_card_key()
     
     # 先加载参数以获取热键设置
     load_parameters()
 
+    # 回放基准测试模式：python PartyFish.py --replay <目录或视频> [--output 结果.json]
+    if "--replay" in sys.argv:
+        replay_args = sys.argv[sys.argv.index("--replay") + 1 :]
+        replay_path = None
+        replay_output = None
+        replay_usage_error = None
+        while replay_args:
+            arg = replay_args.pop(0)
+            if arg == "--output":
+                if not replay_args or replay_args[0].startswith("--"):
+                    replay_usage_error = "--output 后缺少结果文件路径"
+                    break
+                replay_output = replay_args.pop(0)
+            elif arg.startswith("--") or replay_path is not None:
+                replay_usage_error = f"无法识别的参数: {arg}"
+                break
+            else:
+                replay_path = arg
+        if replay_usage_error is None and replay_path is None:
+            replay_usage_error = "--replay 后缺少录制画面的目录或视频路径"
+        if replay_usage_error is not None:
+            print(f"❌ [回放] {replay_usage_error}")
+            print("用法: python PartyFish.py --replay <目录或视频> [--output 结果.json]")
+            sys.exit(2)
+        run_replay_benchmark(replay_path, replay_output)
+        sys.exit(0)
+
     print()
     print("╔" + "═" * 50 + "╗")
     print("║" + " " * 50 + "║")
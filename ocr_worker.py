@@ -0,0 +1,58 @@
+"""PartyFish 的 OCR 工作进程
+
+spawn 出来的子进程只导入本模块：这里只能依赖 numpy 和 RapidOCR，
+不要导入 PartyFish.py 或任何界面、热键、截图相关的模块，
+否则子进程会重复执行主程序的初始化（重定向输出、注册热键、打开数据库等）。
+
+协议：
+    请求 (job_id, 共享内存名, 形状, dtype, 调用参数)，None 表示退出；
+    响应 (job_id, 结果)，结果为 {"result": ..., "elapse": ...}，
+    出错时为 {"error": 错误信息, "error_type": 异常类名}。
+    job_id 为 0 的响应报告模型加载结果：{"ready": True} 或错误。
+"""
+
+from multiprocessing import shared_memory
+
+import numpy as np
+
+LOAD_JOB_ID = 0  # 模型加载结果使用的 job_id
+
+
+def _error_payload(e):
+    return {"error": f"{type(e).__name__}: {e}", "error_type": type(e).__name__}
+
+
+def read_shared_image(shm_name, shape, dtype):
+    """从共享内存复制出图像，复制后立即关闭共享内存"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        view = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        img = view.copy()
+        del view
+    finally:
+        shm.close()
+    return img
+
+
+def ocr_worker_main(request_queue, response_queue):
+    """工作进程入口：加载 RapidOCR 并报告结果，然后逐个执行识别请求"""
+    try:
+        from rapidocr_onnxruntime import RapidOCR
+
+        engine = RapidOCR()
+    except Exception as e:
+        response_queue.put((LOAD_JOB_ID, _error_payload(e)))
+        return
+    response_queue.put((LOAD_JOB_ID, {"ready": True}))
+
+    while True:
+        request = request_queue.get()
+        if request is None:
+            break
+        job_id, shm_name, shape, dtype, kwargs = request
+        try:
+            img = read_shared_image(shm_name, shape, dtype)
+            result, elapse = engine(img, **kwargs)
+            response_queue.put((job_id, {"result": result, "elapse": elapse}))
+        except Exception as e:
+            response_queue.put((job_id, _error_payload(e)))